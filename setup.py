@@ -16,7 +16,8 @@ setup(
         "intervaltree",
         "pytest",
         "tables",
-        "networkx"
+        "networkx",
+        "pyarrow"
     ],
     zip_safe=False,
     extras_require={
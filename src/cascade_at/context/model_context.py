@@ -8,6 +8,7 @@ from cascade_at.context import ContextError
 from cascade_at.context.configuration import application_config
 from cascade_at.core.log import get_loggers
 from cascade_at.inputs.covariate_specs import CovariateSpecs
+from cascade_at.inputs.inputs_store import InputsStore
 from cascade_at.inputs.measurement_inputs import MeasurementInputs
 from cascade_at.model.grid_alchemy import Alchemy
 from cascade_at.settings.settings import load_settings
@@ -78,6 +79,7 @@ class Context:
         self.prior_dir = self.outputs_dir / 'priors'
 
         self.inputs_file = self.inputs_dir / 'inputs.p'
+        self.inputs_store_dir = self.inputs_dir / 'inputs_store'
         self.settings_file = self.inputs_dir / 'settings.json'
 
         self.log_dir = (
@@ -146,12 +148,11 @@ class Context:
     def write_inputs(self, inputs: Optional[MeasurementInputs] = None,
                      settings: Optional[SettingsConfig] = None):
         """
-        Write the inputs objects to disk.
+        Write the inputs objects to disk. The inputs go into an
+        :class:`~cascade_at.inputs.inputs_store.InputsStore`.
         """
         if inputs:
-            with open(self.inputs_file, "wb") as f:
-                LOG.info(f"Writing input obj to {self.inputs_file}.")
-                dill.dump(inputs, f)
+            InputsStore(directory=self.inputs_store_dir).write(inputs)
         if settings:
             with open(self.settings_file, 'w') as f:
                 LOG.info(f"Writing settings obj to {self.settings_file}.")
@@ -159,11 +160,18 @@ class Context:
 
     def read_inputs(self) -> (MeasurementInputs, Alchemy, SettingsConfig):
         """
-        Read the inputs from disk.
+        Read the inputs from disk. The data frames in the inputs
+        are only read from the inputs store when they are first used.
+        Inputs that were written as one pickle, before there was an
+        inputs store, are still read.
         """
-        with open(self.inputs_file, "rb") as f:
-            LOG.info(f"Reading input obj from {self.inputs_file}.")
-            inputs = dill.load(f)
+        store = InputsStore(directory=self.inputs_store_dir)
+        if store.exists():
+            inputs = store.load()
+        else:
+            with open(self.inputs_file, "rb") as f:
+                LOG.info(f"Reading input obj from {self.inputs_file}.")
+                inputs = dill.load(f)
         with open(self.settings_file) as f:
             settings_json = json.load(f)
         settings = load_settings(settings_json=settings_json)
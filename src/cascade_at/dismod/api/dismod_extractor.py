@@ -8,10 +8,10 @@ import pandas as pd
 from cascade_at.core.log import get_loggers
 from cascade_at.dismod.api import DismodAPIError
 from cascade_at.dismod.api.dismod_io import DismodIO
+from cascade_at.dismod.api.draw_matrix import DrawMatrix
 from cascade_at.dismod.integrand_mappings import PRIMARY_INTEGRANDS_TO_RATES, reverse_integrand_map
 from cascade_at.inputs.utilities.gbd_ids import DEMOGRAPHIC_ID_COLS
-from cascade_at.inputs.utilities.gbd_ids import make_age_intervals, make_time_intervals
-from cascade_at.inputs.utilities.gbd_ids import map_id_from_interval_tree
+from cascade_at.inputs.utilities.gbd_ids import make_age_group_mapper, make_year_mapper
 
 LOG = get_loggers(__name__)
 
@@ -25,6 +25,9 @@ class ExtractorCols:
     VALUE_COL_FIT = 'mean'
 
 
+PREDICT_CHUNKSIZE = 100000
+"""Number of predict table rows to read at a time when extracting a subset of predictions."""
+
 INDEX_COLS = [
     'integrand_id', 'integrand_name', 'rate',
     'time_lower', 'time_upper', 'age_lower', 'age_upper'
@@ -43,37 +46,86 @@ class DismodExtractor(DismodIO):
     and puts them into the Dismod database tables
     in the correct construction.
     """
-    def __init__(self, path):
-        super().__init__(path=path)
+    def __init__(self, path, cache: bool = False):
+        super().__init__(path=path, cache=cache)
         if not os.path.isfile(path):
             raise DismodExtractorError(f"SQLite file {str(path)} has not been created or filled yet.")
 
-    def _extract_raw_predictions(self, predictions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    def _extract_raw_predictions(self, predictions: Optional[pd.DataFrame] = None,
+                                 locations: Optional[List[int]] = None,
+                                 sexes: Optional[List[int]] = None) -> pd.DataFrame:
         """
         Grab raw predictions from the predict table.
         Or, optionally merge some predictions on the avgint table and integrand table. This
         is a work-around when we've wanted to use a different prediction data frame (from using
         multithreading) because dismod_at does not allow you to set the predict table.
+
+        If locations or sexes are passed, only the avgint rows for them are read
+        from the database, and the predict table is read in chunks keeping only
+        predictions for those avgint rows.
         """
+        avgint_filter = dict()
+        if locations is not None:
+            avgint_filter['c_location_id'] = locations
+        if sexes is not None:
+            avgint_filter['c_sex_id'] = sexes
+        if avgint_filter:
+            avgint = self.read_table('avgint', where=avgint_filter)
+        else:
+            avgint = self.avgint
+
         if predictions is None:
-            predictions = self.predict
-        df = predictions.merge(self.avgint, on=['avgint_id'])
+            if avgint_filter:
+                predictions = self._read_predictions_for(avgint_ids=avgint.avgint_id)
+            else:
+                predictions = self.predict
+        df = predictions.merge(avgint, on=['avgint_id'])
         df = df.merge(self.integrand, on=['integrand_id'])
         df['rate'] = df['integrand_name'].map(
             PRIMARY_INTEGRANDS_TO_RATES
         )
         return df
 
-    def get_predictions(self, locations: Optional[List[int]] = None,
-                        sexes: Optional[List[int]] = None,
-                        samples: bool = False,
-                        predictions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    def _read_predictions_for(self, avgint_ids: pd.Series) -> pd.DataFrame:
         """
-        Get the predictions from the predict table for locations and sexes.
-        Will either return a column of 'mean' if not samples, otherwise 'draw', which can then
-        be reshaped wide if necessary.
+        Reads the predict table in chunks, keeping the rows for these avgint IDs,
+        so that memory scales with the predictions that are kept.
+        """
+        kept = [
+            chunk.loc[chunk.avgint_id.isin(avgint_ids)]
+            for chunk in self.read_table('predict', chunksize=PREDICT_CHUNKSIZE)
+        ]
+        if not kept:
+            return self.read_table('predict', where={'avgint_id': []})
+        return pd.concat(kept, ignore_index=True)
+
+    def get_prediction_draws(self, locations: Optional[List[int]] = None,
+                             sexes: Optional[List[int]] = None,
+                             samples: bool = False,
+                             predictions: Optional[pd.DataFrame] = None,
+                             dtype=np.float64) -> DrawMatrix:
         """
-        df = self._extract_raw_predictions(predictions=predictions)
+        Get the predictions from the predict table for locations and sexes
+        as a :class:`DrawMatrix`. If samples, there is a row for each avgint row,
+        sorted by the index columns, and a draw named 'draw_{sample_index}' for each
+        sample, placed by its sample index. Otherwise there is a row for each prediction
+        and one draw named 'mean'.
+
+        Parameters
+        ----------
+        locations
+            A list of locations to extract from the predictions
+        sexes
+            A list of sexes to extract from the predictions
+        samples
+            Whether the predictions have draws (samples) or are one fit.
+        predictions
+            An optional data frame with the predictions to use rather than
+            reading them directly from the database.
+        dtype
+            The type of the draws, e.g. np.float32 to halve their memory.
+        """
+        df = self._extract_raw_predictions(predictions=predictions, locations=locations, sexes=sexes)
         if locations is not None:
             df = df.loc[df.c_location_id.isin(locations)].copy()
             if set(df.c_location_id.values) != set(locations):
@@ -98,28 +150,49 @@ class DismodExtractor(DismodIO):
             if col in df.columns:
                 DEMOGRAPHIC_COLS.append(col)
 
-        if samples:
-            VALUE_COL = ExtractorCols.VALUE_COL_SAMPLES
-            if ExtractorCols.SAMPLE_COL not in df.columns:
-                raise DismodExtractorError("Cannot find sample index column. Are you sure you created samples?")
-            if df[ExtractorCols.SAMPLE_COL].isnull().all():
-                raise DismodExtractorError("All sample index values are null. Are you sure you created samples?")
-            df[ExtractorCols.VALUE_COL_SAMPLES] = df[ExtractorCols.SAMPLE_COL].apply(
-                lambda x: f'{ExtractorCols.VALUE_COL_SAMPLES}_{x}'
+        if not samples:
+            return DrawMatrix(
+                index=df[DEMOGRAPHIC_COLS + INDEX_COLS],
+                draws=df[[ExtractorCols.RESULT_COL]].values.astype(dtype),
+                draw_names=[ExtractorCols.VALUE_COL_FIT]
             )
-            VALUE_COLS = df[ExtractorCols.VALUE_COL_SAMPLES].unique().tolist()
-            df = df[INDEX_COLS + DEMOGRAPHIC_COLS + [ExtractorCols.VALUE_COL_SAMPLES] + [ExtractorCols.RESULT_COL]]
-            if df[INDEX_COLS + DEMOGRAPHIC_COLS + [ExtractorCols.VALUE_COL_SAMPLES]].duplicated().any():
-                raise DismodExtractorError("There are duplicate entries in the prediction data frame"
-                                           "based on the expected columns. Please check the data.")
-            df.set_index(INDEX_COLS + DEMOGRAPHIC_COLS + [ExtractorCols.VALUE_COL_SAMPLES], inplace=True)
-            df = df.unstack().reset_index()
-            df.columns = INDEX_COLS + DEMOGRAPHIC_COLS + VALUE_COLS
-        else:
-            df.rename(columns={ExtractorCols.RESULT_COL: ExtractorCols.VALUE_COL_FIT}, inplace=True)
-            VALUE_COLS = [ExtractorCols.VALUE_COL_FIT]
 
-        return df[DEMOGRAPHIC_COLS + INDEX_COLS + VALUE_COLS]
+        if ExtractorCols.SAMPLE_COL not in df.columns:
+            raise DismodExtractorError("Cannot find sample index column. Are you sure you created samples?")
+        if df[ExtractorCols.SAMPLE_COL].isnull().all():
+            raise DismodExtractorError("All sample index values are null. Are you sure you created samples?")
+
+        # One row per avgint row, and one column per sample index.
+        rows = df.drop_duplicates(subset=['avgint_id']).sort_values(INDEX_COLS + DEMOGRAPHIC_COLS)
+        if rows[INDEX_COLS + DEMOGRAPHIC_COLS].duplicated().any():
+            raise DismodExtractorError("There are duplicate entries in the prediction data frame"
+                                       "based on the expected columns. Please check the data.")
+        row = pd.Index(rows.avgint_id).get_indexer(df.avgint_id)
+        sample_indices, column = np.unique(df[ExtractorCols.SAMPLE_COL].values, return_inverse=True)
+        cell = row * len(sample_indices) + column
+        if (np.bincount(cell) > 1).any():
+            raise DismodExtractorError("There are duplicate entries in the prediction data frame"
+                                       "based on the expected columns. Please check the data.")
+        draws = np.full((len(rows), len(sample_indices)), np.nan, dtype=dtype)
+        draws.flat[cell] = df[ExtractorCols.RESULT_COL].values
+        return DrawMatrix(
+            index=rows[DEMOGRAPHIC_COLS + INDEX_COLS],
+            draws=draws,
+            draw_names=[f'{ExtractorCols.VALUE_COL_SAMPLES}_{x}' for x in sample_indices]
+        )
+
+    def get_predictions(self, locations: Optional[List[int]] = None,
+                        sexes: Optional[List[int]] = None,
+                        samples: bool = False,
+                        predictions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Get the predictions from the predict table for locations and sexes.
+        Will either return a column of 'mean' if not samples, otherwise one 'draw_{i}'
+        column for each sample. This is the wide view of :meth:`get_prediction_draws`.
+        """
+        return self.get_prediction_draws(
+            locations=locations, sexes=sexes, samples=samples, predictions=predictions
+        ).to_wide()
 
     def gather_draws_for_prior_grid(self,
                                     location_id: int,
@@ -157,42 +230,31 @@ class DismodExtractor(DismodIO):
         for r in rates:
             rate_dict[r] = dict()
 
-        df = self.get_predictions(locations=[location_id], sexes=[sex_id], samples=samples)
-        if samples:
-            DRAW_COLS = [col for col in df if col.startswith(ExtractorCols.VALUE_COL_SAMPLES)]
-        else:
-            DRAW_COLS = [ExtractorCols.VALUE_COL_FIT]
+        predictions = self.get_prediction_draws(locations=[location_id], sexes=[sex_id], samples=samples)
+        df = predictions.index
         assert (df.age_lower.values == df.age_upper.values).all()
         assert (df.time_lower.values == df.time_upper.values).all()
 
-        # Loop over rates, age, and time
         for r in rates:
-            df2 = df.loc[df.rate == r].copy()
+            in_rate = (df.rate == r).values
+            df2 = df.loc[in_rate]
 
-            ages = np.asarray(sorted(df2.age_lower.unique().tolist()))
-            times = np.asarray(sorted(df2.time_lower.unique().tolist()))
-            n_draws = len(DRAW_COLS)
+            ages, age_idx = np.unique(df2.age_lower.values, return_inverse=True)
+            times, time_idx = np.unique(df2.time_lower.values, return_inverse=True)
+            n_draws = predictions.n_draws
 
             # Save these for later for quality checks
             rate_dict[r]['ages'] = ages
             rate_dict[r]['times'] = times
             rate_dict[r]['n_draws'] = n_draws
 
-            # Create template for filling in the draws
-            draw_data = np.zeros((len(ages), len(times), n_draws))
-            for age_idx, age in enumerate(ages):
-                for time_idx, time in enumerate(times):
-                    # Subset to the draws that we want from avg_integrand
-                    # but only for this particular age and time
-                    draws = df2.loc[
-                        (df2.age_lower == age) &
-                        (df2.time_lower == time)
-                    ][DRAW_COLS].values.ravel()
-
-                    # Check to makes sure that the number of draws corresponds to the number
-                    # of draws for the whole thing per age and time
-                    assert len(draws) == n_draws
-                    draw_data[age_idx, time_idx, :] = draws
+            # Each row goes to its cell of the (age, time) grid, and
+            # every cell needs exactly one row of draws.
+            cell = age_idx * len(times) + time_idx
+            assert (np.bincount(cell, minlength=len(ages) * len(times)) == 1).all()
+            draw_data = np.zeros((len(ages) * len(times), n_draws))
+            draw_data[cell] = predictions.draws[in_rate]
+            draw_data = draw_data.reshape((len(ages), len(times), n_draws))
 
             if value:
                 rate_dict[r]['value'] = draw_data
@@ -203,14 +265,17 @@ class DismodExtractor(DismodIO):
 
         return rate_dict
 
-    def format_predictions_for_ihme(self, gbd_round_id: int,
-                                    locations: Optional[List[int]] = None,
-                                    sexes: Optional[List[int]] = None,
-                                    samples: bool = False,
-                                    predictions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    def format_prediction_draws_for_ihme(self, gbd_round_id: int,
+                                         locations: Optional[List[int]] = None,
+                                         sexes: Optional[List[int]] = None,
+                                         samples: bool = False,
+                                         predictions: Optional[pd.DataFrame] = None,
+                                         dtype=np.float64) -> DrawMatrix:
         """
-        Formats predictions from the prediction table and returns either the mean
-        or draws, based on whether or not samples is False or True.
+        Formats predictions from the prediction table for the IHME databases,
+        as a :class:`DrawMatrix` whose index has location_id, year_id, age_group_id,
+        sex_id and measure_id. The draws are either the mean or the samples,
+        based on whether or not samples is False or True.
 
         Parameters
         ----------
@@ -226,43 +291,68 @@ class DismodExtractor(DismodIO):
         predictions
             An optional data frame with the predictions to use rather than
             reading them directly from the database.
-
-        Returns
-        -------
-        Data frame with predictions formatted for the IHME databases.
+        dtype
+            The type of the draws.
         """
-        pred = self.get_predictions(locations=locations, sexes=sexes, samples=samples,
-                                    predictions=predictions)
+        draws = self.get_prediction_draws(locations=locations, sexes=sexes, samples=samples,
+                                          predictions=predictions, dtype=dtype)
+        pred = draws.index.copy()
         map_age = 'age_group_id' not in pred.columns
         map_year = 'year_id' not in pred.columns
 
         if map_age:
-            age_intervals = make_age_intervals(gbd_round_id=gbd_round_id)
-            pred['age_group_id'] = pred['age_lower'].apply(
-                lambda x: map_id_from_interval_tree(index=x, tree=age_intervals)
-            )
+            pred['age_group_id'] = make_age_group_mapper(gbd_round_id=gbd_round_id).map(pred['age_lower'])
         if map_year:
-            time_intervals = make_time_intervals()
-            pred['year_id'] = pred['time_lower'].apply(
-                lambda x: map_id_from_interval_tree(index=x, tree=time_intervals)
-            )
+            pred['year_id'] = make_year_mapper().map(pred['time_lower'])
 
         integrand_map = reverse_integrand_map()
-        pred['measure_id'] = pred.integrand_name.apply(lambda x: integrand_map[x])
+        missing_integrands = set(pred.integrand_name) - set(integrand_map)
+        if missing_integrands:
+            raise DismodExtractorError(f"There are no measure IDs for integrands {missing_integrands}.")
+        pred['measure_id'] = pred.integrand_name.map(integrand_map)
+        draws = DrawMatrix(
+            index=pred[['location_id', 'year_id', 'age_group_id', 'sex_id', 'measure_id']],
+            draws=draws.draws, draw_names=draws.draw_names
+        )
 
         # Duplicates the Sincidence results, if they exist, so that they
         # show up as incidence in the visualization tool
-        if integrand_map['Sincidence'] in pred.measure_id.unique():
-            incidence = pred.loc[pred.measure_id == integrand_map['Sincidence']].copy()
-            incidence['measure_id'] = integrand_map['incidence']
-            pred = pd.concat([pred, incidence], axis=0).reset_index()
+        incidence = np.flatnonzero(pred.measure_id.values == integrand_map['Sincidence'])
+        if len(incidence):
+            draws = draws.take(np.concatenate([np.arange(len(draws)), incidence]))
+            draws.index.loc[len(pred):, 'measure_id'] = integrand_map['incidence']
+        return draws
 
-        if samples:
-            VALUE_COLS = [col for col in pred.columns if col.startswith(ExtractorCols.VALUE_COL_SAMPLES)]
-        else:
-            VALUE_COLS = [ExtractorCols.VALUE_COL_FIT]
+    def format_predictions_for_ihme(self, gbd_round_id: int,
+                                    locations: Optional[List[int]] = None,
+                                    sexes: Optional[List[int]] = None,
+                                    samples: bool = False,
+                                    predictions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Formats predictions from the prediction table and returns either the mean
+        or draws, based on whether or not samples is False or True.
+        This is the wide view of :meth:`format_prediction_draws_for_ihme`.
 
-        return pred[[
-            'location_id', 'year_id', 'age_group_id', 'sex_id',
-            'measure_id'
-        ] + VALUE_COLS]
+        Parameters
+        ----------
+        locations
+            A list of locations to extract from the predictions
+        sexes
+            A list of sexes to extract from the predictions
+        gbd_round_id
+            The GBD round ID to format the predictions for
+        samples
+            Whether or not the predictions have draws (samples) or whether
+            it is just one fit.
+        predictions
+            An optional data frame with the predictions to use rather than
+            reading them directly from the database.
+
+        Returns
+        -------
+        Data frame with predictions formatted for the IHME databases.
+        """
+        return self.format_prediction_draws_for_ihme(
+            gbd_round_id=gbd_round_id, locations=locations, sexes=sexes,
+            samples=samples, predictions=predictions
+        ).to_wide()
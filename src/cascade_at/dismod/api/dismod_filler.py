@@ -1,7 +1,7 @@
 import pandas as pd
 from pathlib import Path
 import numpy as np
-from typing import Optional, Dict, Union, Tuple
+from typing import Optional, Dict, Union, Tuple, List
 
 from cascade_at.settings.settings_config import SettingsConfig
 from cascade_at.inputs.measurement_inputs import MeasurementInputs
@@ -55,7 +55,8 @@ class DismodFiller(DismodIO):
                  measurement_inputs: MeasurementInputs, grid_alchemy: Alchemy,
                  parent_location_id: int, sex_id: int,
                  child_prior: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
-                 mulcov_prior: Optional[Dict[Tuple[str, str, str], _Prior]] = None):
+                 mulcov_prior: Optional[Dict[Tuple[str, str, str], _Prior]] = None,
+                 predict_integrands: Optional[List[str]] = None):
         """
         Parameters
         ----------
@@ -66,8 +67,11 @@ class DismodFiller(DismodIO):
         parent_location_id
         sex_id
         child_prior
+        predict_integrands
+            Integrands to put in the avgint table, defaulting to every integrand
+            but mtstandard and relrisk.
         """
-        super().__init__(path=path)
+        super().__init__(path=path, cache=True)
 
         self.settings = settings_configuration
         self.inputs = measurement_inputs
@@ -76,17 +80,14 @@ class DismodFiller(DismodIO):
         self.sex_id = sex_id
         self.child_prior = child_prior
         self.mulcov_prior = mulcov_prior
+        self.predict_integrands = predict_integrands
 
         self.omega_df = self.get_omega_df()
         self.min_cv = min_cv_from_settings(settings=self.settings)
         self.covariate_reference_specs = self.calculate_reference_covariates()
         self.parent_child_model = self.get_parent_child_model()
 
-        self.min_age = self.inputs.dismod_data.age_lower.min()
-        self.max_age = self.inputs.dismod_data.age_upper.max()
-
-        self.min_time = self.inputs.dismod_data.time_lower.min()
-        self.max_time = self.inputs.dismod_data.time_upper.max()
+        self.min_age, self.max_age, self.min_time, self.max_time = self.inputs.dismod_data_extent()
 
     def get_omega_df(self):
         """
@@ -94,13 +95,11 @@ class DismodFiller(DismodIO):
 
         :return: pd.DataFrame
         """
-        if self.inputs.omega is not None:
-            omega_df = self.inputs.omega.loc[self.inputs.omega.sex_id == self.sex_id].copy()
-            omega_df = omega_df[omega_df.location_id.isin(
-                self.inputs.location_dag.parent_children(self.parent_location_id)
-            )].copy()
-        else:
-            omega_df = None
+        omega_df = self.inputs.locations_slice(
+            name='omega', location_ids=self.inputs.location_dag.parent_children(self.parent_location_id)
+        )
+        if omega_df is not None:
+            omega_df = omega_df.loc[omega_df.sex_id == self.sex_id].copy()
         return omega_df
 
     def get_parent_child_model(self):
@@ -141,18 +140,23 @@ class DismodFiller(DismodIO):
 
         Pass in some optional keyword arguments to fill the option
         table with additional info or to over-ride the defaults.
+
+        All of the tables are written in one bulk transaction.
         """
         LOG.info(f"Filling tables in {self.path.absolute()}")
-        self.fill_reference_tables()
-        self.fill_grid_tables()
-        self.fill_data_tables()
-        self.option = self.construct_option_table(**options)
+        with self.bulk_write():
+            self.fill_reference_tables()
+            self.fill_grid_tables()
+            self.fill_data_tables()
+            self.option = self.construct_option_table(**options)
 
     def node_id_from_location_id(self, location_id: int):
         """
         Get the node ID from a location ID in an already created node table.
         """
-        loc_df = self.node.loc[self.node.c_location_id == location_id]
+        loc_df = self.read_table(
+            'node', columns=['node_id', 'c_location_id'], where={'c_location_id': location_id}
+        )
         if len(loc_df) > 1:
             raise RuntimeError("Problem with the node table -- should only be one node-id for each location_id.")
         return loc_df['node_id'].iloc[0]
@@ -202,7 +206,8 @@ class DismodFiller(DismodIO):
             covariate_df=self.covariate,
             integrand_df=self.integrand,
             ages=self.parent_child_model.get_age_array(),
-            times=self.parent_child_model.get_time_array()
+            times=self.parent_child_model.get_time_array(),
+            integrands=self.predict_integrands
         )
         return self
 
@@ -1,9 +1,38 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
 from cascade_at.core.log import get_loggers
 from cascade_at.dismod.api.dismod_sqlite import DismodSQLite
 
 LOG = get_loggers(__name__)
 
 
+def sqlite_file_version(path: Path) -> Optional[Tuple[Any, ...]]:
+    """
+    A token that changes whenever another process commits to the SQLite file.
+    It is the file change counter from the SQLite header, which every commit
+    in rollback-journal mode increments, plus the size and modification time
+    of the write-ahead log, for databases in WAL mode.
+    Returns None if the file doesn't exist yet.
+    """
+    path = Path(path)
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(28)
+    except FileNotFoundError:
+        return None
+    change_counter = int.from_bytes(header[24:28], byteorder='big') if len(header) == 28 else None
+    wal = Path(str(path) + '-wal')
+    if wal.exists():
+        wal_stat = wal.stat()
+        return change_counter, wal_stat.st_size, wal_stat.st_mtime_ns
+    return change_counter, None, None
+
+
 class DismodIO(DismodSQLite):
     """
     This class is a verbose getter and setter for tables in the dismod file.
@@ -11,9 +40,63 @@ class DismodIO(DismodSQLite):
     just be able to say, e.g. dmfile.data = pd.DataFrame({...}) as the 'setter', and it will
     automatically write it. Likewise, if you want to get one of the tables,
     then you can just do df = dmfile.data as the 'getter' and it will automatically read it.
+
+    With ``cache=True``, whole tables that have been read are kept in memory
+    and later reads of them, including reads of a subset of their rows and columns,
+    come from memory. Writing a table through this object drops it from the cache,
+    and any commit to the file from somewhere else, such as running
+    ``dmdismod`` on it, drops the whole cache.
     """
-    def __init__(self, path):
+    def __init__(self, path, cache: bool = False):
         super().__init__(path=path)
+        self._cache: Optional[Dict[str, pd.DataFrame]] = dict() if cache else None
+        self._cache_version = None
+
+    def clear_cache(self):
+        """Forget every table that was read."""
+        if self._cache is not None:
+            self._cache.clear()
+        self._cache_version = sqlite_file_version(self.path)
+
+    def _validate_cache(self):
+        """Drops the cache if the file has been committed to since it was filled."""
+        version = sqlite_file_version(self.path)
+        if version != self._cache_version:
+            if self._cache:
+                LOG.debug(f"{self.path} changed on disk, clearing the table cache.")
+            self._cache.clear()
+            self._cache_version = version
+
+    def read_table(self, table_name: str, columns: Optional[List[str]] = None,
+                   where: Optional[Dict[str, Any]] = None, chunksize: Optional[int] = None):
+        if self._cache is None or chunksize is not None:
+            return super().read_table(table_name, columns=columns, where=where, chunksize=chunksize)
+        self._validate_cache()
+        if table_name not in self._cache:
+            if columns is not None or where is not None:
+                return super().read_table(table_name, columns=columns, where=where)
+            self._cache[table_name] = super().read_table(table_name)
+        return _select_from_frame(self._cache[table_name], columns=columns, where=where)
+
+    def write_table(self, table_name, table, append: bool = False):
+        if self._cache is None:
+            return super().write_table(table_name, table, append=append)
+        self._validate_cache()
+        self._cache.pop(table_name, None)
+        super().write_table(table_name, table, append=append)
+        self._cache_version = sqlite_file_version(self.path)
+
+    @contextmanager
+    def bulk_write(self, *args, **kwargs):
+        try:
+            with super().bulk_write(*args, **kwargs):
+                yield self
+        except Exception:
+            if self._cache is not None:
+                self.clear_cache()
+            raise
+        if self._cache is not None:
+            self._cache_version = sqlite_file_version(self.path)
 
     # AGE TABLE
     @property
@@ -329,3 +412,25 @@ class DismodIO(DismodSQLite):
     @hes_random.setter
     def hes_random(self, df):
         self.write_table('hes_random', df)
+
+
+def _select_from_frame(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                       where: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    The in-memory equivalent of a filtered read, returning a copy so that
+    callers can modify what they get without changing the cache.
+    """
+    missing = [c for c in list(columns or []) + list(where or {}) if c not in df.columns]
+    if missing:
+        raise ValueError(f"Table does not have columns {missing}.")
+    if where:
+        keep = np.ones(len(df), dtype=bool)
+        for name, value in where.items():
+            if isinstance(value, (list, tuple, set, np.ndarray, pd.Index, pd.Series)):
+                keep &= df[name].isin(list(value)).values
+            else:
+                keep &= (df[name] == value).values
+        df = df.loc[keep].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    return df.copy()
@@ -8,18 +8,26 @@ The object wrapper makes Pandas data frames. They get passed here
 and validated. Then Pandas uses to_csv to write them to the sqlalchemy
 engine, which uses the metadata wrapper (and its custom conversions)
 to write them to a very specific format that Dismod-AT is able to read.
+
+For fills that write many tables at once, :py:meth:`DismodSQLite.bulk_write`
+puts every write into one SQLite transaction and inserts rows with
+``executemany`` on a prepared statement instead of going through
+``to_sql`` one table (and one commit) at a time.
 """
+from contextlib import contextmanager
 from copy import deepcopy
 from textwrap import dedent
 from pathlib import Path
-from typing import Union
+from typing import Union, Optional, Dict, List, Any, Iterator
 
 import numpy as np
 import pandas as pd
 from pandas.core.dtypes.base import ExtensionDtype
-from sqlalchemy import Enum, Integer, Float
-from sqlalchemy import create_engine
-from sqlalchemy.exc import StatementError
+from sqlalchemy import Enum, Integer, Float, BigInteger
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy import create_engine, select, and_, func
+from sqlalchemy.exc import StatementError, InvalidRequestError
+from sqlalchemy.schema import CreateTable, CreateIndex
 
 from cascade_at.core.log import get_loggers
 from cascade_at.core.errors import DismodFileError
@@ -28,6 +36,27 @@ from cascade_at.dismod.api.table_metadata import Base, add_columns_to_table
 LOG = get_loggers(__name__)
 
 
+BULK_WRITE_PRAGMAS = {
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+"""
+PRAGMAs set on the connection for every bulk write. A negative cache_size
+is in KiB, so this is a 64 MiB page cache instead of the 2 MiB default.
+"""
+
+SCRATCH_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+}
+"""
+PRAGMAs that trade durability for speed. Only use these for scratch
+databases that can be rebuilt if the process dies part-way through a write.
+The journal mode is set back to DELETE when the bulk write finishes so that
+the database is a single file again before Dismod-AT or a copy touches it.
+"""
+
+
 def get_engine(file_path):
     if file_path is not None:
         full_path = file_path.expanduser().absolute()
@@ -37,6 +66,27 @@ def get_engine(file_path):
     return engine
 
 
+def _to_python(value):
+    """Numpy scalars become Python scalars so they can be bound as parameters."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _to_records(table):
+    """
+    Converts a data frame to a list of row tuples of Python scalars
+    that the sqlite3 module can bind, with missing values as None.
+    """
+    columns = list()
+    for name in table.columns:
+        values = table[name]
+        if values.isnull().any():
+            values = values.astype(object).where(values.notnull(), None)
+        columns.append(values.tolist())
+    return list(zip(*columns))
+
+
 class DismodSQLite:
     """
     Responsible for creation of a Dismod-AT file.
@@ -84,8 +134,68 @@ class DismodSQLite:
         self.engine = get_engine(path)
         self._metadata = deepcopy(Base.metadata)
         self._table_definitions = self._metadata.tables
+        self._connection = None
         LOG.debug(f"dmfile tables {self._table_definitions.keys()}")
 
+    @contextmanager
+    def bulk_write(self, scratch: bool = False, pragmas: Optional[Dict[str, Union[int, str]]] = None):
+        """
+        Context manager that puts every table read and write inside it on one
+        connection and one SQLite transaction. Tables are written with
+        ``executemany`` on a prepared insert statement. The transaction
+        is committed when the block exits and rolled back if it raises.
+        Calling it again inside an open bulk write re-uses the open transaction.
+
+        >>> dm = DismodSQLite('test.db')
+        >>> with dm.bulk_write():
+        >>>     dm.write_table('age', pd.DataFrame({'age': [0., 1., 5.]}))
+        >>>     dm.write_table('time', pd.DataFrame({'time': [1990., 2000.]}))
+
+        Parameters
+        ----------
+        scratch
+            Whether this is a scratch database, in which case
+            :py:const:`SCRATCH_PRAGMAS` are set as well.
+        pragmas
+            Additional PRAGMAs to set on the connection, which
+            override the defaults.
+        """
+        if self._connection is not None:
+            yield self
+            return
+
+        settings = dict(BULK_WRITE_PRAGMAS)
+        if scratch:
+            settings.update(SCRATCH_PRAGMAS)
+        if pragmas:
+            settings.update(pragmas)
+
+        connection = self.engine.connect()
+        cursor = connection.connection.cursor()
+        try:
+            for name, value in settings.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            LOG.debug(f"Starting a bulk write to {self.path} with PRAGMAs {settings}.")
+            transaction = connection.begin()
+            # The sqlite3 driver only opens a transaction implicitly before
+            # inserts, so begin explicitly to include the drops and creates.
+            cursor.execute("BEGIN")
+            self._connection = connection
+            try:
+                yield self
+            except Exception:
+                transaction.rollback()
+                raise
+            else:
+                transaction.commit()
+            finally:
+                self._connection = None
+            if str(settings.get('journal_mode', '')).upper() == 'WAL':
+                cursor.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            cursor.close()
+            connection.close()
+
     def create_tables(self, tables=None):
         """
         Make all of the tables in the metadata.
@@ -120,19 +230,103 @@ class DismodSQLite:
 
         add_columns_to_table(table_definition, new_column_types)
 
-    def read_table(self, table_name):
+    def read_table(self, table_name: str, columns: Optional[List[str]] = None,
+                   where: Optional[Dict[str, Any]] = None,
+                   chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Read a table from the database in engine specified.
+        The column projection and row filter are done by SQLite, so
+        only the rows and columns asked for are ever loaded.
+
+        >>> dm.read_table('sample', where={'sample_index': 3})
+        >>> dm.read_table('avgint', columns=['avgint_id', 'c_location_id'],
+        >>>               where={'c_location_id': [102, 555], 'c_sex_id': 2})
+
+        Parameters
+        ----------
+        table_name
+            Name of the table to read.
+        columns
+            Columns to read. Defaults to all of them.
+        where
+            Dictionary from column name to a value, or to a list of values,
+            that the column must match. Every entry must match for a row to be read.
+        chunksize
+            If set, returns an iterator over data frames of at most this many rows.
         """
-        return pd.read_sql_table(table_name=table_name, con=self.engine)
+        if columns is None and where is None and chunksize is None:
+            return pd.read_sql_table(table_name=table_name, con=self._connectable)
+
+        table = self._reflect_table(table_name)
+        query = self._select_query(table, columns=columns, where=where)
+        result = pd.read_sql_query(query, con=self._connectable, chunksize=chunksize)
+        if chunksize is None:
+            return self._harmonize_columns(result, table)
+        return (self._harmonize_columns(chunk, table) for chunk in result)
+
+    def _reflect_table(self, table_name):
+        """Reads the definition of a table as it is in the file, including extra columns."""
+        metadata = MetaData()
+        try:
+            metadata.reflect(bind=self._connectable, only=[table_name])
+        except InvalidRequestError as ire:
+            raise ValueError(f"Table {table_name} not found in {self.path}.") from ire
+        return metadata.tables[table_name]
+
+    @staticmethod
+    def _select_query(table, columns=None, where=None):
+        """Builds a select for some columns of a table with equality or membership conditions."""
+        missing = [c for c in (columns or []) + list((where or {}).keys()) if c not in table.c]
+        if missing:
+            raise ValueError(f"Table {table.name} does not have columns {missing}.")
+        if columns is None:
+            query = select([table])
+        else:
+            query = select([table.c[c] for c in columns])
+        if where:
+            conditions = list()
+            for name, value in where.items():
+                if isinstance(value, (list, tuple, set, np.ndarray, pd.Index, pd.Series)):
+                    conditions.append(table.c[name].in_([_to_python(v) for v in value]))
+                else:
+                    conditions.append(table.c[name] == _to_python(value))
+            query = query.where(and_(*conditions))
+        id_column = f"{table.name}_id"
+        if id_column in table.c:
+            query = query.order_by(table.c[id_column])
+        return query
 
-    def write_table(self, table_name, table):
+    @staticmethod
+    def _harmonize_columns(df, table):
+        """
+        Converts column types the way ``read_sql_table`` does, so that
+        filtered reads and whole-table reads give the same dtypes.
+        """
+        for name in df.columns:
+            column_type = table.c[name].type
+            if isinstance(column_type, Float):
+                df[name] = df[name].astype(np.float64)
+            elif isinstance(column_type, Integer) and df[name].notnull().all():
+                df[name] = df[name].astype(np.int64)
+        return df
+
+    @property
+    def _connectable(self):
+        """The open bulk write connection, if there is one, so reads see its uncommitted writes."""
+        if self._connection is not None:
+            return self._connection
+        return self.engine
+
+    def write_table(self, table_name, table, append: bool = False):
         """
         Writes a table to the database in the engine specified.
 
         Parameters:
             table_name (str): the name of the table to write to
             table (pd.DataFrame): data frame to write
+            append (bool): add the rows to the table if it exists instead of
+                replacing it. Rows without a table_name_id are numbered after
+                the largest ID already in the table.
         """
         table_definition = self._table_definitions[table_name]
 
@@ -144,7 +338,8 @@ class DismodSQLite:
         dtypes = {k: v.type for k, v in table_definition.c.items()}
         id_column = f"{table_name}_id"
         if id_column not in table:
-            table[id_column] = table.reset_index(drop=True).index
+            start = self._next_id(table_name, id_column) if append else 0
+            table[id_column] = table.reset_index(drop=True).index + start
         table = pd.DataFrame(table, columns = dtypes.keys())
 
         self._validate_data(table_definition, table)
@@ -154,6 +349,10 @@ class DismodSQLite:
             table.index = table.index.astype(np.int64)
         except ValueError as ve:
             raise ValueError(f"Cannot convert {table_name}.{table_name}_id to index") from ve
+        if self._connection is not None:
+            LOG.debug(f"Bulk writing table {table_name} rows {len(table)} types {dtypes}")
+            self._bulk_write_table(table_name, table, dtypes, id_column, append=append)
+            return
         try:
             LOG.debug(f"Writing table {table_name} rows {len(table)} types {dtypes}")
             table.index.name = None
@@ -161,12 +360,58 @@ class DismodSQLite:
                 name=table_name,
                 con=self.engine,
                 index_label=id_column,
-                if_exists="replace",
+                if_exists="append" if append else "replace",
                 dtype=dtypes
             )
         except StatementError:
             raise
 
+    def _has_table(self, table_name):
+        if self._connection is not None:
+            return self.engine.dialect.has_table(self._connection, table_name)
+        with self.engine.connect() as connection:
+            return self.engine.dialect.has_table(connection, table_name)
+
+    def _next_id(self, table_name, id_column):
+        """The ID after the largest one in the table, or 0 if there is no table."""
+        if not self._has_table(table_name):
+            return 0
+        table = self._reflect_table(table_name)
+        largest = pd.read_sql_query(select([func.max(table.c[id_column])]), con=self._connectable).iloc[0, 0]
+        return 0 if pd.isnull(largest) else int(largest) + 1
+
+    def _bulk_write_table(self, table_name, table, dtypes, id_column, append=False):
+        """
+        Replaces a table on the open bulk write connection. The schema is
+        the same one that ``to_sql`` would create: the ID column is a
+        ``BIGINT`` with an index, not a rowid alias, so rows are stored in the
+        order they are inserted, and the other columns have the types from
+        the table metadata. When appending to a table that exists, the rows
+        are only inserted.
+        """
+        columns = [Column(id_column, BigInteger(), index=True)]
+        columns += [Column(name, column_type) for name, column_type in dtypes.items() if name != id_column]
+        schema = Table(table_name, MetaData(), *columns)
+        dialect = self.engine.dialect
+
+        names = [c.name for c in schema.columns]
+        quoted = ", ".join(f'"{name}"' for name in names)
+        placeholders = ", ".join("?" for _ in names)
+        insert = f'INSERT INTO "{table_name}" ({quoted}) VALUES ({placeholders})'
+
+        table = table.reset_index().rename(columns={"index": id_column})
+        replace = not (append and self._has_table(table_name))
+        cursor = self._connection.connection.cursor()
+        try:
+            if replace:
+                cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                cursor.execute(str(CreateTable(schema).compile(dialect=dialect)))
+                for index in schema.indexes:
+                    cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+            cursor.executemany(insert, _to_records(table[names]))
+        finally:
+            cursor.close()
+
     def empty_table(self, table_name, extra_columns=None):
         """
         Initializes an empty table for table_name.
@@ -0,0 +1,182 @@
+import warnings
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from cascade_at.dismod.api import DismodAPIError
+
+
+class DrawMatrixError(DismodAPIError):
+    """Raised when the index and the draws of a DrawMatrix don't go together."""
+    pass
+
+
+class DrawMatrix:
+    """
+    Draws for a set of rows, kept as a small data frame that describes
+    the rows and one contiguous NumPy array of the draws, rather than as
+    one data frame column per draw.
+
+    Parameters
+    ----------
+    index
+        A data frame with one row for each row of draws, e.g. the location, sex,
+        integrand, age and time of a prediction. Its index is reset.
+    draws
+        An array of shape (len(index), n_draws).
+    draw_names
+        The names of the draw columns in :meth:`to_wide`.
+        Defaults to draw_0, ..., draw_{n_draws - 1}.
+
+    Examples
+    --------
+    >>> dm = DrawMatrix(index=pd.DataFrame({'location_id': [1, 2]}), draws=np.random.rand(2, 1000))
+    >>> dm.draws.mean(axis=1)
+    >>> dm.to_wide()  # columns location_id, draw_0, ..., draw_999
+    """
+    def __init__(self, index: pd.DataFrame, draws: np.ndarray, draw_names: Optional[List[str]] = None):
+        draws = np.ascontiguousarray(draws)
+        if draws.ndim != 2 or draws.shape[0] != len(index):
+            raise DrawMatrixError(
+                f"Draws of shape {draws.shape} don't match an index with {len(index)} rows."
+            )
+        if draw_names is None:
+            draw_names = [f'draw_{i}' for i in range(draws.shape[1])]
+        if len(draw_names) != draws.shape[1]:
+            raise DrawMatrixError(f"There are {len(draw_names)} draw names for {draws.shape[1]} draws.")
+        self.index = index.reset_index(drop=True)
+        self.draws = draws
+        self.draw_names = list(draw_names)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def n_draws(self) -> int:
+        return self.draws.shape[1]
+
+    def take(self, rows: Union[np.ndarray, pd.Series, List[int]]) -> 'DrawMatrix':
+        """
+        Get the draw matrix for some of the rows, given either as positions
+        or as a boolean mask.
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return DrawMatrix(index=self.index.iloc[rows], draws=self.draws[rows], draw_names=self.draw_names)
+
+    def astype(self, dtype) -> 'DrawMatrix':
+        return DrawMatrix(index=self.index, draws=self.draws.astype(dtype), draw_names=self.draw_names)
+
+    def summarize(self, mean: bool = True, std: bool = False,
+                  quantiles: Optional[Sequence[float]] = None) -> pd.DataFrame:
+        """
+        The index with a summary of the draws of each row. See :func:`summarize_draws`.
+        """
+        summary = summarize_draws(self.draws, mean=mean, std=std, quantiles=quantiles)
+        return pd.concat([self.index, summary], axis=1)
+
+    def to_wide(self) -> pd.DataFrame:
+        """
+        The draws as one data frame, with the index columns
+        followed by one column per draw.
+        """
+        draws = pd.DataFrame(self.draws, columns=self.draw_names, copy=False)
+        return pd.concat([self.index, draws], axis=1)
+
+    @classmethod
+    def from_wide(cls, df: pd.DataFrame, draw_names: List[str]) -> 'DrawMatrix':
+        """
+        The inverse of :meth:`to_wide`, where draw_names are the draw columns.
+        """
+        return cls(
+            index=df[[c for c in df.columns if c not in draw_names]],
+            draws=df[draw_names].values,
+            draw_names=draw_names
+        )
+
+
+DRAW_SUMMARY_CHUNK_SIZE = 20_000
+"""Number of rows of draws summarized at once, which bounds the memory used for sorting them."""
+
+
+def _row_quantiles(draws: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """
+    Linearly interpolated quantiles of each row, computed the way np.quantile
+    computes them but with one np.partition of the rows around just the
+    order statistics that the quantiles need.
+    """
+    n_draws = draws.shape[1]
+    virtual = np.asarray(quantiles, dtype=float) * (n_draws - 1)
+    below = np.floor(virtual).astype(int)
+    above = np.minimum(below + 1, n_draws - 1)
+    fraction = virtual - below
+    partitioned = np.partition(draws, np.unique(np.concatenate([below, above])), axis=1)
+    a, b = partitioned[:, below].T, partitioned[:, above].T
+    difference = b - a
+    fraction = fraction[:, None]
+    return np.where(fraction >= 0.5, b - difference * (1 - fraction), a + difference * fraction)
+
+
+def summarize_draws(draws: np.ndarray, mean: bool = True, std: bool = False,
+                    quantiles: Optional[Sequence[float]] = None, ddof: int = 0,
+                    chunk_size: int = DRAW_SUMMARY_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Summarizes each row of a matrix of draws. All of the quantiles of
+    a chunk of rows come from one np.partition, and chunks are summarized
+    one after another to bound memory. NaN draws are skipped, as pandas does,
+    but only chunks that have a NaN pay for that.
+
+    Parameters
+    ----------
+    draws
+        An array of shape (rows, n_draws).
+    mean
+        Whether to compute the mean of each row, in column 'mean'
+    std
+        Whether to compute the standard deviation of each row, in column 'std'
+    quantiles
+        Quantiles to compute for each row, in columns 'quantile_{q}', with
+        linear interpolation the same as pd.DataFrame.quantile.
+    ddof
+        Delta degrees of freedom for the standard deviation
+    chunk_size
+        The number of rows to summarize at once
+
+    Returns
+    -------
+    A data frame with a row for each row of draws.
+    """
+    draws = np.asarray(draws)
+    if draws.ndim != 2:
+        raise DrawMatrixError(f"Draws to summarize have to be 2-d, not of shape {draws.shape}.")
+    quantiles = list(quantiles) if quantiles is not None else []
+    n_rows = draws.shape[0]
+    summary = dict()
+    if mean:
+        summary['mean'] = np.empty(n_rows)
+    if std:
+        summary['std'] = np.empty(n_rows)
+    quantile_values = np.empty((len(quantiles), n_rows))
+
+    with warnings.catch_warnings():
+        # Rows with no draws that aren't NaN summarize to NaN, without a warning.
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for start in range(0, n_rows, chunk_size):
+            rows = slice(start, start + chunk_size)
+            chunk = draws[rows].astype(np.float64, copy=False)
+            has_nan = np.isnan(chunk).any()
+            if mean:
+                summary['mean'][rows] = (np.nanmean if has_nan else np.mean)(chunk, axis=1)
+            if std:
+                summary['std'][rows] = (np.nanstd if has_nan else np.std)(chunk, axis=1, ddof=ddof)
+            if quantiles:
+                if has_nan or not chunk.shape[1]:
+                    quantile_values[:, rows] = np.nanquantile(chunk, quantiles, axis=1)
+                else:
+                    quantile_values[:, rows] = _row_quantiles(chunk, quantiles)
+
+    for q, values in zip(quantiles, quantile_values):
+        summary[f'quantile_{q}'] = values
+    return pd.DataFrame(summary, index=pd.RangeIndex(n_rows))
@@ -4,7 +4,7 @@ import pandas as pd
 from cascade_at.core.log import get_loggers
 from cascade_at.dismod.api.fill_extract_helpers import utils
 from cascade_at.dismod.constants import DensityEnum, IntegrandEnum, \
-    INTEGRAND_TO_WEIGHT
+    INTEGRAND_TO_WEIGHT, enum_values, lookup_values
 
 LOG = get_loggers(__name__)
 
@@ -47,9 +47,10 @@ def construct_data_table(df, node_df, covariate_df, ages, times):
     )
     data["data_name"] = data.index.astype(str)
 
-    data["density_id"] = data["density"].apply(lambda x: DensityEnum[x].value)
-    data["integrand_id"] = data["measure"].apply(lambda x: IntegrandEnum[x].value)
-    data["weight_id"] = data["measure"].apply(lambda x: INTEGRAND_TO_WEIGHT[x].value)
+    data["density_id"] = enum_values(data["density"], DensityEnum)
+    data["integrand_id"] = enum_values(data["measure"], IntegrandEnum)
+    data["weight_id"] = lookup_values(
+        data["measure"], {name: weight.value for name, weight in INTEGRAND_TO_WEIGHT.items()})
     data["subgroup_id"] = 0
 
     columns = data.columns
@@ -64,10 +65,25 @@ def construct_data_table(df, node_df, covariate_df, ages, times):
     return data
 
 
-def construct_gbd_avgint_table(df, node_df, covariate_df, integrand_df, ages, times):
+def construct_gbd_avgint_table(df, node_df, covariate_df, integrand_df, ages, times,
+                               integrands=None):
     """
     Constructs the avgint table using the output df
-    from the inputs.to_avgint() method.
+    from the inputs.to_avgint() method. There is a copy of each row of
+    the df for each integrand, in order of integrand, made by
+    repeating the columns, so that only the integrands to predict
+    are ever in the table.
+
+    Parameters:
+        df: (pd.DataFrame) output of inputs.to_avgint()
+        node_df: (pd.DataFrame) the dismod node table
+        covariate_df: (pd.DataFrame) the dismod covariate table
+        integrand_df: (pd.DataFrame) the dismod integrand table
+        ages: (np.array)
+        times: (np.array)
+        integrands: (optional list of str) the integrands to predict, which
+            must be in the integrand table. Defaults to every integrand
+            in the integrand table except mtstandard and relrisk.
     """
     LOG.info("Constructing the avgint table.")
     avgint = df.copy()
@@ -76,30 +92,39 @@ def construct_gbd_avgint_table(df, node_df, covariate_df, integrand_df, ages, ti
         node_df=node_df,
         covariate_df=covariate_df
     )
-    avgint_df = pd.DataFrame()
-    for i in integrand_df.integrand_name.unique():
-        if i == 'mtstandard' or i == 'relrisk':
-            continue
-        df = avgint.copy()
-        df['measure'] = i
-        avgint_df = avgint_df.append(df)
-
-    avgint_df = avgint_df.reset_index(drop=True)
-
-    avgint_df["integrand_id"] = avgint_df["measure"].apply(lambda x: IntegrandEnum[x].value)
-    avgint_df["weight_id"] = avgint_df["measure"].apply(lambda x: INTEGRAND_TO_WEIGHT[x].value)
-    avgint_df["subgroup_id"] = 0
-
-    avgint_df = avgint_df[[
-        'integrand_id', 'node_id', 'weight_id', 'subgroup_id', 'c_location_id',
-        'age_group_id', 'year_id', 'sex_id',
+    if integrands is None:
+        integrands = [
+            i for i in integrand_df.integrand_name.unique() if i not in ['mtstandard', 'relrisk']
+        ]
+    else:
+        missing = set(integrands) - set(integrand_df.integrand_name)
+        if missing:
+            raise ValueError(f"Integrands {missing} to predict are not in the integrand table.")
+    integrand_ids = np.array([IntegrandEnum[i].value for i in integrands], dtype=int)
+    weight_ids = np.array([INTEGRAND_TO_WEIGHT[i].value for i in integrands], dtype=int)
+
+    in_range = (
+        (avgint.time_lower >= times.min()) & (avgint.time_upper <= times.max()) &
+        (avgint.age_lower >= ages.min()) & (avgint.age_upper <= ages.max())
+    ).values
+    rows = np.flatnonzero(in_range)
+    base = avgint.iloc[rows]
+    columns = dict(
+        integrand_id=np.repeat(integrand_ids, len(rows)),
+        node_id=None,
+        weight_id=np.repeat(weight_ids, len(rows)),
+        subgroup_id=0
+    )
+    for col in [
+        'node_id', 'c_location_id', 'age_group_id', 'year_id', 'sex_id',
         'age_lower', 'age_upper', 'time_lower', 'time_upper'
-    ] + [x for x in avgint_df.columns if x.startswith('x_')]]
-    
-    gbd_id_cols = ['sex_id', 'age_group_id', 'year_id']
-    avgint_df.rename(columns={x: 'c_' + x for x in gbd_id_cols}, inplace=True)
+    ] + [x for x in avgint.columns if x.startswith('x_')]:
+        columns[col] = np.tile(base[col].values, len(integrands))
 
-    avgint_df = avgint_df.loc[(avgint_df.time_lower >= times.min()) & (avgint_df.time_upper <= times.max())].copy()
-    avgint_df = avgint_df.loc[(avgint_df.age_lower >= ages.min()) & (avgint_df.age_upper <= ages.max())].copy()
+    # The index is each row's position in the table of every avgint row for every integrand.
+    index = np.repeat(np.arange(len(integrands)) * len(avgint), len(rows)) + np.tile(rows, len(integrands))
+    avgint_df = pd.DataFrame(columns, index=index)
 
+    gbd_id_cols = ['sex_id', 'age_group_id', 'year_id']
+    avgint_df.rename(columns={x: 'c_' + x for x in gbd_id_cols}, inplace=True)
     return avgint_df
@@ -52,6 +52,10 @@ def construct_weight_grid_tables(weights, age_df, time_df):
 def add_prior_smooth_entries(grid_name, grid, num_existing_priors, num_existing_grids,
                              age_df, time_df):
     """
+    Makes the prior, smooth and smooth_grid entries for one smoothing.
+    The priors of a SmoothGrid have one row for each grid point of each kind,
+    so the smooth grid takes the prior IDs of each kind at its grid points.
+
     Returns:
         (pd.DataFrame, pd.DataFrame, pd.DataFrame)
     """
@@ -61,26 +65,24 @@ def add_prior_smooth_entries(grid_name, grid, num_existing_priors, num_existing_
 
     # Get the densities for the priors
     prior_df.loc[prior_df.density.isnull(), ["density", "mean", "lower", "upper"]] = DEFAULT_DENSITY
-    prior_df["density_id"] = prior_df["density"].apply(lambda x: DensityEnum[x].value)
-    prior_df["prior_id"] = prior_df.index + num_existing_priors
-    prior_df["assigned"] = prior_df.density.notna()
-
-    prior_df.rename(columns={"name": "prior_name"}, inplace=True)
+    density_names, density_index = np.unique(prior_df.density.to_numpy(), return_inverse=True)
+    density_ids = np.array([DensityEnum[name].value for name in density_names], dtype=np.int64)
+    prior_id = np.arange(len(prior_df), dtype=np.int64) + num_existing_priors
 
     # Assign names to each of the priors
-    null_names = prior_df.prior_name.isnull()
-    prior_df.loc[~null_names, "prior_name"] = (
-            prior_df.loc[~null_names, "prior_name"].astype(str) + "    " +
-            prior_df.loc[~null_names, "prior_id"].astype(str)
-    )
-    prior_df.loc[null_names, "prior_name"] = prior_df.loc[null_names, "prior_id"].apply(
-        lambda pid: f"{grid_name}_{pid}"
+    null_names = prior_df.name.isnull().to_numpy()
+    name_prefix = prior_df.name.astype(str) + "    "
+    name_prefix[null_names] = f"{grid_name}_"
+
+    prior_df = prior_df.assign(
+        prior_id=prior_id,
+        prior_name=name_prefix + pd.Series(prior_id, index=prior_df.index).astype(str),
+        density_id=density_ids[density_index]
     )
 
     # Convert to age and time ID for prior table
-    prior_df = utils.convert_age_time_to_id(
-        df=prior_df, age_df=age_df, time_df=time_df
-    )
+    age_id = utils.nearest_id(prior_df.age, age_df, "age")
+    time_id = utils.nearest_id(prior_df.time, time_df, "time")
 
     # Create the simple smooth data frame
     smooth_df = pd.DataFrame({
@@ -92,24 +94,30 @@ def add_prior_smooth_entries(grid_name, grid, num_existing_priors, num_existing_
         "mulstd_dtime_prior_id": [np.nan]
     })
 
-    # Create the grid entries
+    # Create the grid entries, one row per point with the prior of each kind.
     # TODO: Pass in the value prior ID instead from posterior to prior
-    long_table = prior_df.loc[prior_df.age_id.notna()][["age_id", "time_id", "prior_id", "kind"]]
-    grid_df = long_table[["age_id", "time_id"]].sort_values(["age_id", "time_id"]).drop_duplicates()
-
-    for kind in ["value", "dage", "dtime"]:
-        grid_values = long_table.loc[long_table.kind == kind].drop("kind", axis="columns")
-        grid_values.rename(columns={"prior_id": f"{kind}_prior_id"}, inplace=True)
-        grid_df = grid_df.merge(grid_values, on=["age_id", "time_id"])
-
-    grid_df = grid_df.sort_values(["age_id", "time_id"], axis=0).reindex()
-    grid_df["const_value"] = np.nan
-    grid_df["smooth_grid_id"] = grid_df.index + num_existing_grids
+    kind = prior_df.kind.to_numpy()
+    on_grid = ~np.isnan(age_id)
+    kind_rows = np.stack([np.flatnonzero(on_grid & (kind == k)) for k in ["value", "dage", "dtime"]])
+    value_rows = kind_rows[0]
+    order = np.lexsort((time_id[value_rows], age_id[value_rows]))
+    kind_rows = kind_rows[:, order]
+    grid_prior_ids = prior_id[kind_rows]
+
+    grid_df = pd.DataFrame({
+        "age_id": age_id[kind_rows[0]],
+        "time_id": time_id[kind_rows[0]],
+        "value_prior_id": grid_prior_ids[0],
+        "dage_prior_id": grid_prior_ids[1],
+        "dtime_prior_id": grid_prior_ids[2],
+        "const_value": np.nan,
+        "smooth_grid_id": np.arange(len(order), dtype=np.int64) + num_existing_grids
+    })
 
     prior_df = prior_df[[
         'prior_id', 'prior_name', 'lower', 'upper',
         'mean', 'std', 'eta', 'nu', 'density_id'
-    ]].sort_values(by='prior_id').reset_index(drop=True)
+    ]].reset_index(drop=True)
 
     return prior_df, smooth_df, grid_df
 
@@ -130,6 +138,11 @@ def construct_subgroup_table():
     })
 
 
+def _concat(pieces):
+    """Concatenates table pieces, keeping their indices as appending them did."""
+    return pd.concat(pieces) if pieces else pd.DataFrame()
+
+
 def construct_model_tables(model, location_df, age_df, time_df, covariate_df):
     """
     Loops through the items from a model object, which include
@@ -141,6 +154,10 @@ def construct_model_tables(model, location_df, age_df, time_df, covariate_df):
     It also constructs the rate, integrand, and mulcov tables (alpha, beta, gamma),
     plus nslist and nslist_pair tables.
 
+    The grids are listed first, so that the smooth, prior and smooth_grid IDs
+    of every grid are known up front from the sizes of the grids before it, and
+    each table is concatenated once from its pieces.
+
     Parameters:
         model: cascade_at.model.model.Model
         location_df: pd.DataFrame
@@ -151,128 +168,93 @@ def construct_model_tables(model, location_df, age_df, time_df, covariate_df):
     Returns:
         Dict
     """
-    nslist = {}
-    smooth_table = pd.DataFrame()
-    prior_table = pd.DataFrame()
-    grid_table = pd.DataFrame()
-    mulcov_table = pd.DataFrame()
-    nslist_pair_table = pd.DataFrame()
-
     rate_table = reference_tables.default_rate_table()
     subgroup_table = construct_subgroup_table()
 
     covariate_index = dict(covariate_df[["c_covariate_name", "covariate_id"]].to_records(index=False))
+    node_index = dict(location_df[["c_location_id", "node_id"]].to_records(index=False))
+
+    # Each grid, in the order of its smooth_id, with its name.
+    grids = []
+    # The smooth_id for each rate_id in the rate table columns.
+    rate_smooths = {"parent_smooth_id": dict(), "child_smooth_id": dict(), "child_nslist_id": dict()}
+    nslist = {}
+    nslist_pairs = []
+    mulcovs = []
 
     if "rate" in model:
         LOG.info("Adding rates...")
         for rate_name, grid in model["rate"].items():
-            """
-            Loop through each of the rates and add entries into the
-            prior, and smooth tables. Also put an entry in the rate table so we know the
-            parent smooth ID.
-            """
-            LOG.info(f"Adding rate {rate_name}")
-            prior, smooth, grid = add_prior_smooth_entries(
-                grid_name=rate_name, grid=grid,
-                num_existing_priors=len(prior_table),
-                num_existing_grids=len(grid_table),
-                age_df=age_df, time_df=time_df
-            )
-
-            smooth_id = len(smooth_table)
-            smooth['smooth_id'] = smooth_id
-            grid['smooth_id'] = smooth_id
-
-            smooth_table = smooth_table.append(smooth)
-            prior_table = prior_table.append(prior)
-            grid_table = grid_table.append(grid)
-
-            rate_table.loc[rate_table.rate_id == RateEnum[rate_name].value, "parent_smooth_id"] = smooth_id
+            rate_smooths["parent_smooth_id"][RateEnum[rate_name].value] = len(grids)
+            grids.append((rate_name, grid))
 
     if "random_effect" in model:
         LOG.info("Adding random effects...")
         for (rate_name, child_location), grid in model["random_effect"].items():
-            """
-            Loop through each of the random effects and add entries
-            into the prior and smooth tables.
-            """
-            LOG.info(f"Adding random effect for rate {rate_name}")
             grid_name = f"{rate_name}_re"
-            if child_location is not None:
-                grid_name = grid_name + f"_{child_location}"
-
-            prior, smooth, grid = add_prior_smooth_entries(
-                grid_name=grid_name, grid=grid,
-                num_existing_priors=len(prior_table),
-                num_existing_grids=len(grid_table),
-                age_df=age_df, time_df=time_df
-            )
-
-            smooth_id = len(smooth_table)
-            smooth["smooth_id"] = smooth_id
-            grid["smooth_id"] = smooth_id
-
-            smooth_table = smooth_table.append(smooth)
-            prior_table = prior_table.append(prior)
-            grid_table = grid_table.append(grid)
-
             if child_location is None:
-                rate_table.loc[rate_table.rate_id == RateEnum[rate_name].value, "child_smooth_id"] = smooth_id
+                rate_smooths["child_smooth_id"][RateEnum[rate_name].value] = len(grids)
             else:
                 # If we are doing this for a child location, then we want to make entries in the
                 # nslist and nslist_pair tables
-                node_id = location_df[location_df.c_location_id == child_location].node_id.iloc[0]
-                if rate_name not in nslist:
-                    ns_id = len(nslist)
-                    nslist[rate_name] = ns_id
-                else:
-                    ns_id = nslist[rate_name]
-                rate_table.loc[rate_table.rate_id == RateEnum[rate_name].value, "child_nslist_id"] = ns_id
-                nslist_pair_table = nslist_pair_table.append(pd.DataFrame({
-                    'nslist_id': [ns_id],
-                    'node_id': [node_id],
-                    'smooth_id': [smooth_id]
-                }))
-
-    potential_mulcovs = ["alpha", "beta", "gamma"]
-    mulcovs = [x for x in potential_mulcovs if x in model]
-
-    for m in mulcovs:
+                grid_name = grid_name + f"_{child_location}"
+                ns_id = nslist.setdefault(rate_name, len(nslist))
+                rate_smooths["child_nslist_id"][RateEnum[rate_name].value] = ns_id
+                nslist_pairs.append({
+                    'nslist_id': ns_id,
+                    'node_id': node_index[child_location],
+                    'smooth_id': len(grids)
+                })
+            grids.append((grid_name, grid))
+
+    for m in ["alpha", "beta", "gamma"]:
+        if m not in model:
+            continue
         LOG.info(f"Looking for mulcovs {m}...")
         for (covariate, rate_or_integrand), grid in model[m].items():
-            LOG.info(f"Adding covariate {covariate} on {rate_or_integrand}.")
-            grid_name = f"{m}_{rate_or_integrand}_{covariate}"
-
-            prior, smooth, grid = add_prior_smooth_entries(
-                grid_name=grid_name, grid=grid,
-                num_existing_priors=len(prior_table),
-                num_existing_grids=len(grid_table),
-                age_df=age_df, time_df=time_df
-            )
-            smooth_id = len(smooth_table)
-            smooth["smooth_id"] = smooth_id
-            grid["smooth_id"] = smooth_id
-
-            prior_table = prior_table.append(prior)
-            smooth_table = smooth_table.append(smooth)
-            grid_table = grid_table.append(grid)
-
-            mulcov = pd.DataFrame({
-                "mulcov_type": [MulCovEnum[m].value],
-                "rate_id": [np.nan],
-                "integrand_id": [np.nan],
-                "covariate_id": [covariate_index[covariate]],
-                "group_smooth_id": [smooth_id]
-            })
+            mulcov = {
+                "mulcov_type": MulCovEnum[m].value,
+                "rate_id": np.nan,
+                "integrand_id": np.nan,
+                "covariate_id": covariate_index[covariate],
+                "group_smooth_id": len(grids)
+            }
             if m == "alpha":
                 mulcov["rate_id"] = RateEnum[rate_or_integrand].value
-            elif m in ["beta", "gamma"]:
-                mulcov["integrand_id"] = IntegrandEnum[rate_or_integrand].value
             else:
-                raise RuntimeError(f"Unknown mulcov type {m}.")
-            mulcov_table = mulcov_table.append(mulcov)
-
-    mulcov_table.reset_index(inplace=True, drop=True)
+                mulcov["integrand_id"] = IntegrandEnum[rate_or_integrand].value
+            mulcovs.append(mulcov)
+            grids.append((f"{m}_{rate_or_integrand}_{covariate}", grid))
+
+    # Every grid has a value, dage and dtime prior for each of its points, plus three mulstd priors.
+    grid_sizes = np.array([len(grid.ages) * len(grid.times) for _, grid in grids], dtype=int)
+    num_existing_grids = np.cumsum(grid_sizes) - grid_sizes
+    num_existing_priors = 3 * (num_existing_grids + np.arange(len(grids)))
+
+    LOG.info(f"Adding priors and smoothing for {len(grids)} grids.")
+    smooth_pieces, prior_pieces, grid_pieces = [], [], []
+    for smooth_id, (grid_name, grid) in enumerate(grids):
+        prior, smooth, grid = add_prior_smooth_entries(
+            grid_name=grid_name, grid=grid,
+            num_existing_priors=num_existing_priors[smooth_id],
+            num_existing_grids=num_existing_grids[smooth_id],
+            age_df=age_df, time_df=time_df
+        )
+        smooth["smooth_id"] = smooth_id
+        grid["smooth_id"] = smooth_id
+        smooth_pieces.append(smooth)
+        prior_pieces.append(prior)
+        grid_pieces.append(grid)
+
+    smooth_table = _concat(smooth_pieces)
+    prior_table = _concat(prior_pieces)
+    grid_table = _concat(grid_pieces)
+
+    for column, smooth_ids in rate_smooths.items():
+        for rate_id, smooth_id in smooth_ids.items():
+            rate_table.loc[rate_table.rate_id == rate_id, column] = smooth_id
+
+    mulcov_table = pd.DataFrame(mulcovs)
     mulcov_table["mulcov_id"] = mulcov_table.index
     mulcov_table["group_id"] = 0
     mulcov_table["subgroup_smooth_id"] = np.nan
@@ -281,7 +263,7 @@ def construct_model_tables(model, location_df, age_df, time_df, covariate_df):
         data=list(nslist.items()),
         columns=["nslist_name", "nslist_id"]
     )
-    nslist_pair_table.reset_index(inplace=True, drop=True)
+    nslist_pair_table = pd.DataFrame(nslist_pairs)
     nslist_pair_table["nslist_pair_id"] = nslist_pair_table.index
 
     return {
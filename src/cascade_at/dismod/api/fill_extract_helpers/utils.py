@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -71,3 +72,34 @@ def convert_age_time_to_id(df, age_df, time_df):
     assert "age_id" in df.columns
     assert "time_id" in df.columns
     return df.drop(["save_idx", "age", "time"], axis=1)
+
+
+def nearest_id(values, at_df, dat):
+    """
+    Finds the ID of the closest age or time in the age or time table for
+    each value, with a binary search. This matches a ``merge_asof`` with
+    ``direction="nearest"``, so a value halfway between two entries gets
+    the lower one. Missing values get a missing ID.
+
+    :param values: np.array of ages or times
+    :param at_df: pd.DataFrame, the age or time table
+    :param dat: str, either "age" or "time"
+    :return: np.array of floats
+    """
+    at_table = at_df.sort_values(dat, kind="mergesort")
+    points = at_table[dat].to_numpy(dtype=float)
+    ids = at_table[f"{dat}_id"].to_numpy()
+
+    values = np.asarray(values, dtype=float)
+    result = np.full(values.shape, np.nan)
+    in_grid = ~np.isnan(values)
+    to_find = values[in_grid]
+    backward = np.searchsorted(points, to_find, side="right") - 1
+    forward = np.searchsorted(points, to_find, side="left")
+    has_backward = backward >= 0
+    has_forward = forward < len(points)
+    backward_diff = to_find - points[np.maximum(backward, 0)]
+    forward_diff = points[np.minimum(forward, len(points) - 1)] - to_find
+    use_backward = has_backward & (~has_forward | (backward_diff <= forward_diff))
+    result[in_grid] = ids[np.where(use_backward, backward, np.minimum(forward, len(points) - 1))]
+    return result
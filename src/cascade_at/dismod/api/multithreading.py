@@ -1,7 +1,17 @@
-from typing import Union, List
+import os
+from typing import Union, List, Optional, Iterator, Tuple, Any
 from pathlib import Path
 from shutil import copy2
-from multiprocessing import Pool
+from multiprocessing import Pool, Queue
+
+import numpy as np
+from sqlalchemy import text
+
+from cascade_at.core.log import get_loggers
+from cascade_at.dismod.api.dismod_io import DismodIO
+from cascade_at.dismod.api.dismod_sqlite import get_engine
+
+LOG = get_loggers(__name__)
 
 
 class _DismodThread:
@@ -9,7 +19,15 @@ class _DismodThread:
     Splits a dismod database into multiple databases to run parallel
     processes on the database. The work happens when you call
     an instantiated _DismodThread.
+
+    Inside of a :class:`DismodWorkerPool` each worker process keeps
+    one working copy of the main database for all of the indices it is given,
+    and only the tables in ``reset_tables`` are dropped between indices. Called
+    on its own, a _DismodThread copies the main database to a new file for the index.
     """
+    reset_tables: List[str] = []
+    """Tables that _process writes to, dropped from a working copy before each index."""
+
     def __init__(self, main_db: Union[str, Path], index_file_pattern: str):
         self.main_db = main_db
         self.index_file_pattern = index_file_pattern
@@ -17,14 +35,98 @@ class _DismodThread:
 
     def __call__(self, index: int):
         self.index = index
-        index_db = self.index_file_pattern.format(index=index)
-        copy2(src=str(self.main_db), dst=str(index_db))
+        if _WORKING_DB is None:
+            index_db = self.index_file_pattern.format(index=index)
+            copy2(src=str(self.main_db), dst=str(index_db))
+        else:
+            index_db = _WORKING_DB
+            self._reset(db=index_db)
         return self._process(db=index_db)
 
+    def _reset(self, db: str):
+        if not self.reset_tables:
+            return
+        engine = get_engine(Path(db))
+        with engine.begin() as connection:
+            for table in self.reset_tables:
+                connection.execute(text(f'DROP TABLE IF EXISTS "{table}"'))
+        engine.dispose()
+
     def _process(self, db: str):
         raise NotImplementedError
 
 
+_WORKING_DB: Optional[str] = None
+"""The working copy of the main database that belongs to this worker process."""
+_WORKER_THREAD: Optional[_DismodThread] = None
+
+
+def _init_worker(dm_thread: _DismodThread, working_dbs):
+    global _WORKING_DB, _WORKER_THREAD
+    _WORKING_DB = working_dbs.get()
+    _WORKER_THREAD = dm_thread
+
+
+def _run_index(index: int) -> Tuple[int, Any]:
+    return index, _WORKER_THREAD(index)
+
+
+class DismodWorkerPool:
+    """
+    A pool of worker processes that each own one copy of the main
+    database, so that running n_sim indices with n_pool workers makes
+    n_pool copies rather than n_sim. The copies are made when the
+    pool is entered and removed when it exits.
+
+    Parameters
+    ----------
+    dm_thread
+        Anything based off of _DismodThread.
+    n_pool
+        Number of worker processes.
+
+    Examples
+    --------
+    >>> with DismodWorkerPool(dm_thread=fit_sample, n_pool=10) as pool:
+    >>>     for index, fit in pool.imap(sims=range(100)):
+    >>>         ...
+    """
+    def __init__(self, dm_thread: _DismodThread, n_pool: int):
+        self.dm_thread = dm_thread
+        self.n_pool = n_pool
+        self.working_dbs = [
+            dm_thread.index_file_pattern.format(index=f'worker_{i}') for i in range(n_pool)
+        ]
+        self._pool = None
+
+    def __enter__(self):
+        for db in self.working_dbs:
+            copy2(src=str(self.dm_thread.main_db), dst=str(db))
+        queue = Queue()
+        for db in self.working_dbs:
+            queue.put(db)
+        self._pool = Pool(self.n_pool, initializer=_init_worker, initargs=(self.dm_thread, queue))
+        return self
+
+    def imap(self, sims: List[int]) -> Iterator[Tuple[int, Any]]:
+        """
+        Runs the thread for each index in sims and yields (index, result)
+        pairs in the order that they finish.
+        """
+        return self._pool.imap_unordered(_run_index, sims)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+        for db in self.working_dbs:
+            if os.path.isfile(db):
+                os.remove(db)
+        return False
+
+
 def dmdismod_in_parallel(dm_thread: _DismodThread,
                          sims: List[int], n_pool: int):
     """
@@ -32,8 +134,39 @@ def dmdismod_in_parallel(dm_thread: _DismodThread,
     a multiprocessing pool. A dismod thread is
     anything that is based off of _DismodThread so it has
     a __call__ method with an overridden _process method.
+    Results are returned in the order of sims.
+    """
+    results = dict()
+    with DismodWorkerPool(dm_thread=dm_thread, n_pool=n_pool) as pool:
+        for index, result in pool.imap(sims=sims):
+            LOG.info(f"Finished index {index}.")
+            results[index] = result
+    return [results[index] for index in sims]
+
+
+def dmdismod_in_parallel_to_table(dm_thread: _DismodThread,
+                                  sims: List[int], n_pool: int,
+                                  db: Union[str, Path], table_name: str,
+                                  columns: List[str]) -> None:
+    """
+    Run a dismod thread in parallel and write the result for each index
+    into table_name in db once it and every index before it in sims have
+    finished, rather than holding every result in memory. Results that
+    finish early wait until they are next, so the rows are in the order
+    of sims, which is what Dismod-AT expects of the sample table. The
+    first result replaces the table and the rest are appended. The rows
+    for an index get IDs index * n_rows + row.
     """
-    p = Pool(n_pool)
-    processes = list(p.map(dm_thread, sims))
-    p.close()
-    return processes
+    dbio = DismodIO(path=db)
+    waiting = dict()
+    n_written = 0
+    with DismodWorkerPool(dm_thread=dm_thread, n_pool=n_pool) as pool:
+        for index, result in pool.imap(sims=sims):
+            waiting[index] = result
+            while n_written < len(sims) and sims[n_written] in waiting:
+                next_index = sims[n_written]
+                rows = waiting.pop(next_index)[columns].reset_index(drop=True)
+                rows[f'{table_name}_id'] = next_index * len(rows) + np.arange(len(rows))
+                dbio.write_table(table_name, rows, append=n_written > 0)
+                n_written += 1
+                LOG.info(f"Wrote index {next_index} to {table_name}, {n_written} of {len(sims)}.")
@@ -13,6 +13,33 @@ def enum_to_dataframe(enum_name):
     )
 
 
+def lookup_values(keys, mapping):
+    """Maps each key to its value in a dictionary, as an array. The
+    keys become categorical codes, so each distinct key is looked up
+    once, and the values are taken from an array of the looked-up values.
+
+    >>> lookup_values(pd.Series(["a", "b", "a"]), {"a": 1, "b": 2})
+    array([1, 2, 1])
+
+    Raises a KeyError if a key is missing, or isn't in the mapping.
+    """
+    codes, uniques = pd.factorize(np.asarray(keys))
+    if (codes < 0).any():
+        raise KeyError(f"Cannot look up missing keys in {list(mapping)}.")
+    # A Series infers the dtype, so that None among floats becomes nan.
+    values = pd.Series([mapping[key] for key in uniques]).values
+    return values[codes]
+
+
+def enum_values(names, enum_name):
+    """Given names of members of an enum, return an array of their values.
+
+    >>> enum_values(["gaussian", "uniform"], DensityEnum)
+    array([1, 0])
+    """
+    return lookup_values(names, {name: member.value for name, member in enum_name.__members__.items()})
+
+
 class DensityEnum(Enum):
     """The distributions supported by Dismod-AT. They always have these ids."""
     uniform = 0
@@ -108,21 +108,24 @@ def save_predictions(db_file: Union[str, Path],
                      locations: Optional[List[int]] = None,
                      sexes: Optional[List[int]] = None,
                      sample: bool = False,
-                     predictions: Optional[pd.DataFrame] = None) -> None:
+                     predictions: Optional[pd.DataFrame] = None,
+                     file_format: str = 'csv') -> None:
     """
     Save the fit from this dismod database for a specific location and sex to be
-    uploaded later on.
+    uploaded later on. The draws are saved in file_format, one of
+    cascade_at.saver.results_handler.DRAW_FILE_FORMATS, and the summaries as .csv.
     """
     LOG.info("Extracting results from DisMod SQLite Database.")
     da = DismodExtractor(path=db_file)
-    predictions = da.format_predictions_for_ihme(
+    predictions = da.format_prediction_draws_for_ihme(
         locations=locations, sexes=sexes, gbd_round_id=gbd_round_id,
         samples=sample, predictions=predictions
     )
     LOG.info(f"Saving the results to {out_dir}.")
     rh = ResultsHandler()
     rh.save_draw_files(df=predictions, directory=out_dir,
-                       add_summaries=True, model_version_id=model_version_id)
+                       add_summaries=True, model_version_id=model_version_id,
+                       file_format=file_format)
 
 
 def dismod_db(model_version_id: int, parent_location_id: int, sex_id: int,
@@ -11,6 +11,7 @@ from cascade_at.executor.args.args import ModelVersionID, BoolArg, ListArg, StrA
 from cascade_at.context.model_context import Context
 from cascade_at.core.log import get_loggers, LEVELS
 from cascade_at.dismod.api.dismod_io import DismodIO
+from cascade_at.dismod.api.draw_matrix import summarize_draws
 
 LOG = get_loggers(__name__)
 
@@ -88,22 +89,21 @@ def compute_statistics(df, mean=True, std=True, quantile=None):
     Returns: dictionary with requested statistics
 
     """
-    stats_df = pd.DataFrame()
     group_cols = ['c_covariate_name', 'mulcov_type', 'rate_name', 'integrand_name']
-    df_groups = df.fillna('none').copy().groupby(group_cols, sort=False)
-    stats_df = df_groups.count().reset_index()[group_cols]
-    if mean:
-        ds = df_groups.mean().reset_index()
-        stats_df['mean'] = ds['mulcov_value']
-    if std:
-        degrees_of_freedom = int(df_groups.ngroups > len(df))
-        ds = df_groups.std(ddof=degrees_of_freedom).reset_index()
-        stats_df['std'] = ds['mulcov_value']
-    if quantile is not None:
-        for q in quantile:
-            ds = df_groups.quantile(q=q).reset_index()
-            stats_df[f'quantile_{q}'] = ds['mulcov_value']
-    return stats_df
+    df = df.copy()
+    df[group_cols] = df[group_cols].fillna('none')
+    df_groups = df.groupby(group_cols, sort=False)
+    stats_df = df_groups.size().reset_index()[group_cols]
+
+    # One row of values for each group, padded with NaN, which the statistics skip.
+    group = df_groups.ngroup().values
+    position = df_groups.cumcount().values
+    values = np.full((df_groups.ngroups, position.max() + 1 if len(df) else 0), np.nan)
+    values[group, position] = df['mulcov_value'].values
+
+    degrees_of_freedom = int(df_groups.ngroups > len(df))
+    summary = summarize_draws(values, mean=mean, std=std, quantiles=quantile, ddof=degrees_of_freedom)
+    return pd.concat([stats_df, summary], axis=1)
 
 
 def mulcov_statistics(model_version_id: int, locations: List[int], sexes: List[int],
@@ -2,7 +2,6 @@ import logging
 import sys
 from pathlib import Path
 from typing import List, Union
-import pandas as pd
 
 from cascade_at.context.model_context import Context
 from cascade_at.core.log import get_loggers, LEVELS
@@ -10,7 +9,7 @@ from cascade_at.dismod.api.dismod_io import DismodIO
 from cascade_at.dismod.api.fill_extract_helpers.data_tables import prep_data_avgint
 from cascade_at.dismod.api.fill_extract_helpers.posterior_to_prior import get_prior_avgint_grid
 from cascade_at.dismod.api.run_dismod import run_dismod_commands
-from cascade_at.dismod.api.multithreading import _DismodThread, dmdismod_in_parallel
+from cascade_at.dismod.api.multithreading import _DismodThread, dmdismod_in_parallel_to_table
 from cascade_at.executor.args.arg_utils import ArgumentList
 from cascade_at.executor.args.args import ModelVersionID, ParentLocationID, SexID, NSim, NPool
 from cascade_at.executor.args.args import LogLevel, BoolArg, ListArg
@@ -66,17 +65,19 @@ def fill_avgint_with_priors_grid(inputs: MeasurementInputs, alchemy: Alchemy, se
 class Predict(_DismodThread):
     """
     Predicts for a database in parallel. Chops up the sample table
-    into a bunch of copies, each with only one sample.
+    into a bunch of copies, each with only one sample. The sample
+    is read from the main database because the working copy's sample
+    table only holds the last index it predicted for.
     """
+    reset_tables = ['predict']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def _process(self, db: str):
 
+        this_sample = DismodIO(path=self.main_db).read_table('sample', where={'sample_index': self.index})
         dbio = DismodIO(path=db)
-        n_var = len(dbio.var)
-
-        this_sample = dbio.sample.loc[dbio.sample.sample_index == self.index].copy()
         this_sample['sample_index'] = 0
         this_sample['sample_id'] = this_sample['var_id']
         dbio.sample = this_sample
@@ -107,21 +108,21 @@ def predict_sample_pool(main_db: Union[str, Path], index_file_pattern: str,
     """
     Run predict sample in a pool by making copies of the existing database
     and splitting out the sample table into n_sim databases, running
-    predict sample on each of them, and combining the results back
-    into the main database.
+    predict sample on each of them, and writing the results into
+    the predict table of the main database as they finish.
     """
     predict = Predict(
         main_db=main_db,
         index_file_pattern=index_file_pattern
     )
-    predictions = dmdismod_in_parallel(
+    dmdismod_in_parallel_to_table(
         dm_thread=predict,
         sims=list(range(n_sim)),
-        n_pool=n_pool
+        n_pool=n_pool,
+        db=main_db,
+        table_name='predict',
+        columns=['sample_index', 'avgint_id', 'avg_integrand']
     )
-    predictions = pd.DataFrame().append(predictions).reset_index(drop=True)
-    d = DismodIO(path=main_db)
-    return predictions[['sample_index', 'avgint_id', 'avg_integrand']]
 
 
 def predict_sample(model_version_id: int, parent_location_id: int, sex_id: int,
@@ -162,8 +163,6 @@ def predict_sample(model_version_id: int, parent_location_id: int, sex_id: int,
         run with pools but just run all simulations together in one dmdismod command.
 
     """
-    predictions = None
-
     context = Context(model_version_id=model_version_id)
     inputs, alchemy, settings = context.read_inputs()
     main_db = context.db_file(location_id=parent_location_id, sex_id=sex_id)
@@ -181,7 +180,7 @@ def predict_sample(model_version_id: int, parent_location_id: int, sex_id: int,
         )
 
     if sample and (n_pool > 1):
-        predictions = predict_sample_pool(
+        predict_sample_pool(
             main_db=main_db, index_file_pattern=index_file_pattern,
             n_sim=n_sim, n_pool=n_pool
         )
@@ -209,8 +208,7 @@ def predict_sample(model_version_id: int, parent_location_id: int, sex_id: int,
                 model_version_id=model_version_id,
                 gbd_round_id=settings.gbd_round_id,
                 out_dir=folder,
-                sample=sample,
-                predictions=predictions
+                sample=sample
             )
 
 
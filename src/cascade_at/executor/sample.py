@@ -3,7 +3,6 @@ import sys
 from pathlib import Path
 from typing import Union
 
-import pandas as pd
 
 from cascade_at.executor.args.arg_utils import ArgumentList
 from cascade_at.executor.args.args import ModelVersionID, ParentLocationID, SexID, NPool, NSim
@@ -12,7 +11,7 @@ from cascade_at.context.model_context import Context
 from cascade_at.core.log import get_loggers, LEVELS
 from cascade_at.dismod.api.dismod_io import DismodIO
 from cascade_at.dismod.process.process_behavior import check_sample_asymptotic, SampleAsymptoticError
-from cascade_at.dismod.api.multithreading import _DismodThread, dmdismod_in_parallel
+from cascade_at.dismod.api.multithreading import _DismodThread, dmdismod_in_parallel_to_table
 from cascade_at.dismod.api.run_dismod import run_dismod_commands
 from cascade_at.executor import ExecutorError
 
@@ -81,6 +80,8 @@ class FitSample(_DismodThread):
     fit_type
         The type of fit to run, one of "fixed" or "both".
     """
+    reset_tables = ['fit_var', 'fit_data_subset']
+
     def __init__(self, fit_type: str, **kwargs):
         super().__init__(**kwargs)
         self.fit_type = fit_type
@@ -104,7 +105,7 @@ def sample_simulate_pool(main_db: Union[str, Path], index_file_pattern: str,
                          fit_type: str, n_sim: int, n_pool: int):
     """
     Fit the samples in a database in parallel by making copies of the database, fitting them
-    separately, and then combining them back together in the sample table of main_db.
+    separately, and then writing each fit into the sample table of main_db as it finishes.
 
     Parameters
     ----------
@@ -127,15 +128,15 @@ def sample_simulate_pool(main_db: Union[str, Path], index_file_pattern: str,
         index_file_pattern=index_file_pattern,
         fit_type=fit_type
     )
-    fits = dmdismod_in_parallel(
+    # Reconstruct the sample table with all n_sim fits, one fit at a time
+    dmdismod_in_parallel_to_table(
         dm_thread=fit_sample,
         sims=list(range(n_sim)),
-        n_pool=n_pool
+        n_pool=n_pool,
+        db=main_db,
+        table_name='sample',
+        columns=['sample_index', 'var_id', 'var_value']
     )
-    # Reconstruct the sample table with all n_sim fits
-    samp = pd.DataFrame().append(fits).reset_index(drop=True)
-    d = DismodIO(path=main_db)
-    d.sample = samp[['sample_index', 'var_id', 'var_value']]
 
 
 def sample_simulate_sequence(path: Union[str, Path], n_sim: int, fit_type: str):
@@ -24,8 +24,8 @@ class Demographics:
             location_dag = LocationDAG(
                 location_set_version_id=location_set_version_id,
                 gbd_round_id=gbd_round_id)
-            self.location_id = list(location_dag.dag.nodes)
-            self.drill_locations = list(location_dag.dag.nodes)
+            self.location_id = location_dag.df.location_id.tolist()
+            self.drill_locations = location_dag.df.location_id.tolist()
         else:
             self.location_id = []
             self.drill_locations = []
@@ -0,0 +1,326 @@
+"""
+A columnar store for configured :class:`MeasurementInputs`. Rather than
+pickling the whole inputs object into one file that every task has to load
+in full, each data frame goes into its own file and the rest of the object
+goes into a small skeleton. A ``manifest.json`` says what is where.
+
+Frames are written as Parquet when pyarrow is installed, sorted by location
+so that a read for a few locations only touches the row groups it needs.
+Without pyarrow they are written as pandas pickles and filtered after they
+are read.
+"""
+import json
+import os
+from copy import copy
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import dill
+import pandas as pd
+
+from cascade_at.core.log import get_loggers
+from cascade_at.inputs import InputsError
+from cascade_at.inputs.locations import LocationDAG
+from cascade_at.inputs.measurement_inputs import MeasurementInputs
+
+LOG = get_loggers(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+MANIFEST = 'manifest.json'
+SKELETON = 'skeleton.p'
+STORE_VERSION = 1
+
+FRAME_COMPONENTS = ['dismod_data', 'omega', 'country_covariate_reference_values']
+"""Attributes that are data frames."""
+RAW_COMPONENTS = ['asdr', 'csmr', 'data', 'population']
+"""Attributes that are inputs objects holding a data frame in ``raw``."""
+COMPONENTS = FRAME_COMPONENTS + RAW_COMPONENTS + [
+    'covariate_data', 'country_covariate_data', 'location_dag'
+]
+"""Every attribute of MeasurementInputs that is kept out of the skeleton."""
+
+RANGE_COLUMNS = ['age_lower', 'age_upper', 'time_lower', 'time_upper']
+"""Columns whose smallest and largest values are kept in the manifest."""
+
+ROW_GROUP_SIZE = 50_000
+_ORDER = '__store_order__'
+
+
+def _split_raw(key: str, value: Any) -> Tuple[Any, Dict[str, pd.DataFrame]]:
+    shell = copy(value)
+    shell.raw = None
+    return shell, {} if value.raw is None else {f'{key}.raw': value.raw}
+
+
+def _split(name: str, value: Any) -> Tuple[Any, Dict[str, pd.DataFrame]]:
+    """
+    Split an inputs attribute into a small picklable shell and the data
+    frames that it holds, keyed by the name of the file they go in.
+    """
+    if value is None:
+        return None, {}
+    if name in FRAME_COMPONENTS:
+        return None, {name: value}
+    if name in RAW_COMPONENTS:
+        return _split_raw(key=name, value=value)
+    if name == 'covariate_data':
+        shells, frames = [], {}
+        for i, cov in enumerate(value):
+            shell, frame = _split_raw(key=f'covariate_data.{i}', value=cov)
+            shells.append(shell)
+            frames.update(frame)
+        return shells, frames
+    if name == 'country_covariate_data':
+        return list(value.keys()), {
+            f'country_covariate_data.{covariate_id}': df for covariate_id, df in value.items()
+        }
+    if name == 'location_dag':
+        return {
+            'root': value.root,
+            'location_set_version_id': getattr(value, 'location_set_version_id', None)
+        }, {'location_dag.df': value.df}
+    raise InputsError(f"{name} is not a component of the inputs store.")
+
+
+def _join_raw(key: str, shell: Any, frames: Dict[str, pd.DataFrame]) -> Any:
+    value = copy(shell)
+    value.raw = frames.get(f'{key}.raw')
+    return value
+
+
+def _join(name: str, shell: Any, frames: Dict[str, pd.DataFrame]) -> Any:
+    """
+    The inverse of :func:`_split`.
+    """
+    if name in FRAME_COMPONENTS:
+        return frames.get(name)
+    if shell is None:
+        return None
+    if name in RAW_COMPONENTS:
+        return _join_raw(key=name, shell=shell, frames=frames)
+    if name == 'covariate_data':
+        return [_join_raw(key=f'covariate_data.{i}', shell=cov, frames=frames) for i, cov in enumerate(shell)]
+    if name == 'country_covariate_data':
+        return {
+            covariate_id: frames[f'country_covariate_data.{covariate_id}'] for covariate_id in shell
+        }
+    if name == 'location_dag':
+        dag = LocationDAG(df=frames['location_dag.df'], root=shell['root'])
+        if shell['location_set_version_id'] is not None:
+            dag.location_set_version_id = shell['location_set_version_id']
+        return dag
+    raise InputsError(f"{name} is not a component of the inputs store.")
+
+
+class InputsStore:
+    """
+    A directory holding one file per data frame of a MeasurementInputs object,
+    a pickled skeleton of everything else, and a manifest.
+
+    Parameters
+    ----------
+    directory
+        The directory for the store. It is created on write.
+
+    Examples
+    --------
+    >>> store = InputsStore(directory=Path('inputs_store'))
+    >>> store.write(inputs)
+    >>> inputs = store.load()  # nothing but the skeleton has been read yet
+    >>> inputs.dismod_data  # reads the dismod_data file
+    >>> store.read_frame('dismod_data', location_ids=[102, 555])
+    """
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._manifest = None
+        self._skeleton = None
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.directory / MANIFEST
+
+    def exists(self) -> bool:
+        return self.manifest_file.is_file()
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            if not self.exists():
+                raise InputsError(f"There is no inputs store at {self.directory}.")
+            with open(self.manifest_file) as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
+    def write(self, inputs: MeasurementInputs, file_format: Optional[str] = None) -> None:
+        """
+        Write an inputs object to the store, replacing whatever was there.
+
+        Parameters
+        ----------
+        inputs
+            The inputs to write.
+        file_format
+            'parquet' or 'pickle'. Defaults to parquet if pyarrow is installed.
+        """
+        if file_format is None:
+            file_format = 'parquet' if PARQUET_AVAILABLE else 'pickle'
+            if not PARQUET_AVAILABLE:
+                LOG.warning("pyarrow is not installed, so the inputs store is written as pickles, "
+                            "and every read of a frame loads all of its locations.")
+        if file_format not in ['parquet', 'pickle']:
+            raise InputsError(f"Unknown inputs store format {file_format}.")
+        if file_format == 'parquet' and not PARQUET_AVAILABLE:
+            raise InputsError("Writing the inputs store as parquet needs pyarrow.")
+        os.makedirs(self.directory, exist_ok=True)
+        # The manifest goes last so that a store that failed part way through a write
+        # doesn't look complete.
+        if self.exists():
+            os.remove(self.manifest_file)
+        self._manifest = None
+        self._skeleton = None
+        LOG.info(f"Writing inputs to {self.directory} as {file_format}.")
+
+        attributes = {k: v for k, v in vars(inputs).items() if k not in COMPONENTS}
+        shells = dict()
+        manifest = {'version': STORE_VERSION, 'format': file_format, 'components': dict(), 'frames': dict()}
+        for name in COMPONENTS:
+            shells[name], frames = _split(name, getattr(inputs, name, None))
+            manifest['components'][name] = list(frames.keys())
+            for key, df in frames.items():
+                manifest['frames'][key] = self._write_frame(key=key, df=df, file_format=file_format)
+
+        with open(self.directory / SKELETON, 'wb') as f:
+            dill.dump({'attributes': attributes, 'shells': shells}, f)
+        with open(self.manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        self._manifest = manifest
+
+    def _write_frame(self, key: str, df: pd.DataFrame, file_format: str) -> Dict[str, Any]:
+        by_location = 'location_id' in df.columns
+        if file_format == 'parquet':
+            file = f'{key}.parquet'
+            if by_location:
+                df = df.assign(**{_ORDER: range(len(df))}).sort_values('location_id', kind='stable')
+            df.to_parquet(self.directory / file, row_group_size=ROW_GROUP_SIZE)
+        else:
+            file = f'{key}.pkl'
+            df.to_pickle(self.directory / file)
+        ranges = {
+            column: [float(df[column].min()), float(df[column].max())]
+            for column in RANGE_COLUMNS if column in df.columns
+        }
+        return {'file': file, 'by_location': by_location, 'ranges': ranges}
+
+    def read_frame(self, key: str, location_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Read one data frame from the store, in the order it was written.
+
+        Parameters
+        ----------
+        key
+            The name of the frame, which is the name of the attribute for data frames,
+            e.g. 'dismod_data', '<attribute>.raw' for inputs objects and
+            'country_covariate_data.<covariate_id>' for country covariates.
+        location_ids
+            Only read the rows for these locations. Only applies to frames
+            with a location_id column.
+        """
+        if key not in self.manifest['frames']:
+            raise InputsError(f"There is no frame {key} in the inputs store at {self.directory}.")
+        entry = self.manifest['frames'][key]
+        path = self.directory / entry['file']
+        by_location = entry['by_location'] and location_ids is not None
+        if self.manifest['format'] == 'parquet':
+            filters = [('location_id', 'in', list(location_ids))] if by_location else None
+            df = pd.read_parquet(path, filters=filters)
+            if entry['by_location']:
+                df = df.sort_values(_ORDER).drop(columns=_ORDER)
+        else:
+            df = pd.read_pickle(path)
+            if by_location:
+                df = df.loc[df.location_id.isin(location_ids)]
+        return df
+
+    def column_range(self, key: str, column: str) -> Tuple[float, float]:
+        """
+        The smallest and largest values of one of the RANGE_COLUMNS of
+        a frame, without reading the frame.
+        """
+        ranges = self.manifest['frames'][key]['ranges']
+        if column not in ranges:
+            raise InputsError(f"The inputs store doesn't keep the range of {column} in {key}.")
+        minimum, maximum = ranges[column]
+        return minimum, maximum
+
+    def read_component(self, name: str) -> Any:
+        """
+        Read one attribute of the inputs from the store.
+        """
+        keys = self.manifest['components'].get(name)
+        if keys is None:
+            raise InputsError(f"{name} is not a component of the inputs store.")
+        frames = {key: self.read_frame(key) for key in keys}
+        return _join(name, self._read_skeleton()['shells'][name], frames)
+
+    def _read_skeleton(self) -> Dict[str, Any]:
+        if self._skeleton is None:
+            if not self.exists():
+                raise InputsError(f"There is no inputs store at {self.directory}.")
+            with open(self.directory / SKELETON, 'rb') as f:
+                self._skeleton = dill.load(f)
+        return self._skeleton
+
+    def load(self) -> 'LazyMeasurementInputs':
+        """
+        Load the inputs. Only the skeleton is read here, and each
+        component is read the first time that it is used.
+        """
+        LOG.info(f"Loading inputs from {self.directory}.")
+        skeleton = self._read_skeleton()
+        return LazyMeasurementInputs(store=self, attributes=skeleton['attributes'])
+
+
+class LazyMeasurementInputs(MeasurementInputs):
+    """
+    MeasurementInputs read back from an :class:`InputsStore`. The components
+    are not attributes until they are first used, at which point
+    they are read from the store. Slices by location and the extent
+    of the dismod data come straight from the store if the whole data frame
+    hasn't been read, so that a model for a small part of the location
+    hierarchy only reads the data for that part.
+    """
+    def __init__(self, store: InputsStore, attributes: Dict[str, Any]):
+        self.__dict__.update(attributes)
+        self._store = store
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. for components not yet read.
+        store = self.__dict__.get('_store')
+        if store is None or name not in COMPONENTS:
+            raise AttributeError(name)
+        LOG.info(f"Reading {name} from the inputs store.")
+        value = store.read_component(name)
+        setattr(self, name, value)
+        return value
+
+    def locations_slice(self, name: str, location_ids: List[int]) -> Optional[pd.DataFrame]:
+        if name in vars(self) or name not in FRAME_COMPONENTS:
+            return super().locations_slice(name=name, location_ids=location_ids)
+        if not self._store.manifest['components'][name]:
+            return None
+        return self._store.read_frame(key=name, location_ids=location_ids)
+
+    def dismod_data_extent(self) -> Tuple[float, float, float, float]:
+        if 'dismod_data' in vars(self):
+            return super().dismod_data_extent()
+        return (
+            self._store.column_range('dismod_data', 'age_lower')[0],
+            self._store.column_range('dismod_data', 'age_upper')[1],
+            self._store.column_range('dismod_data', 'time_lower')[0],
+            self._store.column_range('dismod_data', 'time_upper')[1]
+        )
@@ -1,3 +1,5 @@
+import heapq
+
 import networkx as nx
 import numpy as np
 import pandas as pd
@@ -20,9 +22,12 @@ class LocationDAG:
                  gbd_round_id: Optional[int] = None, df: Optional[pd.DataFrame] = None,
                  root: Optional[int] = None):
         """
-        Create a location DAG from the GBD location hierarchy, using
-        networkx graph where each node is the location ID, and its properties
-        are all properties from db_queries.
+        Create a location DAG from the GBD location hierarchy, where each
+        node is the location ID, and its properties are all properties
+        from db_queries. The parent, depth, children, and a pre-order walk
+        of the hierarchy are kept in arrays, so queries about the
+        hierarchy don't search a graph. The networkx graph is
+        in the ``dag`` attribute.
 
         The root of this dag is the global location ID.
 
@@ -64,21 +69,107 @@ class LocationDAG:
                 raise LocationDAGError("Must specify a root if you're passing in a data frame.")
             self.df = df
 
-        self.dag = nx.DiGraph()
-        for index, row in self.df.iterrows():
-            self.dag.add_node(int(row['location_id']), **row.to_dict())
-        self.dag.add_edges_from([
-            (int(row.parent_id), int(row.location_id))
-            for row in self.df.loc[
-                self.df.location_id != root].itertuples()
+        self.root = root
+        self._dag = None
+        self._build()
+
+    def __setstate__(self, state):
+        """
+        Unpickles a DAG, including one pickled before the hierarchy was kept
+        in arrays, which had only the data frame and a networkx graph
+        holding the root.
+        """
+        old_dag = state.pop('dag', None)
+        self.__dict__.update(state)
+        if 'root' not in state:
+            self.root = old_dag.graph['root']
+        if '_location_ids' not in state:
+            self._dag = old_dag
+            self._build()
+
+    def _build(self):
+        """Makes the arrays of parents, children, depths and the pre-order walk from the data frame."""
+        root = self.root
+        self._location_ids = self.df.location_id.values.astype(np.int64)
+        self._index = {loc: idx for idx, loc in enumerate(self._location_ids.tolist())}
+        self._sorted = np.argsort(self._location_ids, kind="stable")
+        location_count = len(self._location_ids)
+        self._parent = self._indices(self.df.parent_id.values)
+        self._parent[self._location_ids == root] = -1
+
+        # Children of each location are contiguous in _children, starting at
+        # _child_offset[index], in the order they appear in the data frame.
+        with_parent = np.flatnonzero(self._parent >= 0)
+        self._children = with_parent[np.argsort(self._parent[with_parent], kind="stable")]
+        self._child_offset = np.concatenate([
+            [0], np.cumsum(np.bincount(self._parent[with_parent], minlength=location_count))
         ])
-        self.dag.graph["root"] = root
+
+        # A pre-order walk from the root, then from any location whose
+        # parent isn't in the hierarchy. The subtree of a location is the
+        # interval [_enter, _exit) of the walk.
+        self._depth = np.full(location_count, -1, dtype=np.int64)
+        top = [self._index[root]] if root in self._index else []
+        top += [idx for idx in np.flatnonzero(self._parent < 0).tolist() if idx not in top]
+        self._depth[top] = 0
+        preorder = list()
+        stack = top[::-1]
+        while stack:
+            idx = stack.pop()
+            preorder.append(idx)
+            kids = self._child_indices(idx)
+            self._depth[kids] = self._depth[idx] + 1
+            stack.extend(kids[::-1].tolist())
+        self._preorder = np.array(preorder, dtype=np.int64)
+        self._enter = np.full(location_count, -1, dtype=np.int64)
+        self._enter[self._preorder] = np.arange(len(self._preorder))
+        subtree_size = (self._depth >= 0).astype(np.int64)
+        for level in range(int(self._depth.max()) if location_count else 0, 0, -1):
+            at_level = np.flatnonzero(self._depth == level)
+            np.add.at(subtree_size, self._parent[at_level], subtree_size[at_level])
+        self._exit = self._enter + subtree_size
+
+    def _indices(self, location_ids) -> np.ndarray:
+        """Row index of each location ID, or -1 if it isn't in the hierarchy."""
+        location_ids = np.asarray(location_ids).astype(np.int64)
+        sorted_ids = self._location_ids[self._sorted]
+        if len(sorted_ids) == 0:
+            return np.full(location_ids.shape, -1, dtype=np.int64)
+        position = np.clip(np.searchsorted(sorted_ids, location_ids), 0, len(sorted_ids) - 1)
+        found = sorted_ids[position] == location_ids
+        return np.where(found, self._sorted[position], -1)
+
+    def _child_indices(self, idx: int) -> np.ndarray:
+        return self._children[self._child_offset[idx]:self._child_offset[idx + 1]]
+
+    @property
+    def dag(self) -> nx.DiGraph:
+        """
+        A networkx graph where each node is the location ID, and its
+        properties are the columns of the data frame. It is built the
+        first time it is used.
+        """
+        if self._dag is None:
+            self._dag = nx.DiGraph()
+            self._dag.add_nodes_from(
+                (int(row['location_id']), row) for row in self.df.to_dict(orient='records')
+            )
+            self._dag.add_edges_from([
+                (int(row.parent_id), int(row.location_id))
+                for row in self.df.loc[
+                    self.df.location_id != self.root].itertuples()
+            ])
+            self._dag.graph["root"] = self.root
+        return self._dag
+
+    def __contains__(self, location_id: int) -> bool:
+        return location_id in self._index
 
     def depth(self, location_id: int) -> int:
         """
         Gets the depth of the hierarchy at this location.
         """
-        return nx.shortest_path_length(G=self.dag, source=self.dag.graph["root"], target=location_id)
+        return int(self._depth[self._index[location_id]])
 
     def descendants(self, location_id: int) -> List[int]:
         """
@@ -86,25 +177,45 @@ class LocationDAG:
         :param location_id: (int)
         :return:
         """
-        return nx.algorithms.dag.descendants(G=self.dag, source=location_id)
+        return self.subtree(location_id)[1:]
+
+    def subtree(self, location_id: int) -> List[int]:
+        """
+        Gets a location ID and all of its descendants.
+        """
+        idx = self._index[location_id]
+        return self._location_ids[self._preorder[self._enter[idx]:self._exit[idx]]].tolist()
+
+    def in_subtree(self, location_id: int, location_ids) -> np.ndarray:
+        """
+        Checks which of the location IDs are this location or its descendants.
+
+        Returns:
+            np.ndarray of bool, one for each location ID.
+        """
+        idx = self._index[location_id]
+        indices = self._indices(location_ids)
+        enter = np.where(indices >= 0, self._enter[indices], -1)
+        return (enter >= self._enter[idx]) & (enter < self._exit[idx])
 
     def children(self, location_id: int) -> List[int]:
         """
         Gets the child location IDs.
         """
-        return list(self.dag.successors(location_id))
+        return self._location_ids[self._child_indices(self._index[location_id])].tolist()
 
     def parent_children(self, location_id: int) -> List[int]:
         """
         Gets the parent and the child location IDs.
         """
-        return [location_id] + list(self.dag.successors(location_id))
+        return [location_id] + self.children(location_id)
 
     def is_leaf(self, location_id: int) -> bool:
         """
         Checks if a location is a leaf node in the tree.
         """
-        return len(list(self.dag.successors(location_id))) == 0
+        idx = self._index[location_id]
+        return bool(self._child_offset[idx] == self._child_offset[idx + 1])
 
     def to_dataframe(self) -> pd.DataFrame:
         """
@@ -115,20 +226,21 @@ class LocationDAG:
         Returns:
             pd.DataFrame
         """
-        sorted_locations = list(nx.lexicographical_topological_sort(self.dag))
-        parents = list()
-        names = list()
-        for loc in sorted_locations:
-            parent = list(self.dag.predecessors(loc))
-            if parent:
-                parents.append(int(parent[0]))
-            else:
-                parents.append(np.nan)
-            names.append(self.dag.nodes[loc]["location_name"])
+        # Topological order, taking the smallest location ID first when there is a choice.
+        ready = [(loc, idx) for idx, loc in enumerate(self._location_ids.tolist()) if self._parent[idx] < 0]
+        heapq.heapify(ready)
+        order = list()
+        while ready:
+            _, idx = heapq.heappop(ready)
+            order.append(idx)
+            for kid in self._child_indices(idx).tolist():
+                heapq.heappush(ready, (int(self._location_ids[kid]), kid))
+        order = np.array(order, dtype=np.int64)
+        parent = self._parent[order]
         return pd.DataFrame(dict(
-            location_id=sorted_locations,
-            parent_id=parents,
-            name=names
+            location_id=self._location_ids[order],
+            parent_id=np.where(parent >= 0, self._location_ids[parent], np.nan),
+            name=self.df["location_name"].values[order]
         ))
 
 
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 from copy import copy
-from typing import List, Optional, Dict, Union
+from typing import List, Optional, Dict, Union, Tuple
 
 from cascade_at.core.db import decomp_step as ds
 
@@ -10,7 +10,7 @@ from cascade_at.core.log import get_loggers
 from cascade_at.inputs.base_input import BaseInput
 from cascade_at.inputs.asdr import ASDR
 from cascade_at.inputs.csmr import CSMR
-from cascade_at.dismod.constants import IntegrandEnum
+from cascade_at.dismod.constants import IntegrandEnum, lookup_values
 from cascade_at.inputs.covariate_data import CovariateData
 from cascade_at.inputs.covariate_specs import CovariateSpecs
 from cascade_at.inputs.data import CrosswalkVersion
@@ -18,7 +18,7 @@ from cascade_at.inputs.demographics import Demographics
 from cascade_at.inputs.locations import LocationDAG, locations_by_drill
 from cascade_at.inputs.population import Population
 from cascade_at.inputs.utilities.covariate_weighting import (
-    get_interpolated_covariate_values
+    get_interpolated_covariate_values, CovariateInterpolationError
 )
 from cascade_at.inputs.utilities.gbd_ids import get_location_set_version_id
 from cascade_at.inputs.utilities.transformations import COVARIATE_TRANSFORMS
@@ -108,6 +108,9 @@ class MeasurementInputs:
             to each measure
         self.dismod_data: (pd.DataFrame) resulting dismod data formatted
             to be used in the dismod database
+        self.country_covariate_reference_values: (pd.DataFrame) reference
+            value and max difference of each country covariate for each parent
+            location and sex, indexed by covariate_id, location_id and sex_id
 
         Examples
         --------
@@ -188,6 +191,7 @@ class MeasurementInputs:
         self.covariate_data = None
         self.country_covariate_data = None
         self.covariate_specs = None
+        self.country_covariate_reference_values = None
         self.omega = None
 
     def get_raw_inputs(self):
@@ -272,12 +276,12 @@ class MeasurementInputs:
         self.dismod_data = pd.concat([data, asdr, csmr], axis=0, sort=True)
         self.dismod_data.reset_index(drop=True, inplace=True)
 
-        self.dismod_data["density"] = self.dismod_data.measure.apply(
-            self.density.__getitem__)
-        self.dismod_data["eta"] = self.dismod_data.measure.apply(
-            self.data_eta.__getitem__)
-        self.dismod_data["nu"] = self.dismod_data.measure.apply(
-            self.nu.__getitem__)
+        self.dismod_data["density"] = lookup_values(
+            self.dismod_data.measure, self.density)
+        self.dismod_data["eta"] = lookup_values(
+            self.dismod_data.measure, self.data_eta)
+        self.dismod_data["nu"] = lookup_values(
+            self.dismod_data.measure, self.nu)
 
         # This makes the specs not just for the country covariate but adds on
         # the sex and one covariates.
@@ -295,14 +299,45 @@ class MeasurementInputs:
             self.dismod_data.hold_out.isnull(), 'hold_out'] = 0.
         self.dismod_data.drop(['age_group_id'], inplace=True, axis=1)
 
+        self.country_covariate_reference_values = self.calculate_all_country_covariate_reference_values()
         return self
 
+    def locations_slice(self, name: str, location_ids: List[int]) -> Optional[pd.DataFrame]:
+        """
+        Get the rows of one of the configured data frames, e.g. 'dismod_data'
+        or 'omega', for some locations, in their original order. Returns None
+        if there is no such data frame.
+        """
+        df = getattr(self, name)
+        if df is None:
+            return None
+        return df.loc[df.location_id.isin(location_ids)]
+
+    def subtree_data(self, parent_location_id: int) -> pd.DataFrame:
+        """
+        Get a copy of the configured dismod data for a parent location and all
+        of its descendants, which is all of the data that a model for that parent can use.
+        """
+        return self.locations_slice(
+            name='dismod_data', location_ids=self.location_dag.subtree(parent_location_id)
+        ).copy()
+
+    def dismod_data_extent(self) -> Tuple[float, float, float, float]:
+        """
+        Get the smallest age_lower, largest age_upper, smallest time_lower
+        and largest time_upper over all of the configured dismod data.
+        """
+        return (
+            self.dismod_data.age_lower.min(), self.dismod_data.age_upper.max(),
+            self.dismod_data.time_lower.min(), self.dismod_data.time_upper.max()
+        )
+
     def prune_mortality_data(self, parent_location_id: int) -> pd.DataFrame:
         """
         Remove mortality data for descendents that are not children of parent_location_id
         from the configured dismod data before it gets filled into the dismod database.
         """
-        df = self.dismod_data.copy()
+        df = self.subtree_data(parent_location_id=parent_location_id)
         direct_children = self.location_dag.parent_children(parent_location_id)
         direct_children = df.location_id.isin(direct_children)
         mortality_measures = df.measure.isin([
@@ -383,8 +418,8 @@ class MeasurementInputs:
             if c.study_country == 'country':
                 LOG.info(f"Transforming the data for country covariate "
                          f"{c.covariate_id}.")
-                df[c.name] = df[c.name].apply(
-                    lambda x: COVARIATE_TRANSFORMS[c.transformation_id](x)
+                df[c.name] = COVARIATE_TRANSFORMS[c.transformation_id](
+                    df[c.name].values.astype(np.float)
                 )
         return df
 
@@ -405,11 +440,9 @@ class MeasurementInputs:
             correct reference values and max diff.
         """
         covariate_specs = copy(self.covariate_specs)
-
-        age_min = self.dismod_data.age_lower.min()
-        age_max = self.dismod_data.age_upper.max()
-        time_min = self.dismod_data.time_lower.min()
-        time_max = self.dismod_data.time_upper.max()
+        # Inputs pickled before the references were precalculated don't have them.
+        references = getattr(self, 'country_covariate_reference_values', None)
+        extent = None
 
         children = self.location_dag.children(parent_location_id)
 
@@ -425,6 +458,10 @@ class MeasurementInputs:
                 else:
                     raise ValueError(f"The only two study covariates allowed are sex and one, you tried {c.name}.")
             elif c.study_country == 'country':
+                key = (c.covariate_id, parent_location_id, sex_id)
+                if references is not None and key in references.index:
+                    c.reference, c.max_difference = references.loc[key, ['reference', 'max_difference']]
+                    continue
                 LOG.info(f"Calculating the reference and max difference for country covariate {c.covariate_id}.")
 
                 cov_df = self.country_covariate_data[c.covariate_id]
@@ -441,6 +478,9 @@ class MeasurementInputs:
                     reference_value = 0
                     max_difference = np.nan
                 else:
+                    if extent is None:
+                        extent = self.dismod_data_extent()
+                    age_min, age_max, time_min, time_max = extent
                     pop_df = self.population.configure_for_dismod()
                     pop_df = (
                         pop_df.loc[pop_df.location_id == parent_location_id].copy()
@@ -466,6 +506,95 @@ class MeasurementInputs:
         covariate_specs.create_covariate_list()
         return covariate_specs
 
+    def calculate_all_country_covariate_reference_values(
+            self, location_ids: Optional[List[int]] = None,
+            sex_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Calculates the country covariate reference values and max differences
+        that calculate_country_covariate_reference_values would give, for every
+        parent location and sex at once, so that filling each database in the
+        cascade only has to look them up.
+
+        Parent locations are the locations in the demographics that have
+        both covariate values and population. If the interpolation fails for a
+        covariate and sex, those reference values are left out of the table and
+        are calculated when they are asked for instead.
+
+        :param location_ids: (List[int]) parent locations, defaults to all of them
+        :param sex_ids: (List[int]) sexes, defaults to male, female and both
+        :return: pd.DataFrame with columns reference and max_difference, indexed
+            by covariate_id, location_id and sex_id
+        """
+        if location_ids is None:
+            location_ids = self.demographics.location_id
+        if sex_ids is None:
+            sex_ids = list(SEX_ID_TO_NAME.keys())
+        location_ids = [loc for loc in location_ids if loc in self.location_dag]
+
+        age_min = self.dismod_data.age_lower.min()
+        age_max = self.dismod_data.age_upper.max()
+        time_min = self.dismod_data.time_lower.min()
+        time_max = self.dismod_data.time_upper.max()
+        pop_df = self.population.configure_for_dismod()
+
+        tables = list()
+        for c in self.covariate_specs.covariate_specs:
+            if c.study_country != 'country':
+                continue
+            LOG.info(f"Calculating the references and max differences for country covariate {c.covariate_id}.")
+            cov_df = self.country_covariate_data[c.covariate_id]
+            if cov_df.empty:
+                table = expand_grid({'location_id': location_ids, 'sex_id': sex_ids})
+                table['reference'] = 0
+                table['max_difference'] = np.nan
+            else:
+                available = set(cov_df.location_id) & set(pop_df.location_id)
+                parents = [loc for loc in location_ids if loc in available]
+                if not parents:
+                    continue
+                value_range = cov_df.groupby('location_id').mean_value.agg(['min', 'max'])
+                parent_range = pd.DataFrame([
+                    value_range.loc[value_range.index.isin(self.location_dag.parent_children(loc))].agg(
+                        {'min': 'min', 'max': 'max'}
+                    ) for loc in parents
+                ], index=parents)
+                sex_tables = list()
+                for sex_id in sex_ids:
+                    df_to_interp = pd.DataFrame({
+                        'location_id': parents,
+                        'sex_id': sex_id,
+                        'age_lower': age_min, 'age_upper': age_max,
+                        'time_lower': time_min, 'time_upper': time_max
+                    })
+                    try:
+                        reference = get_interpolated_covariate_values(
+                            data_df=df_to_interp,
+                            covariate_dict={c.name: cov_df},
+                            population_df=pop_df
+                        )[c.name].values
+                    except (CovariateInterpolationError, ZeroDivisionError) as error:
+                        LOG.warning(f"Could not calculate references for country covariate {c.covariate_id}"
+                                    f" and sex_id {sex_id}, leaving them until they are needed: {error}")
+                        continue
+                    lowest = parent_range['min'].values
+                    highest = parent_range['max'].values
+                    sex_tables.append(pd.DataFrame({
+                        'location_id': parents,
+                        'sex_id': sex_id,
+                        'reference': reference,
+                        'max_difference': np.maximum(highest - reference, reference - lowest)
+                        + CascadeConstants.PRECISION_FOR_REFERENCE_VALUES
+                    }))
+                if not sex_tables:
+                    continue
+                table = pd.concat(sex_tables, ignore_index=True)
+                table = table.loc[table.reference.notnull()]
+            table['covariate_id'] = c.covariate_id
+            tables.append(table)
+        if not tables:
+            tables = [pd.DataFrame(columns=['covariate_id', 'location_id', 'sex_id', 'reference', 'max_difference'])]
+        return pd.concat(tables, ignore_index=True).set_index(['covariate_id', 'location_id', 'sex_id']).sort_index()
+
     def reset_index(self, drop, inplace):
         pass
 
@@ -1,8 +1,13 @@
+from typing import Tuple
+
 import numpy as np
+import pandas as pd
 from intervaltree import IntervalTree
+from scipy import sparse
 
 from cascade_at.core.log import get_loggers
 from cascade_at.inputs.utilities.gbd_ids import make_age_intervals, make_time_intervals
+from cascade_at.inputs.utilities.gbd_ids import make_age_group_mapper, make_year_mapper
 from cascade_at.inputs import InputsError
 
 LOG = get_loggers(__name__)
@@ -13,6 +18,16 @@ class CovariateInterpolationError(InputsError):
     pass
 
 
+COVARIATE_INDICES = ['location_id', 'sex_id', 'year_id', 'age_group_id']
+"""The columns that identify one covariate value, in the order of the axes of the covariate cube."""
+
+DATA_GROUP_COLUMNS = ['location_id', 'sex_id', 'age_lower', 'age_upper', 'time_lower', 'time_upper']
+"""Data rows that agree on these columns get the same interpolated covariate value."""
+
+PLAN_CHUNK_SIZE = 10_000_000
+"""Approximate number of (group, cell) pairs looked at once when making an interpolation plan."""
+
+
 def values(interval):
     return interval.begin, interval.end, interval.data
 
@@ -44,8 +59,7 @@ class CovariateInterpolator:
         :param population: (pd.DataFrame)
         """
         # Covariates must be sorted by both age_group_id and age_lower because age_lower is not unique to age_group_id
-        indices = ['location_id', 'sex_id', 'year_id', 'age_group_id']
-        sort_order = indices + ['age_lower']
+        sort_order = COVARIATE_INDICES + ['age_lower']
 
         self.covariate = covariate.sort_values(by=sort_order)
         self.population = population.sort_values(by=sort_order)
@@ -54,15 +68,44 @@ class CovariateInterpolator:
         self.year_min = self.covariate.year_id.min()
         self.year_max = self.covariate.year_id.max() + 1
 
-        self.age_intervals = make_age_intervals(df=self.covariate)
-        self.time_intervals = make_time_intervals(df=self.covariate)
+        self.age_mapper = make_age_group_mapper(df=self.covariate)
+        self.time_mapper = make_year_mapper(df=self.covariate)
+
+        self._age_intervals = None
+        self._time_intervals = None
+        self._dict_cov = None
+        self._dict_pop = None
+        self._layout = None
+
+    @property
+    def age_intervals(self) -> IntervalTree:
+        """Only used for one group at a time by :meth:`interpolate`."""
+        if self._age_intervals is None:
+            self._age_intervals = make_age_intervals(df=self.covariate)
+        return self._age_intervals
+
+    @property
+    def time_intervals(self) -> IntervalTree:
+        """Only used for one group at a time by :meth:`interpolate`."""
+        if self._time_intervals is None:
+            self._time_intervals = make_time_intervals(df=self.covariate)
+        return self._time_intervals
+
+    @property
+    def dict_cov(self):
+        if self._dict_cov is None:
+            self._dict_cov = dict(zip(
+                map(tuple, self.covariate[COVARIATE_INDICES].values.tolist()), self.covariate['mean_value'].values
+            ))
+        return self._dict_cov
 
-        self.dict_cov = dict(zip(
-            map(tuple, self.covariate[indices].values.tolist()), self.covariate['mean_value'].values
-        ))
-        self.dict_pop = dict(zip(
-            map(tuple, self.population[indices].values.tolist()), self.population['population'].values
-        ))
+    @property
+    def dict_pop(self):
+        if self._dict_pop is None:
+            self._dict_pop = dict(zip(
+                map(tuple, self.population[COVARIATE_INDICES].values.tolist()), self.population['population'].values
+            ))
+        return self._dict_pop
 
     @staticmethod
     def _restrict_time(time, time_min, time_max):
@@ -138,6 +181,275 @@ class CovariateInterpolator:
             cov_value = np.average(cov_value, weights=weight)
         return cov_value
 
+    def _build_layout(self):
+        """
+        The axes of the (location, sex, year, age group) cells that the covariate has,
+        the population on those cells, and the covariate's age intervals,
+        unique and sorted the same way as the IntervalTree query results
+        by the age group mapper, each with its column among the age groups.
+        """
+        axes = [np.sort(self.covariate[c].unique()) for c in COVARIATE_INDICES]
+        shape = tuple(len(a) for a in axes)
+        population = np.zeros(shape)
+        has_population = np.zeros(shape, dtype=bool)
+        idx, inside = _cube_index(axes, [self.population[c].values for c in COVARIATE_INDICES])
+        idx = tuple(i[inside] for i in idx)
+        population[idx] = self.population['population'].values[inside]
+        has_population[idx] = True
+
+        ages = self.age_mapper
+        age_group_column = np.zeros((len(ages.ids), shape[3]))
+        age_group_column[np.arange(len(ages.ids)), np.searchsorted(axes[3], ages.ids)] = 1.
+        self._layout = dict(
+            axes=axes,
+            population=population,
+            has_population=has_population,
+            age_begin=ages.lower,
+            age_end=ages.upper,
+            age_group_column=age_group_column
+        )
+        return self._layout
+
+    def _time_weights(self, time_lower, time_upper):
+        """
+        The vectorized time half of _weighting, for many (time_lower, time_upper) pairs.
+        Times are restricted to the covariate years the same way, and
+        a time_lower past the last year interval is moved back by one year.
+        """
+        years = self._layout['axes'][2].astype(float)
+        time_lower = np.clip(time_lower, self.year_min, self.year_max)
+        time_upper = np.clip(time_upper, self.year_min, self.year_max)
+        time_lower = np.where(self.time_mapper.contains(time_lower), time_lower, time_lower - 1)
+        weights, selected = interval_weights(years, years + 1, time_lower, time_upper)
+        none = ~selected.any(axis=1)
+        if none.any():
+            i = np.flatnonzero(none)[0]
+            raise CovariateInterpolationError(
+                f"There is no covariate time group for time lower {time_lower[i]} and time upper {time_upper[i]}."
+            )
+        return weights, selected
+
+    def _age_weights(self, age_lower, age_upper):
+        """
+        The vectorized age half of _weighting, for many (age_lower, age_upper) pairs,
+        with a column for each age group in the covariate.
+        """
+        layout = self._layout
+        weights, selected = interval_weights(layout['age_begin'], layout['age_end'], age_lower, age_upper)
+        none = ~selected.any(axis=1)
+        if none.any():
+            i = np.flatnonzero(none)[0]
+            raise CovariateInterpolationError(
+                f"There is no covariate age group for age lower {age_lower[i]} and age upper {age_upper[i]}."
+            )
+        columns = layout['age_group_column']
+        return weights @ columns, (selected @ columns) > 0
+
+    def plan(self, loc_id, sex_id, age_lower, age_upper, time_lower, time_upper) -> 'InterpolationPlan':
+        """
+        Makes the interpolation plan for arrays of data groups. Age and time
+        weights are computed once for each unique age and time interval.
+        The plan applies to this covariate and to any other covariate with the
+        same locations, sexes, years and age groups.
+        """
+        layout = self._layout if self._layout is not None else self._build_layout()
+        groups = pd.DataFrame({
+            'location_id': np.asarray(loc_id), 'sex_id': np.asarray(sex_id),
+            'age_lower': np.asarray(age_lower, dtype=float), 'age_upper': np.asarray(age_upper, dtype=float),
+            'time_lower': np.asarray(time_lower, dtype=float), 'time_upper': np.asarray(time_upper, dtype=float)
+        })
+        shape = tuple(len(a) for a in layout['axes'])
+        n_cells = int(np.prod(shape))
+
+        (loc_index, sex_index), (has_loc, has_sex) = _cube_index(
+            layout['axes'][:2], [groups.location_id.values, groups.sex_id.values], each=True
+        )
+        if not has_loc.all():
+            LOG.warning(f"Covariate is missing for location_id {sorted(set(groups.location_id.values[~has_loc]))}"
+                        f" -- setting the value to None.")
+        todo = np.flatnonzero(has_loc)
+        if not len(todo):
+            empty = sparse.csr_matrix((len(groups), n_cells))
+            return InterpolationPlan(layout['axes'], empty, empty.copy(), has_loc, groups)
+
+        age_inverse, ages = _factorize_pairs(groups.age_lower.values[todo], groups.age_upper.values[todo])
+        time_inverse, times = _factorize_pairs(groups.time_lower.values[todo], groups.time_upper.values[todo])
+        age_index, age_wts, age_selected = _compact(*self._age_weights(*ages))
+        time_index, time_wts, time_selected = _compact(*self._time_weights(*times))
+
+        group_rows, cells, weights = list(), list(), list()
+        chunk = max(1, PLAN_CHUNK_SIZE // (time_wts.shape[1] * age_wts.shape[1]))
+        for start in range(0, len(todo), chunk):
+            rows = todo[start:start + chunk]
+            a, t = age_inverse[start:start + chunk], time_inverse[start:start + chunk]
+
+            missing = ~has_sex[rows]
+            cell = (
+                loc_index[rows][:, None, None], np.where(missing, 0, sex_index[rows])[:, None, None],
+                time_index[t][:, :, None], age_index[a][:, None, :]
+            )
+            spanned = time_selected[t][:, :, None] & age_selected[a][:, None, :]
+            missing |= (spanned & ~layout['has_population'][cell]).any(axis=(1, 2))
+            if missing.any():
+                i = rows[np.flatnonzero(missing)[0]]
+                raise CovariateInterpolationError(
+                    f"Population is missing for {groups.iloc[i].to_dict()} in the ages and years it spans."
+                )
+            weight = time_wts[t][:, :, None] * age_wts[a][:, None, :] * layout['population'][cell]
+            group_rows.append(np.broadcast_to(rows[:, None, None], spanned.shape)[spanned])
+            cells.append(np.ravel_multi_index(np.broadcast_arrays(*cell), shape)[spanned])
+            weights.append(weight[spanned])
+
+        group_rows, cells = np.concatenate(group_rows), np.concatenate(cells)
+        weights = sparse.csr_matrix((np.concatenate(weights), (group_rows, cells)), shape=(len(groups), n_cells))
+        spanned = sparse.csr_matrix((np.ones(len(cells)), (group_rows, cells)), shape=(len(groups), n_cells))
+        return InterpolationPlan(layout['axes'], weights, spanned, has_loc, groups)
+
+    def interpolate_many(self, loc_id, sex_id, age_lower, age_upper, time_lower, time_upper):
+        """
+        Vectorized version of interpolate for arrays of data groups.
+        Locations without the covariate get NaN.
+        """
+        return self.plan(
+            loc_id=loc_id, sex_id=sex_id, age_lower=age_lower, age_upper=age_upper,
+            time_lower=time_lower, time_upper=time_upper
+        ).apply(self.covariate)
+
+
+class InterpolationPlan:
+    """
+    The population weights that take covariate values on (location, sex, year, age group)
+    cells to data groups, as a sparse matrix with a row for each group and a column
+    for each cell. Covariates only change the values on the cells, so one plan
+    applies to every covariate with the same locations, sexes, years and age groups,
+    and interpolating each one is a sparse matrix-vector product.
+    Make one with :meth:`CovariateInterpolator.plan`.
+
+    Parameters
+    ----------
+    axes
+        Sorted location, sex, year and age group IDs of the cells.
+    weights
+        Product of time weight, age weight and population for each group and cell.
+    spanned
+        One for each cell that a group's ages and years span, which must have a covariate value.
+    has_location
+        Whether each group's location has the covariate. Groups without one get NaN.
+    groups
+        The data groups, for error messages.
+    """
+    def __init__(self, axes, weights, spanned, has_location, groups):
+        self.axes = axes
+        self.weights = weights
+        self.spanned = spanned
+        self.has_location = has_location
+        self.groups = groups
+
+        self.total = np.asarray(weights.sum(axis=1)).ravel()
+        if (self.total[has_location] == 0).any():
+            raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+
+    def apply(self, covariate: pd.DataFrame) -> np.ndarray:
+        """
+        Interpolates the mean_value of a covariate onto the data groups.
+        """
+        shape = tuple(len(a) for a in self.axes)
+        cell_values = np.zeros(int(np.prod(shape)))
+        has_value = np.zeros(len(cell_values))
+        idx, inside = _cube_index(self.axes, [covariate[c].values for c in COVARIATE_INDICES])
+        cells = np.ravel_multi_index(tuple(i[inside] for i in idx), shape)
+        cell_values[cells] = covariate['mean_value'].values[inside]
+        has_value[cells] = 1.
+
+        missing = (self.spanned @ (1. - has_value)) > 0
+        if missing.any():
+            i = np.flatnonzero(missing)[0]
+            raise CovariateInterpolationError(
+                f"Covariate is missing for {self.groups.iloc[i].to_dict()} in the ages and years it spans."
+            )
+        result = np.full(len(self.total), np.nan)
+        result[self.has_location] = (self.weights @ cell_values)[self.has_location] / self.total[self.has_location]
+        return result
+
+
+def covariate_layout(covariate: pd.DataFrame) -> Tuple:
+    """
+    The locations, sexes, years and age groups of a covariate, which are
+    everything about it that an interpolation plan depends on.
+    """
+    axes = tuple(tuple(np.sort(covariate[c].unique()).tolist()) for c in COVARIATE_INDICES)
+    age_intervals = covariate[['age_lower', 'age_upper', 'age_group_id']].drop_duplicates()
+    return axes + (tuple(sorted(map(tuple, age_intervals.values.tolist()))),)
+
+
+def _factorize_pairs(lower, upper):
+    """
+    Finds the unique (lower, upper) pairs, returning the index of each
+    pair among the unique ones and the unique lower and upper values.
+    """
+    lower_codes, lower_values = pd.factorize(lower)
+    upper_codes, upper_values = pd.factorize(upper)
+    inverse, pairs = pd.factorize(lower_codes.astype(np.int64) * len(upper_values) + upper_codes)
+    return inverse, (lower_values[pairs // len(upper_values)], upper_values[pairs % len(upper_values)])
+
+
+def _compact(weights, selected):
+    """
+    Keeps only as many columns as the largest number of selected intervals
+    in a row, returning for each row the indices of its selected intervals
+    in order, their weights and which entries are selected rather than padding.
+    Padding has index 0 and weight 0.
+    """
+    width = max(1, selected.sum(axis=1).max())
+    order = np.argsort(~selected, axis=1, kind='stable')[:, :width]
+    kept = np.take_along_axis(selected, order, axis=1)
+    return np.where(kept, order, 0), np.take_along_axis(weights, order, axis=1) * kept, kept
+
+
+def interval_weights(begin, end, lower, upper):
+    """
+    The vectorized version of interval_weighting, for many (lower, upper) pairs
+    against one set of intervals sorted by (begin, end). Intervals are selected
+    the way an IntervalTree query selects them: those containing lower when
+    lower == upper, and those overlapping [lower, upper) otherwise.
+
+    Returns an array of weights with one row per pair and one column per interval,
+    zero where the interval isn't selected, and the boolean array of selections.
+    """
+    begin, end = np.asarray(begin, dtype=float), np.asarray(end, dtype=float)
+    lower = np.asarray(lower, dtype=float)[:, None]
+    upper = np.asarray(upper, dtype=float)[:, None]
+    selected = np.where(
+        lower == upper,
+        (begin <= lower) & (lower < end),
+        (begin < upper) & (end > lower)
+    )
+    weights = selected.astype(float)
+
+    n_intervals = selected.shape[1]
+    several = np.flatnonzero(selected.sum(axis=1) > 1)
+    first = selected[several].argmax(axis=1)
+    last = n_intervals - 1 - selected[several, ::-1].argmax(axis=1)
+    weights[several, first] = (end[first] - lower[several, 0]) / (end[first] - begin[first])
+    weights[several, last] = (upper[several, 0] - begin[last]) / (end[last] - begin[last])
+    return weights, selected
+
+
+def _cube_index(axes, keys, each=False):
+    """
+    Finds the index of each key along its sorted axis with a binary search.
+    Returns the indices and either whether every key of a row is on its axis,
+    or with each=True, whether each key is on its axis.
+    """
+    indices, found = list(), list()
+    for axis, key in zip(axes, keys):
+        index = np.minimum(np.searchsorted(axis, key), len(axis) - 1)
+        indices.append(index)
+        found.append(axis[index] == key)
+    if each:
+        return indices, found
+    return indices, np.logical_and.reduce(found)
+
 
 def get_interpolated_covariate_values(data_df, covariate_dict,
                                       population_df):
@@ -145,6 +457,8 @@ def get_interpolated_covariate_values(data_df, covariate_dict,
     Gets the unique age-time combinations from the data_df, and creates
     interpolated covariate values for each of these combinations by population-weighting
     the standard GBD age-years that span the non-standard combinations.
+    Covariates with the same locations, sexes, years and age groups share
+    one interpolation plan.
 
     :param data_df: (pd.DataFrame)
     :param covariate_dict: Dict[pd.DataFrame] with covariate names as keys
@@ -154,23 +468,25 @@ def get_interpolated_covariate_values(data_df, covariate_dict,
     data = data_df.copy()
     pop = population_df.copy()
 
-    data_groups = data.groupby([
-        'location_id', 'sex_id', 'age_lower', 'age_upper', 'time_lower', 'time_upper'
-    ], as_index=False)
+    data_groups = data.groupby(DATA_GROUP_COLUMNS)
+    group_index = data_groups.ngroup().values
+    grouped = ~np.isnan(group_index)
+    group_index = group_index[grouped].astype(int)
+    groups = data_groups.size().index.to_frame(index=False)
+    LOG.info(f"Interpolating covariates for {len(groups)} data groups.")
 
-    cov_objects = {cov_name: CovariateInterpolator(covariate=raw_cov, population=pop)
-                   for cov_name, raw_cov in covariate_dict.items()}
-    num_groups = len(data_groups)
-    for cov_id, cov_obj in cov_objects.items():
+    plans = dict()
+    for cov_id, raw_cov in covariate_dict.items():
         LOG.info(f"Interpolating covariate {cov_id}.")
-        for i, (k, v) in enumerate(data_groups):
-            if i % 1000 == 0:
-                LOG.info(f"Processed {i} of {num_groups} data groups.")
-            [loc_id, sex_id, age_lower, age_upper, time_lower, time_upper] = k
-            cov_value = cov_obj.interpolate(
-                loc_id=loc_id, sex_id=sex_id,
-                age_lower=age_lower, age_upper=age_upper,
-                time_lower=time_lower, time_upper=time_upper
+        layout = covariate_layout(raw_cov)
+        if layout not in plans:
+            plans[layout] = CovariateInterpolator(covariate=raw_cov, population=pop).plan(
+                loc_id=groups.location_id.values, sex_id=groups.sex_id.values,
+                age_lower=groups.age_lower.values, age_upper=groups.age_upper.values,
+                time_lower=groups.time_lower.values, time_upper=groups.time_upper.values
             )
-            data.loc[v.index, cov_id] = cov_value
+        cov_values = plans[layout].apply(raw_cov)
+        column = np.full(len(data), np.nan)
+        column[grouped] = cov_values[group_index]
+        data[cov_id] = column
     return data
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Tuple
 from intervaltree import IntervalTree
 
 from cascade_at.core.db import db_queries
@@ -101,6 +101,31 @@ def get_age_group_metadata(gbd_round_id: int) -> pd.DataFrame:
     return df[['age_group_id', 'age_lower', 'age_upper']]
 
 
+def _age_group_df(df: Optional[pd.DataFrame] = None,
+                  gbd_round_id: Optional[int] = None) -> pd.DataFrame:
+    if df is None and gbd_round_id is None:
+        raise IhmeIDError("Need to pass either a data frame with columns"
+                          "['age_group_id', 'age_lower', 'age_upper' or a valid"
+                          "gbd_round_id to get the full set of age groups.")
+    if df is None:
+        df = get_age_group_metadata(gbd_round_id=gbd_round_id)
+    else:
+        for col in ['age_group_id', 'age_lower', 'age_upper']:
+            if col not in df.columns:
+                raise IhmeIDError(f"The data frame columns {df.columns} do not contain"
+                                  f"the required column {col}.")
+    return df
+
+
+def _year_ids(df: Optional[pd.DataFrame] = None) -> np.ndarray:
+    if df is None:
+        return np.arange(1950, 2050)
+    if 'year_id' not in df.columns:
+        raise IhmeIDError(f"The data frame columns {df.columns} do not contain the"
+                          "one required column year_id.")
+    return df.year_id.unique()
+
+
 def make_age_intervals(df: Optional[pd.DataFrame] = None,
                        gbd_round_id: Optional[int] = None) -> IntervalTree:
     """
@@ -117,17 +142,7 @@ def make_age_intervals(df: Optional[pd.DataFrame] = None,
         The gbd round ID from which to pull the age group metadata which is used
         to construct the interval tree. Ignored if df is specified instead.
     """
-    if df is None and gbd_round_id is None:
-        raise IhmeIDError("Need to pass either a data frame with columns"
-                          "['age_group_id', 'age_lower', 'age_upper' or a valid"
-                          "gbd_round_id to get the full set of age groups.")
-    if df is None:
-        df = get_age_group_metadata(gbd_round_id=gbd_round_id)
-    else:
-        for col in ['age_group_id', 'age_lower', 'age_upper']:
-            if col not in df.columns:
-                raise IhmeIDError(f"The data frame columns {df.columns} do not contain"
-                                  f"the required column {col}.")
+    df = _age_group_df(df=df, gbd_round_id=gbd_round_id)
     age_intervals = IntervalTree.from_tuples(
         df[['age_lower', 'age_upper', 'age_group_id']].values
     )
@@ -146,28 +161,112 @@ def make_time_intervals(df: Optional[pd.DataFrame] = None) -> IntervalTree:
         Optional data frame from which to construct the interval tree.
         Must have 'year_id' as a column.
     """
-    if df is None:
-        df = pd.DataFrame({
-            'year_id': np.arange(1950, 2050)
-        })
-    else:
-        if 'year_id' not in df.columns:
-            raise IhmeIDError(f"The data frame columns {df.columns} do not contain the"
-                              "one required column year_id.")
     time_intervals = IntervalTree.from_tuples([
-        (t, t+1, t) for t in df.year_id.unique()
+        (t, t+1, t) for t in _year_ids(df=df)
     ])
     return time_intervals
 
 
 def map_id_from_interval_tree(index, tree):
-    i = None
     iset = tree.at(index)
     if len(iset) > 1:
-        raise IhmeIDError("More than one overlap with intervaltree for index {index}.")
+        raise IhmeIDError(f"More than one overlap with intervaltree for index {index}.")
+    if not iset:
+        raise IhmeIDError(f"No overlap with intervaltree for index {index}.")
     for i in iset:
-        break
-    return i.data
+        return i.data
+
+
+class IntervalIDMapper:
+    """
+    Maps points to the ID of the interval [lower, upper) that contains them,
+    for many points at once. The boundaries of all of the intervals split the line
+    into segments that each lie in a fixed set of intervals, so a point is mapped
+    with a binary search for its segment. It gives the same IDs, and raises on the same
+    points, as :func:`map_id_from_interval_tree` with an IntervalTree of the intervals.
+
+    Parameters
+    ----------
+    lower
+        The lower, closed, ends of the intervals. Intervals that are
+        repeated with the same ID count once.
+    upper
+        The upper, open, ends of the intervals.
+    ids
+        The ID of each interval.
+
+    Examples
+    --------
+    >>> mapper = make_age_group_mapper(gbd_round_id=6)
+    >>> mapper.map(df.age_lower)
+    """
+    def __init__(self, lower, upper, ids):
+        intervals = pd.DataFrame({
+            'lower': np.asarray(lower, dtype=float),
+            'upper': np.asarray(upper, dtype=float),
+            'ids': np.asarray(ids)
+        }).drop_duplicates().sort_values(['lower', 'upper', 'ids'])
+        self.lower = intervals.lower.values
+        self.upper = intervals.upper.values
+        self.ids = intervals.ids.values
+
+        self.bounds = np.unique(np.concatenate([self.lower, self.upper]))
+        covers = (self.lower <= self.bounds[:, None]) & (self.bounds[:, None] < self.upper)
+        self._count = covers.sum(axis=1)
+        self._segment_id = self.ids[covers.argmax(axis=1)] if len(self.ids) else self.ids
+
+    @classmethod
+    def from_tree(cls, tree: IntervalTree) -> 'IntervalIDMapper':
+        intervals = sorted(tree)
+        return cls(
+            lower=[i.begin for i in intervals],
+            upper=[i.end for i in intervals],
+            ids=[i.data for i in intervals]
+        )
+
+    def _segments(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        points = np.asarray(points, dtype=float)
+        segment = np.searchsorted(self.bounds, points, side='right') - 1
+        count = np.where(segment >= 0, self._count[np.maximum(segment, 0)], 0)
+        return segment, count
+
+    def contains(self, points) -> np.ndarray:
+        """
+        Whether each point is in at least one interval.
+        """
+        return self._segments(points)[1] > 0
+
+    def map(self, points) -> np.ndarray:
+        """
+        The ID of the interval that each point is in. Raises an IhmeIDError
+        if a point is in more than one interval or in none.
+        """
+        points = np.asarray(points, dtype=float)
+        segment, count = self._segments(points)
+        if (count > 1).any():
+            raise IhmeIDError(f"More than one overlap with intervals for index {points[count > 1][0]}.")
+        if (count == 0).any():
+            raise IhmeIDError(f"No overlap with intervals for index {points[count == 0][0]}.")
+        return self._segment_id[segment]
+
+
+def make_age_group_mapper(df: Optional[pd.DataFrame] = None,
+                          gbd_round_id: Optional[int] = None) -> IntervalIDMapper:
+    """
+    Makes an :class:`IntervalIDMapper` from ages to age group IDs, from the same
+    arguments as :func:`make_age_intervals`.
+    """
+    df = _age_group_df(df=df, gbd_round_id=gbd_round_id)
+    return IntervalIDMapper(lower=df.age_lower.values, upper=df.age_upper.values, ids=df.age_group_id.values)
+
+
+def make_year_mapper(df: Optional[pd.DataFrame] = None) -> IntervalIDMapper:
+    """
+    Makes an :class:`IntervalIDMapper` from times to year IDs, from the same
+    arguments as :func:`make_time_intervals`.
+    """
+    years = _year_ids(df=df)
+    return IntervalIDMapper(lower=years, upper=years + 1, ids=years)
 
 
 def get_study_level_covariate_ids():
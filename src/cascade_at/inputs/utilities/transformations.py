@@ -17,6 +17,7 @@ def scale1000(x):
 COVARIATE_TRANSFORMS = {0: identity, 1: np.log, 2: logit, 3: squared, 4: np.sqrt, 5: scale1000}
 """
 These functions transform covariate data, as specified in EpiViz.
+Each is element-wise, so it transforms a whole array of covariate values at once.
 """
 
 
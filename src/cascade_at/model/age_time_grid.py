@@ -1,5 +1,5 @@
+from copy import copy
 from datetime import timedelta
-from itertools import product
 from math import nan, inf
 
 import numpy as np
@@ -17,29 +17,27 @@ GRID_SNAP_DISTANCE = 1 / timedelta(days=365).total_seconds()
 class AgeTimeGrid:
     """The AgeTime grid holds rows of a table at each age and time value.
 
-    At each age and time point is a DataFrame consisting of the columns
+    At each age and time point is a row consisting of the columns
     given in the constructor. So getting an item returns a dataframe
-    with those columns. Setting a DataFrame sets those columns.
+    with those columns. Setting a row sets those columns.
     Each AgeTimeGrid has three possible mulstds, for value, dage, dtime.
 
     >>> atg = AgeTimeGrid([0, 10, 20], [1990, 2000, 2010], ["height", "weight"])
     >>> atg[:, :] = [6.1, 195]
-    >>> atg[:, :].height = [5.9]
     >>> atg[10, 2000] = [5.7, 180]
-    >>> atg[5:17, 1980:1990].weight = 125
+    >>> atg[5:17, 1980:1990] = [5.9, 125]
     >>> assert (atg[20, 2000].weight == 195).all()
     >>> assert isinstance(atg[0, 1990], pd.DataFrame)
 
-    If the column has the same name as a function (mean), then access it
-    with getitem,
-
-    >>> atg[:, :]["mean"] = [5.9]
-
-    Why is this in Pandas, when it's a regular array of data with an
-    index, which makes it better suited to XArray, or even a
-    Numpy array? It needs to interface with a database representation,
-    and Pandas is a better match there.
+    The rows are kept in a structured Numpy array, indexed by
+    (age index, time index), with one field for each column, so that
+    getting and setting a point doesn't search a table. The ``grid``
+    property makes a DataFrame of the rows, with their ages and times,
+    which is how the grid is serialized for Dismod-AT.
     """
+    _object_columns = frozenset()
+    """Columns that hold strings or None, instead of floats."""
+
     def __init__(self, ages, times, columns):
         try:
             self.ages = np.sort(np.atleast_1d(ages).astype(np.float))
@@ -56,12 +54,13 @@ class AgeTimeGrid:
         for col_is_str in self.columns:
             if not isinstance(col_is_str, str):
                 raise TypeError(f"{type_constraint} {col_is_str}")
-        age_time = np.array(list(product(sorted(self.ages), sorted(self.times))))
-        self.grid = pd.DataFrame(dict(
-            age=age_time[:, 0],
-            time=age_time[:, 1],
-        ))
-        self.grid = self.grid.assign(**{new_col: nan for new_col in columns})
+        self._age_index = {age: idx for idx, age in enumerate(self.ages)}
+        self._time_index = {time: idx for idx, time in enumerate(self.times)}
+        self._array = np.empty((len(self.ages), len(self.times)), dtype=[
+            (col, object if col in self._object_columns else float) for col in self.columns
+        ])
+        for col in self.columns:
+            self._array[col] = nan
         self._mulstd = dict()
         # Each mulstd is one record.
         for kind in PriorKindEnum:
@@ -71,22 +70,87 @@ class AgeTimeGrid:
             ))
             mulstd_df = mulstd_df.assign(**{new_col: nan for new_col in columns})
             self._mulstd[kind.name] = mulstd_df
+        # Whether the rows and mulstds may be shared with a clone.
+        self._shared = False
+
+    def clone(self):
+        """A copy of this grid that shares its rows and mulstds with this one
+        until either of them changes, so that it is cheap to make."""
+        cloned = copy(self)
+        self._shared = True
+        cloned._shared = True
+        return cloned
+
+    def _own(self):
+        """Copies the rows and mulstds before changing them, if they are shared."""
+        if self._shared:
+            self._array = self._array.copy()
+            self._mulstd = {kind: mulstd.copy() for kind, mulstd in self._mulstd.items()}
+            self._shared = False
 
     @property
     def mulstd(self):
+        self._own()
         return self._mulstd
 
-    def age_time(self):
-        yield from zip(np.repeat(self.ages, len(self.times)), np.tile(self.times, len(self.ages)))
+    @property
+    def array(self):
+        """The rows as a structured array with a field for each column,
+        with shape (len(ages), len(times)). Assigning to a field, as in
+        ``atg.array["mean"] = values``, sets that column at every point."""
+        self._own()
+        return self._array
 
-    def __getitem__(self, age_time):
-        """
-        Args:
-            age_time (float, float): Gets all rows with this (age, time).
+    @property
+    def grid(self):
+        """A DataFrame with a row for each age and time, in order of age
+        and then time, with the age, time, and the columns."""
+        grid = pd.DataFrame(dict(
+            age=np.repeat(self.ages, len(self.times)),
+            time=np.tile(self.times, len(self.ages)),
+        ))
+        return grid.assign(**{col: self._array[col].ravel() for col in self.columns})
 
-        Returns:
-            pd.DataFrame or pd.Series with columns.
+    @grid.setter
+    def grid(self, grid):
+        """Sets the columns at each age and time in the given DataFrame."""
+        self._own()
+        age_idx = np.searchsorted(self.ages, grid.age.values)
+        time_idx = np.searchsorted(self.times, grid.time.values)
+        for col in self.columns:
+            self._array[col][age_idx, time_idx] = grid[col].values
+
+    def apply_columns(self, transform):
+        """Sets columns from a function of all the columns at once, so that
+        a transform over the grid is an expression on arrays.
+
+        >>> atg = AgeTimeGrid([0, 10, 20], [1990, 2000], ["mean", "std"])
+        >>> atg[:, :] = [0.1, 0.01]
+        >>> atg.apply_columns(lambda age, time, col: {"std": np.maximum(col["std"], 0.5 * col["mean"])})
+
+        Args:
+            transform: Called as ``transform(ages, times, columns)``. The ages
+                and times are arrays of the age and time at each point, shaped
+                like the grid, and columns is a dictionary from each column
+                to an array of its values. It returns a dictionary from each
+                column to change to its new values, which can be an array
+                shaped like the grid or a single value.
         """
+        ages, times = np.meshgrid(self.ages, self.times, indexing="ij")
+        columns = {col: self._array[col].copy() for col in self.columns}
+        new_columns = transform(ages, times, columns)
+        unknown = set(new_columns) - set(self.columns)
+        if unknown:
+            raise KeyError(f"Columns {unknown} are not in {self.columns}.")
+        self._own()
+        for col, values in new_columns.items():
+            self._array[col] = values
+
+    def age_time(self):
+        yield from zip(np.repeat(self.ages, len(self.times)), np.tile(self.times, len(self.ages)))
+
+    def _index(self, age_time):
+        """The (age index, time index) of a single age and time."""
         try:
             age, time = age_time
         except TypeError as te:
@@ -96,12 +160,22 @@ class AgeTimeGrid:
                 raise
         if isinstance(age, slice) or isinstance(time, slice):
             raise TypeError(f"Cannot get a slice from an AgeTimeGrid.")
-        rows = self.grid.query("age == @age and time == @time")
-        if len(rows) > 0:
-            return rows[self.columns]
-        else:
+        try:
+            return self._age_index[age], self._time_index[time]
+        except (KeyError, TypeError):
             raise KeyError(f"Age {age} and time {time} not found.")
 
+    def __getitem__(self, age_time):
+        """
+        Args:
+            age_time (float, float): Gets the row with this (age, time).
+
+        Returns:
+            pd.DataFrame with columns.
+        """
+        row = self._array[self._index(age_time)]
+        return pd.DataFrame({col: [row[col]] for col in self.columns})
+
     def __setitem__(self, at_slice, value):
         """
         Args:
@@ -115,23 +189,39 @@ class AgeTimeGrid:
         except TypeError:
             raise ValueError("Set value at an age and time, so two arguments")
         at_range = list()
-        for one_slice in at_slice:
+        for one_slice, points in zip(at_slice, [self.ages, self.times]):
             if not isinstance(one_slice, slice):
                 one_slice = slice(one_slice, one_slice)
             if one_slice.step is not None:
                 raise ValueError("Slice in age or time, without a step.")
             start = one_slice.start if one_slice.start is not None else -inf
             stop = one_slice.stop if one_slice.stop is not None else inf
-            at_range.append([start - GRID_SNAP_DISTANCE, stop + GRID_SNAP_DISTANCE])
-        ages = self.ages[(at_range[0][0] <= self.ages) & (self.ages <= at_range[0][1])]
-        times = self.times[(at_range[1][0] <= self.times) & (self.times <= at_range[1][1])]
-        if len(ages) == 0:
-            raise ValueError(f"No ages within range {at_range[0]} "
-                             "Are you looking for a point not in the grid?")
-        if len(times) == 0:
-            raise ValueError(f"No times within range {at_range[1]} "
-                             "Are you looking for a point not in the grid?")
-        self.grid.loc[np.in1d(self.grid.age, ages) & np.in1d(self.grid.time, times), self.columns] = value
+            at_range.append(slice(
+                np.searchsorted(points, start - GRID_SNAP_DISTANCE, side="left"),
+                np.searchsorted(points, stop + GRID_SNAP_DISTANCE, side="right")
+            ))
+        for at_points, name in zip(at_range, ["age", "time"]):
+            if at_points.start >= at_points.stop:
+                raise ValueError(f"No {name}s within range of {at_slice} "
+                                 "Are you looking for a point not in the grid?")
+
+        if isinstance(value, pd.Series):
+            value = [value[col] for col in self.columns]
+        elif isinstance(value, str) or np.isscalar(value) or value is None:
+            value = [value] * len(self.columns)
+        else:
+            value = list(value)
+        if len(value) != len(self.columns):
+            raise ValueError(f"Setting {len(value)} values on columns {self.columns}.")
+        self._own()
+        block_shape = (at_range[0].stop - at_range[0].start, at_range[1].stop - at_range[1].start)
+        for col, col_value in zip(self.columns, value):
+            if col_value is None and col not in self._object_columns:
+                col_value = nan
+            elif isinstance(col_value, np.ndarray) and col_value.size == block_shape[0] * block_shape[1]:
+                # An array of values for each point, in order of age and then time.
+                col_value = col_value.reshape(block_shape)
+            self._array[col][at_range[0], at_range[1]] = col_value
 
     def __len__(self):
         return self.variable_count()
@@ -150,12 +240,12 @@ class AgeTimeGrid:
         if not isinstance(other, type(self)):
             LOG.debug(f"SmoothGrid not equal to {other}")
             return NotImplemented
-        if set(self.mulstd.keys()) != set(other.mulstd.keys()):
+        if set(self._mulstd.keys()) != set(other._mulstd.keys()):
             LOG.debug(f"Different number of mulstd keys")
             return False
-        for mul_key in self.mulstd.keys():
+        for mul_key in self._mulstd.keys():
             try:
-                pd.testing.assert_frame_equal(self.mulstd[mul_key], other.mulstd[mul_key])
+                pd.testing.assert_frame_equal(self._mulstd[mul_key], other._mulstd[mul_key])
             except AssertionError:
                 LOG.debug("assert frame equal false on mulstd")
                 return False
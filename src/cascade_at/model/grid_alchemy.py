@@ -51,6 +51,9 @@ class Alchemy:
         self.settings = settings
         self.age_time_grid = self.construct_age_time_grid()
         self.single_age_time_grid = self.construct_single_age_time_grid()
+        # The SmoothGrid built for each smoothing form, by id of the form,
+        # with the form, so that each is built from the settings once.
+        self._smoothing_templates = dict()
 
         self.model = None
 
@@ -85,6 +88,8 @@ class Alchemy:
     def get_smoothing_grid(self, rate: Smoothing) -> SmoothGrid:
         """
         Construct a smoothing grid for any rate in the model.
+        The grid for each smoothing form is built once, and every call
+        gets a clone of it, which copies its priors only when they change.
 
         Parameters
         ----------
@@ -97,11 +102,15 @@ class Alchemy:
             default age and time grids.
 
         """
-        return smooth_grid_from_smoothing_form(
-            default_age_time=self.age_time_grid,
-            single_age_time=self.single_age_time_grid,
-            smooth=rate
-        )
+        form, template = self._smoothing_templates.get(id(rate), (None, None))
+        if form is not rate:
+            template = smooth_grid_from_smoothing_form(
+                default_age_time=self.age_time_grid,
+                single_age_time=self.single_age_time_grid,
+                smooth=rate
+            )
+            self._smoothing_templates[id(rate)] = (rate, template)
+        return template.clone()
 
     def get_all_rates_grids(self) -> Dict[str, SmoothGrid]:
         """
@@ -162,11 +171,11 @@ class Alchemy:
         to enforce that minCV across all variables in the grid.
         Updates the _PriorGrid in place.
         """
-        prior_grid.grid['std'] = prior_grid.grid.apply(
-            lambda row: max(
-                row['std'], np.abs(row['mean']) * min_cv
-            ), axis=1
-        )
+        def at_least_min_cv(_ages, _times, prior):
+            min_std = np.abs(prior['mean']) * min_cv
+            return {'std': np.where(min_std > prior['std'], min_std, prior['std'])}
+
+        prior_grid.apply_columns(at_least_min_cv)
 
     def construct_two_level_model(self, location_dag: LocationDAG, parent_location_id: int,
                                   covariate_specs: CovariateSpecs,
@@ -225,11 +234,7 @@ class Alchemy:
         
         # Second construct the covariate grids
         for mulcov in covariate_specs.covariate_multipliers:
-            grid = smooth_grid_from_smoothing_form(
-                    default_age_time=self.age_time_grid,
-                    single_age_time=self.single_age_time_grid,
-                    smooth=mulcov.grid_spec
-                )
+            grid = self.get_smoothing_grid(rate=mulcov.grid_spec)
             if update_mulcov_prior is not None and (mulcov.group, *mulcov.key) in update_mulcov_prior:
                 ages = grid.ages
                 times = grid.times
@@ -246,11 +251,7 @@ class Alchemy:
         if self.settings.random_effect:
             random_effect_by_rate = defaultdict(list)
             for smooth in self.settings.random_effect:
-                re_grid = smooth_grid_from_smoothing_form(
-                    default_age_time=self.age_time_grid,
-                    single_age_time=self.single_age_time_grid,
-                    smooth=smooth
-                )
+                re_grid = self.get_smoothing_grid(rate=smooth)
                 if not smooth.is_field_unset("location") and smooth.location in model.child_location:
                     location = smooth.location
                 else:
@@ -277,7 +278,7 @@ class Alchemy:
 
             omega = rectangular_data_to_var(gridded_data=parent_omega)
             model.rate["omega"] = constraint_from_rectangular_data(
-                rate_var=omega,
+                rate_var=omega.grid_values,
                 default_age_time=self.age_time_grid
             )
             
@@ -287,14 +288,16 @@ class Alchemy:
                 LOG.warning(f"Children of {parent_location_id} missing omega {children_without_omega}"
                             f"so not including child omega constraints")
             else:
+                omega_by_location = dict(list(omega_df.groupby("location_id")))
+                parent_values = model.rate["omega"].value.array["mean"]
                 for child in children:
-                    child_omega = omega_df.loc[omega_df.location_id == child].copy()
+                    child_omega = omega_by_location[child]
                     assert not child_omega.empty
                     child_rate = rectangular_data_to_var(gridded_data=child_omega)
 
-                    def child_effect(age, time):
-                        return np.log(child_rate(age, time) / omega(age, time))
-                    
+                    def child_effect(ages, times):
+                        return np.log(child_rate.grid_values(ages, times) / parent_values)
+
                     model.random_effect[("omega", child)] = constraint_from_rectangular_data(
                         rate_var=child_effect,
                         default_age_time=self.age_time_grid
@@ -127,7 +127,7 @@ class Model(DismodGroups):
         for kind in (weight.name for weight in WeightEnum):
             if kind not in self.weights:
                 weights[kind] = Var(*one_age_time)
-                weights[kind].grid.loc[:, "mean"] = 1.0
+                weights[kind][:, :] = 1.0
         return weights
 
     def var_from_mean(self):
@@ -172,7 +172,7 @@ class Model(DismodGroups):
         for kind in (weight.name for weight in WeightEnum):
             if kind not in self.weights:
                 self.weights[kind] = Var(*one_age_time)
-                self.weights[kind].grid.loc[:, "mean"] = 1.0
+                self.weights[kind][:, :] = 1.0
 
     def _check(self):
         child_specific_rate = dict()
@@ -28,6 +28,23 @@ class _Prior:
     def _parameters(self):
         raise NotImplementedError()
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        """Does the ``mle`` of many priors of this class at once, one for
+        each row of draws.
+
+        Args:
+            draws (np.ndarray): Floats with the draws along the last axis.
+            parameters (Dict[str, np.ndarray]): Arrays of lower, upper,
+                mean, std, eta, and nu for the priors, each with the shape
+                of the draws without their last axis.
+
+        Returns:
+            Dict[str, np.ndarray]: The parameters of the new distributions,
+            with the same keys as ``parameters()``, except density.
+        """
+        raise NotImplementedError()
+
     def parameters(self):
         return dict(density=self.density, **self._parameters())
 
@@ -79,6 +96,59 @@ def _validate_nu(nu):
         raise PriorError(f"Nu must be greater than 2: nu={nu}")
 
 
+def _validate_batch(parameters, standard_deviation=False, nu=False):
+    """The checks of the constructors, on arrays of parameters."""
+    lower, mean, upper = parameters["lower"], parameters["mean"], parameters["upper"]
+    if (np.isnan(lower) | np.isnan(mean) | np.isnan(upper)).any():
+        raise PriorError(f"Bounds contain invalid values: lower={lower} mean={mean} upper={upper}")
+    if not ((lower <= mean) & (mean <= upper)).all():
+        raise PriorError(f"Bounds are inconsistent: lower={lower} mean={mean} upper={upper}")
+    if standard_deviation and not (parameters["std"] >= 0).all():
+        raise PriorError(f"Standard deviation must be positive: standard deviation={parameters['std']}")
+    if nu and not (parameters["nu"] > 2).all():
+        raise PriorError(f"Nu must be greater than 2: nu={parameters['nu']}")
+
+
+def _clamp(mean, lower, upper):
+    """Same as min(upper, max(lower, mean)), elementwise."""
+    above_lower = np.where(mean > lower, mean, lower)
+    return np.where(above_lower < upper, above_lower, upper)
+
+
+def _students_t_fit(draws, nu, tolerance=1e-10, max_iterations=500):
+    """Maximum likelihood location and scale of a Students-t with fixed nu,
+    for each row of draws. This iterates the expectation-maximization
+    update, in which each draw is weighted by how close it is to the
+    location, for all rows together.
+
+    Args:
+        draws (np.ndarray): Floats with the draws along the last axis.
+        nu (np.ndarray): Degrees of freedom for each row.
+
+    Returns:
+        (np.ndarray, np.ndarray): The location and scale of each row.
+    """
+    nu = np.asarray(nu, dtype=np.float)[..., np.newaxis]
+    location = np.median(draws, axis=-1, keepdims=True)
+    scale = np.std(draws, axis=-1, keepdims=True)
+    spread = scale > 0
+    scale = np.where(spread, scale, 1.0)
+    for _ in range(max_iterations):
+        weight = (nu + 1) / (nu + ((draws - location) / scale) ** 2)
+        new_location = (weight * draws).sum(axis=-1, keepdims=True) / weight.sum(axis=-1, keepdims=True)
+        new_scale = np.sqrt((weight * (draws - new_location) ** 2).mean(axis=-1, keepdims=True))
+        new_scale = np.where(spread, new_scale, 1.0)
+        converged = (
+            np.abs(new_location - location) <= tolerance * new_scale
+        ) & (
+            np.abs(new_scale - scale) <= tolerance * new_scale
+        )
+        location, scale = new_location, new_scale
+        if converged.all():
+            break
+    return location[..., 0], np.where(spread, scale, 0.0)[..., 0]
+
+
 class Uniform(_Prior):
     density = "uniform"
 
@@ -112,6 +182,16 @@ class Uniform(_Prior):
         """
         return self.assign(mean=min(self.upper, max(self.lower, np.mean(draws))))
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        _validate_batch(parameters)
+        return {
+            "lower": parameters["lower"],
+            "upper": parameters["upper"],
+            "mean": _clamp(np.mean(draws, axis=-1), parameters["lower"], parameters["upper"]),
+            "eta": parameters["eta"],
+        }
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -145,6 +225,10 @@ class Constant(_Prior):
         """Don't change the const value. It is unaffected by this call."""
         return copy(self)
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        return {"lower": parameters["mean"], "upper": parameters["mean"], "mean": parameters["mean"]}
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -210,6 +294,23 @@ class Gaussian(_Prior):
             standard_deviation=std
         )
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        _validate_batch(parameters, standard_deviation=True)
+        mean, std = cls._batch_fit(draws)
+        return {
+            "lower": parameters["lower"],
+            "upper": parameters["upper"],
+            "mean": _clamp(mean, parameters["lower"], parameters["upper"]),
+            "std": std,
+            "eta": parameters["eta"],
+        }
+
+    @staticmethod
+    def _batch_fit(draws):
+        """The mean and standard deviation that ``mle`` fits, for each row."""
+        return np.mean(draws, axis=-1), np.std(draws, axis=-1)
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -277,6 +378,14 @@ class Laplace(Gaussian):
             standard_deviation=scale * np.sqrt(2)  # This is the adjustment.
         )
 
+    @staticmethod
+    def _batch_fit(draws):
+        # The maximum likelihood location is the median, and the scale
+        # is the mean absolute deviation from it.
+        median = np.median(draws, axis=-1)
+        scale = np.mean(np.abs(draws - median[..., np.newaxis]), axis=-1)
+        return median, scale * np.sqrt(2)
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -350,6 +459,20 @@ class StudentsT(_Prior):
             standard_deviation=scale * np.sqrt(nu / (nu - 2))
         )
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        _validate_batch(parameters, standard_deviation=True, nu=True)
+        nu = parameters["nu"]
+        mean, scale = _students_t_fit(draws, nu)
+        return {
+            "lower": parameters["lower"],
+            "upper": parameters["upper"],
+            "mean": _clamp(mean, parameters["lower"], parameters["upper"]),
+            "std": scale * np.sqrt(nu / (nu - 2)),
+            "nu": nu,
+            "eta": parameters["eta"],
+        }
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -424,6 +547,17 @@ class LogGaussian(_Prior):
             standard_deviation=std
         )
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        _validate_batch(parameters, standard_deviation=True)
+        return {
+            "lower": parameters["lower"],
+            "upper": parameters["upper"],
+            "mean": _clamp(np.mean(draws, axis=-1), parameters["lower"], parameters["upper"]),
+            "std": np.std(draws, axis=-1),
+            "eta": parameters["eta"],
+        }
+
     def rvs(self, size=1, random_state=None):
         """Sample from this distribution.
 
@@ -493,6 +627,18 @@ class LogStudentsT(_Prior):
             standard_deviation=std
         )
 
+    @classmethod
+    def batch_mle(cls, draws, parameters):
+        _validate_batch(parameters, standard_deviation=True, nu=True)
+        return {
+            "lower": parameters["lower"],
+            "upper": parameters["upper"],
+            "mean": _clamp(np.mean(draws, axis=-1), parameters["lower"], parameters["upper"]),
+            "std": np.std(draws, axis=-1),
+            "nu": parameters["nu"],
+            "eta": parameters["eta"],
+        }
+
     def _parameters(self):
         return {
             "lower": self.lower,
@@ -522,6 +668,8 @@ DENSITY_ID_TO_PRIOR = {
     6: LogStudentsT,
 }
 
+DENSITY_NAME_TO_PRIOR = {prior.density: prior for prior in DENSITY_ID_TO_PRIOR.values()}
+
 
 def prior_distribution(parameters):
     density, lower, upper, value, stdev, eta, nu = [
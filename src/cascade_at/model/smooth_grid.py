@@ -1,3 +1,5 @@
+from copy import copy
+from itertools import product
 from math import nan, inf
 
 import numpy as np
@@ -13,6 +15,8 @@ class _PriorGrid(AgeTimeGrid):
     """Slices to access priors with Distribution objects.
     Each PriorView has one mulstd, corresponding with its kind.
     """
+    _object_columns = frozenset(["density", "name"])
+
     def __init__(self, kind, ages, times):
         self._kind = kind
         super().__init__(
@@ -43,6 +47,7 @@ class _PriorGrid(AgeTimeGrid):
     @mulstd_prior.setter
     def mulstd_prior(self, value):
         """Erase a mulstd by setting it to None."""
+        self._own()
         if value is not None:
             to_set = value.parameters()
             to_assign = [to_set[setp] if setp in to_set else nan for setp in self.columns]
@@ -51,7 +56,7 @@ class _PriorGrid(AgeTimeGrid):
             self._mulstd[self._kind].loc[:, self.columns] = [None, 0, .1, -inf, inf, nan, nan, None]
 
     def __getitem__(self, at_slice):
-        return prior_distribution(super().__getitem__(at_slice).iloc[0])
+        return prior_distribution(self._array[self._index(at_slice)])
 
     def __setitem__(self, at_slice, value):
         """
@@ -66,11 +71,15 @@ class _PriorGrid(AgeTimeGrid):
         super().__setitem__(at_slice, [to_set[setp] if setp in to_set else nan for setp in self.columns])
 
     def apply(self, transform):
-        for idx, row in self.grid.loc[:, self.columns + ["age", "time"]].iterrows():
-            new_distribution = transform(row.age, row.time, prior_distribution(row))
-            to_set = new_distribution.parameters()
-            self.grid.iloc[idx, self.columns] = [
-                to_set[setp] if setp in to_set else nan for setp in self.columns]
+        """Replaces the prior at each point with ``transform(age, time, prior)``.
+        For transforms that are expressions on the columns, ``apply_columns``
+        does the whole grid at once."""
+        new_columns = {col: np.empty(self._array.shape, dtype=object) for col in self.columns}
+        for (age_idx, age), (time_idx, time) in product(enumerate(self.ages), enumerate(self.times)):
+            to_set = transform(age, time, prior_distribution(self._array[age_idx, time_idx])).parameters()
+            for col in self.columns:
+                new_columns[col][age_idx, time_idx] = to_set[col] if to_set.get(col) is not None else nan
+        self.apply_columns(lambda _ages, _times, _columns: new_columns)
 
 
 class SmoothGrid:
@@ -88,6 +97,13 @@ class SmoothGrid:
         for create_view in PriorKindEnum:
             self._view[create_view.name] = _PriorGrid(create_view.name, self.ages, self.times)
 
+    def clone(self):
+        """A copy of this SmoothGrid whose prior grids share their
+        priors with this one until either of them changes."""
+        cloned = copy(self)
+        cloned._view = {kind: view.clone() for kind, view in self._view.items()}
+        return cloned
+
     def variable_count(self):
         """A Dismod-AT fit solves for model variables. This counts how many
         model variables are defined by this SmoothGrid, which indicates how
@@ -152,7 +168,7 @@ class SmoothGrid:
         total = list()
         for kind, view in self._view.items():
             total.append(view.grid.assign(kind=kind))
-            total.append(view.mulstd[kind].assign(kind=kind))
+            total.append(view._mulstd[kind].assign(kind=kind))
         return pd.concat(total).reset_index(drop=True)
 
 
@@ -170,9 +186,13 @@ def uninformative_grid_from_var(var, strictly_positive):
     """
     smooth_grid = SmoothGrid(var.ages, var.times)
     if strictly_positive:
-        smooth_grid.value.grid.loc[:, ["density", "mean", "lower"]] = ["uniform", 1e-10, 1e-100]
+        value_columns = dict(density="uniform", mean=1e-10, lower=1e-100)
     else:
-        smooth_grid.value.grid.loc[:, ["density", "lower", "upper", "mean"]] = ["uniform", -inf, inf, 0]
-    smooth_grid.dage.grid.loc[:, ["density", "lower", "upper", "mean"]] = ["uniform", -inf, inf, 0]
-    smooth_grid.dtime.grid.loc[:, ["density", "lower", "upper", "mean"]] = ["uniform", -inf, inf, 0]
+        value_columns = dict(density="uniform", lower=-inf, upper=inf, mean=0)
+    difference_columns = dict(density="uniform", lower=-inf, upper=inf, mean=0)
+    for prior_grid, columns in [(smooth_grid.value, value_columns),
+                                (smooth_grid.dage, difference_columns),
+                                (smooth_grid.dtime, difference_columns)]:
+        for column, column_value in columns.items():
+            prior_grid.array[column] = column_value
     return smooth_grid
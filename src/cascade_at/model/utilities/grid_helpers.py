@@ -9,7 +9,7 @@ from typing import Dict, Tuple, Union, Optional
 
 from cascade_at.model.var import Var
 from cascade_at.model.smooth_grid import SmoothGrid, _PriorGrid
-from cascade_at.model.priors import Constant, prior_distribution
+from cascade_at.model.priors import Constant, PriorError, prior_distribution, DENSITY_NAME_TO_PRIOR
 from cascade_at.core.log import get_loggers
 from cascade_at.settings.settings_config import SmoothingPrior, Smoothing
 
@@ -38,14 +38,20 @@ def rectangular_data_to_var(gridded_data):
 
 def constraint_from_rectangular_data(rate_var, default_age_time):
     """Takes data on a complete set of ages and times, makes a constraint grid.
+    Every point of the grid gets a Constant prior at the value of the rate.
 
     Args:
-        rate_var: A function of age and time to represent a rate.
+        rate_var: A function of an array of ages and an array of times that
+            returns the rate on the grid of those ages and times, with shape
+            (ages, times), such as ``Var.grid_values``.
         default_age_time:
     """
     omega_grid = SmoothGrid(ages=default_age_time["age"], times=default_age_time["time"])
-    for age, time in omega_grid.age_time():
-        omega_grid.value[age, time] = Constant(rate_var(age, time))
+    values = rate_var(omega_grid.ages, omega_grid.times)
+    omega_grid.value.apply_columns(lambda _ages, _times, _prior: dict(
+        density=Constant.density, lower=values, upper=values, mean=values,
+        std=np.nan, eta=np.nan, nu=np.nan, name=np.nan
+    ))
     return omega_grid
 
 
@@ -165,6 +171,10 @@ def estimate_grid_from_draws(grid_priors: _PriorGrid, draws: np.ndarray,
     to Gaussian. Will skip if the age or time didn't exist in the draws (
     for example with dage and dtime for one age/time point).
 
+    The grid points that share a prior class are estimated together
+    with that class's ``batch_mle``, and the new parameters are
+    assigned to the grid's array in one step.
+
     Arguments
     ---------
     grid_priors
@@ -180,17 +190,42 @@ def estimate_grid_from_draws(grid_priors: _PriorGrid, draws: np.ndarray,
     """
     assert isinstance(draws, np.ndarray)
     assert len(draws.shape) == 3
-    for idx, row in grid_priors.grid.loc[:, grid_priors.columns + ["age", "time"]].iterrows():
-        if row.age in ages:
-            age_idx = ages.tolist().index(row.age)
-        else:
+    in_ages = np.isin(grid_priors.ages, ages)
+    in_times = np.isin(grid_priors.times, times)
+    if not (in_ages.any() and in_times.any()):
+        return
+    if new_prior_distribution is not None:
+        grid_priors.array['density'] = new_prior_distribution
+
+    cells = np.ix_(np.flatnonzero(in_ages), np.flatnonzero(in_times))
+    draw_cells = np.ix_(
+        [ages.tolist().index(age) for age in grid_priors.ages[in_ages]],
+        [times.tolist().index(time) for time in grid_priors.times[in_times]]
+    )
+    cell_draws = draws[draw_cells]
+    block = grid_priors.array[cells]
+    parameters = {
+        name: block[name].astype(np.float)
+        for name in ["lower", "upper", "mean", "std", "eta", "nu"]
+    }
+
+    # Grid points whose bounds are equal are constants, whatever their density.
+    constant = np.isclose(parameters["lower"], parameters["upper"])
+    prior_classes = [(Constant, constant)]
+    for density in set(block["density"][~constant].tolist()):
+        if density not in DENSITY_NAME_TO_PRIOR:
+            raise PriorError(f"Cannot estimate a prior with density {density}.")
+        prior_classes.append((DENSITY_NAME_TO_PRIOR[density], ~constant & (block["density"] == density)))
+
+    for prior_class, points in prior_classes:
+        if not points.any():
             continue
-        if row.time in times:
-            time_idx = times.tolist().index(row.time)
-        else:
-            continue
-        if new_prior_distribution is not None:
-            grid_priors.grid['density'] = new_prior_distribution
-        grid_priors[row.age, row.time] = grid_priors[row.age, row.time].mle(
-            draws[age_idx, time_idx, :]
+        estimated = prior_class.batch_mle(
+            cell_draws[points], {name: values[points] for name, values in parameters.items()}
         )
+        for column in grid_priors.columns:
+            if column == "density":
+                block[column][points] = prior_class.density
+            else:
+                block[column][points] = estimated.get(column, np.nan)
+    grid_priors.array[cells] = block
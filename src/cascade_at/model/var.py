@@ -20,7 +20,7 @@ class Var(AgeTimeGrid):
     Args:
         ages (List[float]): Points along the age axis.
         times (List[float]): Points in time.
-        column_name (str): A var has an internal Pandas DataFrame
+        column_name (str): A var has an internal structured array
             representation, and this column name can be ``mean``
             or ``meas_value``, depending on which Var is needed.
     """
@@ -33,9 +33,10 @@ class Var(AgeTimeGrid):
         """This raises a :py:class:`ValueError` if any part of the
         Var is uninitialized. None of the means should be nan. There should only be the
         three mulstds."""
-        if not self.grid[self._column_name].notna().all():
+        missing = np.isnan(self._array[self._column_name])
+        if missing.any():
             raise ValueError(
-                f"Var {name} has {self.grid[self._column_name].isna().sum()} nan values")
+                f"Var {name} has {missing.sum()} nan values")
         if set(self.mulstd.keys()) - {"value", "dage", "dtime"}:
             raise ValueError(
                 f"Var {name} has mulstds besides the three: {list(self.mulstd.keys())}"
@@ -82,7 +83,7 @@ class Var(AgeTimeGrid):
         Returns:
             float: The value at this age and time.
         """
-        return float(super().__getitem__(age_and_time)[self._column_name])
+        return float(self._array[self._column_name][self._index(age_and_time)])
 
     def set_mulstd(self, kind, value):
         """Set the value of the multiplier on the standard deviation.
@@ -154,6 +155,42 @@ class Var(AgeTimeGrid):
         else:
             return result
 
+    def grid_values(self, ages, times):
+        """Evaluates the Var at every age and time of a grid at once,
+        interpolating the same way as calling it does.
+
+        >>> var = Var([0, 100], [1990, 2000])
+        >>> var[:, :] = 1.0
+        >>> assert var.grid_values([0, 50, 100], [1995]).shape == (3, 1)
+
+        Args:
+            ages (np.ndarray): Ages of the grid.
+            times (np.ndarray): Times of the grid.
+
+        Returns:
+            np.ndarray: Values with shape (len(ages), len(times)).
+        """
+        ages = np.atleast_1d(ages).astype(np.float)
+        times = np.atleast_1d(times).astype(np.float)
+        values = self._array[self._column_name]
+        if len(self.ages) > 1 and len(self.times) > 1:
+            spline = RectBivariateSpline(self.ages, self.times, values, kx=1, ky=1)
+            return spline.ev(*np.meshgrid(ages, times, indexing="ij"))
+        elif len(self.ages) * len(self.times) > 1:
+            flat = values.ravel()
+            independent = self.ages if len(self.ages) != 1 else self.times
+            spline = interp1d(
+                independent, flat, kind="linear", bounds_error=False, fill_value=(flat[0], flat[-1]))
+            if len(self.ages) != 1:
+                return np.repeat(spline(ages)[:, np.newaxis], len(times), axis=1)
+            else:
+                return np.repeat(spline(times)[np.newaxis, :], len(ages), axis=0)
+        elif len(self.ages) == 1 and len(self.times) == 1:
+            return np.full((len(ages), len(times)), values[0, 0])
+        else:
+            raise RuntimeError(f"Cannot interpolate if ages or times are length zero: "
+                               f"ages {len(self.ages)} times {len(self.times)}")
+
     def _as_function(self):
         """Constructs a function which mimics how Dismod-AT turns a field of
         points in age and time into a continuous function.
@@ -161,12 +198,11 @@ class Var(AgeTimeGrid):
         Returns:
             function: Of age and time.
         """
-        age_time_df = self.grid
-        ordered = age_time_df.sort_values(["age", "time"])
-        age = np.sort(np.unique(age_time_df.age.values))
-        time = np.sort(np.unique(age_time_df.time.values))
+        age = self.ages
+        time = self.times
+        values = self._array[self._column_name].ravel()
         if len(age) > 1 and len(time) > 1:
-            heights = ordered[self._column_name].values.reshape(len(age), len(time))
+            heights = self._array[self._column_name].copy()
             spline = RectBivariateSpline(age, time, heights, kx=1, ky=1)
 
             def bivariate_function(x, y):
@@ -175,10 +211,10 @@ class Var(AgeTimeGrid):
             return bivariate_function
 
         elif len(age) * len(time) > 1:
-            fill = (ordered[self._column_name].values[0], ordered[self._column_name].values[-1])
+            fill = (values[0], values[-1])
             independent = age if len(age) != 1 else time
             spline = interp1d(
-                independent, ordered[self._column_name].values, kind="linear", bounds_error=False, fill_value=fill)
+                independent, values, kind="linear", bounds_error=False, fill_value=fill)
 
             def age_spline(x, _):
                 return spline(x)
@@ -193,7 +229,7 @@ class Var(AgeTimeGrid):
         elif len(age) == 1 and len(time) == 1:
 
             def constant_everywhere(_a, _t):
-                return ordered[self._column_name].values[0]
+                return values[0]
 
             return constant_everywhere
         else:
@@ -1,14 +1,28 @@
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple, Union
+import numpy as np
 import pandas as pd
 
 from cascade_at.core.db import db_tools
 from cascade_at.core.log import get_loggers
 from cascade_at.core import CascadeATError
 from cascade_at.dismod.api.dismod_extractor import ExtractorCols
+from cascade_at.dismod.api.draw_matrix import DrawMatrix, summarize_draws
 
 LOG = get_loggers(__name__)
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DRAW_FILE_FORMATS = ['csv', 'parquet', 'feather']
+"""Formats for draw files. Parquet and feather need pyarrow."""
+DRAW_COMPRESSION = 'zstd'
+"""Compression for parquet and feather draw files, which store the draws as float32."""
+
 
 VALID_TABLES = [
     'model_estimate_final',
@@ -53,6 +67,12 @@ class ResultsHandler:
             raise ResultsError(f"Missing id columns {missing_cols} for saving the results.")
         return df
 
+    @staticmethod
+    def _value_columns(df: pd.DataFrame) -> List[str]:
+        if ExtractorCols.VALUE_COL_FIT in df.columns:
+            return [ExtractorCols.VALUE_COL_FIT]
+        return [col for col in df.columns if col.startswith(ExtractorCols.VALUE_COL_SAMPLES)]
+
     def summarize_results(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Summarizes results from either mean or draw cols to get
@@ -63,20 +83,40 @@ class ResultsHandler:
             df[UiCols.LOWER] = df[ExtractorCols.VALUE_COL_FIT]
             df[UiCols.UPPER] = df[ExtractorCols.VALUE_COL_FIT]
         else:
-            DRAW_COLS = [col for col in df.columns if col.startswith(ExtractorCols.VALUE_COL_SAMPLES)]
-            df[UiCols.MEAN] = df[DRAW_COLS].mean(axis=1)
-            df[UiCols.LOWER] = df[DRAW_COLS].quantile(q=UiCols.LOWER_QUANTILE, axis=1)
-            df[UiCols.UPPER] = df[DRAW_COLS].quantile(q=UiCols.UPPER_QUANTILE, axis=1)
+            DRAW_COLS = self._value_columns(df)
+            summary = summarize_draws(
+                df[DRAW_COLS].values, quantiles=[UiCols.LOWER_QUANTILE, UiCols.UPPER_QUANTILE]
+            )
+            df[UiCols.MEAN] = summary['mean'].values
+            df[UiCols.LOWER] = summary[f'quantile_{UiCols.LOWER_QUANTILE}'].values
+            df[UiCols.UPPER] = summary[f'quantile_{UiCols.UPPER_QUANTILE}'].values
 
         return df[self.draw_keys + [UiCols.MEAN, UiCols.LOWER, UiCols.UPPER]]
 
-    def save_draw_files(self, df: pd.DataFrame, model_version_id: int,
-                        directory: Path, add_summaries: bool):
+    @staticmethod
+    def draw_file(directory: Path, location_id: int, sex_id: int, file_format: str = 'csv') -> Path:
         """
-        Saves a data frame by location and sex in .csv files.
-        This currently saves the summaries, but when we get
-        save_results working it will save draws and then
-        summaries as part of that.
+        The file with the draws for one location and sex.
+        """
+        return directory / str(location_id) / f'{location_id}_{sex_id}.{file_format}'
+
+    @staticmethod
+    def _validate_file_format(file_format: str) -> None:
+        if file_format not in DRAW_FILE_FORMATS:
+            raise ResultsError(f"Unknown draw file format {file_format}. Valid formats are {DRAW_FILE_FORMATS}.")
+        if file_format != 'csv' and not PYARROW_AVAILABLE:
+            raise ResultsError(f"Draw files in {file_format} format need pyarrow.")
+
+    @staticmethod
+    def _partitions(df: pd.DataFrame) -> Dict[Tuple[int, int], np.ndarray]:
+        """Positions of the rows for each location and sex, in one groupby pass."""
+        return df.groupby(['location_id', 'sex_id'], sort=True).indices
+
+    def save_draw_files(self, df: Union[pd.DataFrame, DrawMatrix], model_version_id: int,
+                        directory: Path, add_summaries: bool, file_format: str = 'csv'):
+        """
+        Saves draws in one file for each location and sex, along with
+        a summary .csv file to upload if add_summaries.
 
         Parameters
         ----------
@@ -84,28 +124,84 @@ class ResultsHandler:
             Data frame with the following columns:
                 ['location_id', 'year_id', 'age_group_id', 'sex_id',
                 'measure_id', 'mean' OR 'draw']
+            or a DrawMatrix with those columns in its index.
         model_version_id
             The model version to attach to the data
         directory
             Path to save the files to
         add_summaries
             Save an additional file with summaries to upload
+        file_format
+            One of DRAW_FILE_FORMATS. Parquet and feather files hold float32 draws,
+            compressed, and can be read back with :meth:`read_draw_files`.
         """
         LOG.info(f"Saving results to {directory.absolute()}")
-
-        df['model_version_id'] = model_version_id
-        validated_df = self._validate_results(df=df)
-
-        for loc in validated_df.location_id.unique().tolist():
+        self._validate_file_format(file_format)
+
+        if file_format == 'csv':
+            if isinstance(df, DrawMatrix):
+                df = df.to_wide()
+            df['model_version_id'] = model_version_id
+            validated_df = self._validate_results(df=df)
+            for (loc, sex), rows in self._partitions(validated_df).items():
+                subset = validated_df.iloc[rows].copy()
+                os.makedirs(str(directory / str(loc)), exist_ok=True)
+                subset.to_csv(self.draw_file(directory, loc, sex))
+                if add_summaries:
+                    self.summarize_results(df=subset).to_csv(directory / str(loc) / f'{loc}_{sex}_summary.csv')
+            return
+
+        if not isinstance(df, DrawMatrix):
+            df = DrawMatrix.from_wide(df, draw_names=self._value_columns(df))
+        index = self._validate_results(df=df.index.assign(model_version_id=model_version_id))
+        draws = df.draws.astype(np.float32)
+        for (loc, sex), rows in self._partitions(index).items():
+            subset = DrawMatrix(index=index.iloc[rows], draws=draws[rows], draw_names=df.draw_names).to_wide()
             os.makedirs(str(directory / str(loc)), exist_ok=True)
-            for sex in validated_df.sex_id.unique().tolist():
-                subset = validated_df.loc[
-                    (validated_df.location_id == loc) &
-                    (validated_df.sex_id == sex)
-                ].copy()
-                subset.to_csv(directory / str(loc) / f'{loc}_{sex}.csv')
+            path = self.draw_file(directory, loc, sex, file_format=file_format)
+            if file_format == 'parquet':
+                subset.to_parquet(path, compression=DRAW_COMPRESSION, index=False)
+            else:
+                subset.to_feather(path, compression=DRAW_COMPRESSION)
+            if add_summaries:
                 self.summarize_results(df=subset).to_csv(directory / str(loc) / f'{loc}_{sex}_summary.csv')
 
+    def read_draw_files(self, directory: Path,
+                        location_ids: Union[int, List[int]], sex_ids: Union[int, List[int]],
+                        file_format: str = 'parquet') -> pd.DataFrame:
+        """
+        Reads the draws saved by :meth:`save_draw_files` for some locations
+        and sexes, opening only the files for those locations and sexes.
+
+        Parameters
+        ----------
+        directory
+            Path the files were saved to
+        location_ids
+            A location or list of locations
+        sex_ids
+            A sex or list of sexes
+        file_format
+            The format the files were saved in
+        """
+        self._validate_file_format(file_format)
+        location_ids = [location_ids] if np.isscalar(location_ids) else location_ids
+        sex_ids = [sex_ids] if np.isscalar(sex_ids) else sex_ids
+        files = [
+            self.draw_file(directory, loc, sex, file_format=file_format)
+            for loc in location_ids for sex in sex_ids
+        ]
+        missing = [str(f) for f in files if not f.is_file()]
+        if missing:
+            raise ResultsError(f"There are no draw files {missing}.")
+        if file_format == 'parquet':
+            dfs = [pd.read_parquet(f) for f in files]
+        elif file_format == 'feather':
+            dfs = [pd.read_feather(f) for f in files]
+        else:
+            dfs = [pd.read_csv(f, index_col=0) for f in files]
+        return pd.concat(dfs, ignore_index=True)
+
     @staticmethod
     def upload_summaries(directory: Path, conn_def: str, table: str) -> None:
         """
@@ -0,0 +1,55 @@
+"""
+Times construction of the avgint table against the number of children,
+with every integrand and with two chosen integrands.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.fill_extract_helpers.data_tables import construct_gbd_avgint_table
+from cascade_at.dismod.api.fill_extract_helpers.reference_tables import construct_integrand_table
+
+
+def avgint_inputs(n_children):
+    locations = np.arange(1, n_children + 2)
+    years = np.arange(1990, 2020)
+    age_lower = np.linspace(0, 95, 23)
+    location, year, age = [a.ravel() for a in np.meshgrid(locations, years, age_lower, indexing="ij")]
+    df = pd.DataFrame({
+        'location_id': location,
+        'age_group_id': np.searchsorted(age_lower, age),
+        'year_id': year,
+        'sex_id': 2,
+        'age_lower': age,
+        'age_upper': age + 5,
+        'time_lower': year.astype(float),
+        'time_upper': year + 1.,
+        'x_sex': -0.5,
+    })
+    return dict(
+        df=df,
+        node_df=pd.DataFrame({'node_id': np.arange(len(locations)), 'c_location_id': locations}),
+        covariate_df=pd.DataFrame({'covariate_name': ['x_0'], 'c_covariate_name': ['x_sex']}),
+        integrand_df=construct_integrand_table(),
+        ages=np.linspace(0, 100, 21), times=np.linspace(1990, 2020, 7),
+    )
+
+
+@pytest.mark.parametrize("n_children", [10, 100])
+def test_avgint_time_by_children(bench, n_children):
+    inputs = avgint_inputs(n_children)
+
+    start = perf_counter()
+    every = construct_gbd_avgint_table(**inputs)
+    every_time = perf_counter() - start
+
+    start = perf_counter()
+    chosen = construct_gbd_avgint_table(integrands=['prevalence', 'mtexcess'], **inputs)
+    chosen_time = perf_counter() - start
+
+    print(f"\n{n_children} children: every integrand {len(every)} rows {every_time:.3f}s, "
+          f"two integrands {len(chosen)} rows {chosen_time:.3f}s")
+    assert len(chosen) < len(every)
@@ -0,0 +1,107 @@
+"""
+Times population-weighted covariate interpolation against the number of data rows,
+with the vectorized interpolation and with a loop over data groups calling
+CovariateInterpolator.interpolate, which is how it used to be done.
+The loop is only timed on a sample of the groups and scaled up.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.inputs.utilities.covariate_weighting import (
+    CovariateInterpolator, get_interpolated_covariate_values, DATA_GROUP_COLUMNS
+)
+from cascade_at.model.utilities.grid_helpers import expand_grid
+
+AGE_GROUPS = pd.DataFrame({
+    'age_group_id': [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 30, 31, 32, 235],
+    'age_lower': [0., 0.01917808, 0.07671233, 1., 5., 10., 15., 20., 25., 30., 35., 40., 45.,
+                  50., 55., 60., 65., 70., 75., 80., 85., 90., 95.],
+    'age_upper': [0.01917808, 0.07671233, 1., 5., 10., 15., 20., 25., 30., 35., 40., 45., 50.,
+                  55., 60., 65., 70., 75., 80., 85., 90., 95., 125.]
+})
+LOCATIONS = list(range(100, 150))
+SEXES = [1, 2]
+YEARS = list(range(1980, 2020))
+N_LOOP_GROUPS = 2000
+
+
+def covariate_and_population():
+    rng = np.random.RandomState(0)
+    cov = expand_grid({
+        'location_id': LOCATIONS, 'sex_id': SEXES, 'year_id': YEARS,
+        'age_group_id': AGE_GROUPS.age_group_id.tolist()
+    }).merge(AGE_GROUPS)
+    pop = cov.copy()
+    cov['mean_value'] = rng.rand(len(cov))
+    pop['population'] = rng.randint(100, 10000, size=len(pop)).astype(float)
+    return cov, pop
+
+
+def data(n_rows):
+    rng = np.random.RandomState(1)
+    age_lower = rng.randint(0, 100, size=n_rows).astype(float)
+    time_lower = rng.randint(1975, 2025, size=n_rows) + rng.choice([0., 0.5], size=n_rows)
+    return pd.DataFrame({
+        'location_id': rng.choice(LOCATIONS, size=n_rows),
+        'sex_id': rng.choice(SEXES, size=n_rows),
+        'age_lower': age_lower,
+        'age_upper': age_lower + rng.choice([0., 1., 5., 20.], size=n_rows),
+        'time_lower': time_lower,
+        'time_upper': time_lower + rng.choice([0., 1., 5.], size=n_rows),
+        'meas_value': rng.rand(n_rows)
+    })
+
+
+@pytest.mark.parametrize("n_rows", [100000, 1000000])
+def test_covariate_interpolation_by_rows(bench, n_rows):
+    cov, pop = covariate_and_population()
+    df = data(n_rows)
+
+    start = perf_counter()
+    result = get_interpolated_covariate_values(data_df=df, covariate_dict={'c_x': cov}, population_df=pop)
+    vectorized_time = perf_counter() - start
+
+    groups = df.drop_duplicates(subset=DATA_GROUP_COLUMNS)
+    sampled = groups.sample(n=N_LOOP_GROUPS, random_state=0)
+    start = perf_counter()
+    interpolator = CovariateInterpolator(covariate=cov, population=pop)
+    looped = [
+        interpolator.interpolate(
+            loc_id=row.location_id, sex_id=row.sex_id,
+            age_lower=row.age_lower, age_upper=row.age_upper,
+            time_lower=row.time_lower, time_upper=row.time_upper
+        ) for row in sampled.itertuples()
+    ]
+    loop_time = (perf_counter() - start) * len(groups) / N_LOOP_GROUPS
+
+    print(f"\n{n_rows} rows, {len(groups)} groups: loop {loop_time:.1f}s (estimated),"
+          f" vectorized {vectorized_time:.3f}s")
+    assert np.allclose(result.loc[sampled.index, 'c_x'].values, looped, atol=1e-12, rtol=1e-12)
+
+
+@pytest.mark.parametrize("n_covariates", [1, 5, 10])
+def test_covariate_interpolation_by_covariates(bench, n_covariates):
+    cov, pop = covariate_and_population()
+    covariates = {f'c_{i}': cov.assign(mean_value=cov.mean_value + i) for i in range(n_covariates)}
+    df = data(100000)
+
+    start = perf_counter()
+    result = get_interpolated_covariate_values(data_df=df, covariate_dict=covariates, population_df=pop)
+    shared_time = perf_counter() - start
+
+    start = perf_counter()
+    separate = {
+        name: CovariateInterpolator(covariate=c, population=pop).interpolate_many(
+            loc_id=df.location_id, sex_id=df.sex_id, age_lower=df.age_lower, age_upper=df.age_upper,
+            time_lower=df.time_lower, time_upper=df.time_upper
+        ) for name, c in covariates.items()
+    }
+    separate_time = perf_counter() - start
+
+    print(f"\n{n_covariates} covariates: one plan each {separate_time:.3f}s, shared plan {shared_time:.3f}s")
+    for name, values in separate.items():
+        assert np.allclose(result[name].values, values, atol=1e-12, rtol=1e-12)
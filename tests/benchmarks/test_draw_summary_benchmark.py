@@ -0,0 +1,37 @@
+"""
+Times summarizing 1000 draws per row into mean, lower and upper with
+summarize_draws against pandas row-wise mean and quantiles, which is
+how ResultsHandler.summarize_results used to do it.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.draw_matrix import summarize_draws
+
+N_DRAWS = 1000
+QUANTILES = [0.025, 0.975]
+
+
+@pytest.mark.parametrize("n_rows", [10000, 50000])
+def test_draw_summary(bench, n_rows):
+    draws = np.random.RandomState(0).rand(n_rows, N_DRAWS)
+    wide = pd.DataFrame(draws, columns=[f'draw_{i}' for i in range(N_DRAWS)])
+
+    start = perf_counter()
+    summary = summarize_draws(draws, quantiles=QUANTILES)
+    kernel_time = perf_counter() - start
+
+    start = perf_counter()
+    mean = wide.mean(axis=1)
+    lower = wide.quantile(q=QUANTILES[0], axis=1)
+    upper = wide.quantile(q=QUANTILES[1], axis=1)
+    pandas_time = perf_counter() - start
+
+    print(f"\n{n_rows} rows x {N_DRAWS} draws: pandas {pandas_time:.2f}s, kernel {kernel_time:.2f}s")
+    np.testing.assert_allclose(summary['mean'], mean, rtol=1e-12)
+    np.testing.assert_allclose(summary[f'quantile_{QUANTILES[0]}'], lower, rtol=1e-12)
+    np.testing.assert_allclose(summary[f'quantile_{QUANTILES[1]}'], upper, rtol=1e-12)
@@ -0,0 +1,83 @@
+"""
+Times writing the tables of a database fill against the number of rows
+in the data and avgint tables, once table-by-table and once in a bulk write.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.dismod_io import DismodIO
+
+
+def data_table(n_rows):
+    return pd.DataFrame({
+        'data_name': np.arange(n_rows).astype(str),
+        'integrand_id': np.random.randint(0, 12, size=n_rows),
+        'density_id': 1,
+        'node_id': np.random.randint(0, 10, size=n_rows),
+        'weight_id': 0,
+        'subgroup_id': 0,
+        'hold_out': 0,
+        'meas_value': np.random.rand(n_rows),
+        'meas_std': np.random.rand(n_rows),
+        'eta': 1e-5,
+        'nu': np.nan,
+        'age_lower': 0.,
+        'age_upper': 1.,
+        'time_lower': 1990.,
+        'time_upper': 1991.,
+        'x_0': np.random.rand(n_rows),
+        'x_1': 1.,
+    })
+
+
+def avgint_table(n_rows):
+    return pd.DataFrame({
+        'integrand_id': np.random.randint(0, 12, size=n_rows),
+        'node_id': np.random.randint(0, 10, size=n_rows),
+        'weight_id': 0,
+        'subgroup_id': 0,
+        'age_lower': 0.,
+        'age_upper': 1.,
+        'time_lower': 1990.,
+        'time_upper': 1991.,
+        'c_location_id': 1,
+        'x_0': np.random.rand(n_rows),
+        'x_1': 1.,
+    })
+
+
+def fill(dm, data, avgint):
+    dm.age = pd.DataFrame({'age': np.linspace(0, 100, 21)})
+    dm.time = pd.DataFrame({'time': np.linspace(1990, 2020, 7)})
+    dm.density = pd.DataFrame({'density_name': ['uniform', 'gaussian']})
+    dm.node = pd.DataFrame({'node_name': [str(i) for i in range(10)], 'parent': [np.nan] + [0] * 9})
+    dm.covariate = pd.DataFrame({
+        'covariate_name': ['x_0', 'x_1'], 'reference': [0., 1.], 'max_difference': [np.nan, np.nan]
+    })
+    dm.data = data.copy()
+    dm.avgint = avgint.copy()
+
+
+@pytest.mark.parametrize("n_rows", [1000, 10000, 100000])
+def test_fill_time_by_rows(bench, tmp_path, n_rows):
+    data = data_table(n_rows)
+    avgint = avgint_table(n_rows)
+
+    single = DismodIO(path=tmp_path / 'single.db')
+    start = perf_counter()
+    fill(single, data, avgint)
+    single_time = perf_counter() - start
+
+    bulk = DismodIO(path=tmp_path / 'bulk.db')
+    start = perf_counter()
+    with bulk.bulk_write():
+        fill(bulk, data, avgint)
+    bulk_time = perf_counter() - start
+
+    print(f"\n{n_rows} rows: table-by-table {single_time:.3f}s, bulk {bulk_time:.3f}s")
+    pd.testing.assert_frame_equal(single.data, bulk.data)
+    pd.testing.assert_frame_equal(single.avgint, bulk.avgint)
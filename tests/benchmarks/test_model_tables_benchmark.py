@@ -0,0 +1,74 @@
+"""
+Times construct_model_tables for a parent with 200 children, 5 rates with
+a random effect for every child, and 10 mulcovs, which is 1,015 grids.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from cascade_at.dismod.api.fill_extract_helpers.grid_tables import construct_model_tables
+from cascade_at.model.priors import Gaussian
+from cascade_at.model.smooth_grid import SmoothGrid
+
+AGES = np.linspace(0., 100., 21)
+TIMES = np.linspace(1990., 2020., 7)
+RATES = ["iota", "rho", "chi", "omega", "pini"]
+N_CHILDREN = 200
+N_MULCOVS = 10
+
+
+def smooth_grid(ages, times):
+    grid = SmoothGrid(ages, times)
+    grid.value[:, :] = Gaussian(mean=0.01, standard_deviation=0.1, lower=0., upper=1.)
+    grid.dage[:, :] = Gaussian(mean=0., standard_deviation=0.1)
+    grid.dtime[:, :] = Gaussian(mean=0., standard_deviation=0.1)
+    return grid
+
+
+def model_and_tables():
+    children = list(range(2, N_CHILDREN + 2))
+    covariates = [f"x_{i}" for i in range(N_MULCOVS)]
+    model = {
+        "rate": {rate: smooth_grid(AGES, TIMES) for rate in RATES},
+        "random_effect": {
+            (rate, child): smooth_grid(AGES[::5], TIMES[::3])
+            for rate in RATES for child in children
+        },
+        "alpha": {(covariate, "iota"): smooth_grid(AGES[::10], TIMES[::6]) for covariate in covariates},
+    }
+    location_df = pd.DataFrame({
+        "c_location_id": [1] + children,
+        "node_id": np.arange(N_CHILDREN + 1)
+    })
+    age_df = pd.DataFrame({"age_id": np.arange(len(AGES)), "age": AGES})
+    time_df = pd.DataFrame({"time_id": np.arange(len(TIMES)), "time": TIMES})
+    covariate_df = pd.DataFrame({
+        "c_covariate_name": covariates,
+        "covariate_id": np.arange(N_MULCOVS)
+    })
+    return model, location_df, age_df, time_df, covariate_df
+
+
+def test_construct_model_tables(bench):
+    model, location_df, age_df, time_df, covariate_df = model_and_tables()
+
+    start = perf_counter()
+    tables = construct_model_tables(
+        model=model, location_df=location_df,
+        age_df=age_df, time_df=time_df, covariate_df=covariate_df
+    )
+    build_time = perf_counter() - start
+
+    n_grids = len(RATES) * (N_CHILDREN + 1) + N_MULCOVS
+    print(f"\n{n_grids} grids: {build_time:.3f}s")
+    assert len(tables["smooth"]) == n_grids
+    np.testing.assert_array_equal(tables["smooth"].smooth_id, np.arange(n_grids))
+    np.testing.assert_array_equal(tables["prior"].prior_id, np.arange(len(tables["prior"])))
+    np.testing.assert_array_equal(
+        tables["smooth_grid"].smooth_grid_id, np.arange(len(tables["smooth_grid"]))
+    )
+    assert len(tables["nslist"]) == len(RATES)
+    assert len(tables["nslist_pair"]) == len(RATES) * N_CHILDREN
+    assert len(tables["mulcov"]) == N_MULCOVS
@@ -0,0 +1,77 @@
+"""
+Times DismodExtractor.gather_draws_for_prior_grid on a 20 x 6 age-time
+grid with 1000 draws, against the loop over ages and times that
+it used to do. Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from cascade_at.dismod.api.dismod_extractor import DismodExtractor
+from cascade_at.dismod.api.draw_matrix import DrawMatrix
+from cascade_at.model.utilities.grid_helpers import expand_grid
+
+AGES = np.linspace(0., 100., 20)
+TIMES = np.linspace(1990., 2015., 6)
+N_DRAWS = 1000
+RATES = {'Sincidence': 'iota', 'mtexcess': 'chi'}
+
+
+def wide_predictions():
+    df = expand_grid({
+        'integrand_name': list(RATES.keys()),
+        'age_lower': AGES,
+        'time_lower': TIMES
+    })
+    df['rate'] = df['integrand_name'].map(RATES)
+    df['age_upper'] = df['age_lower']
+    df['time_upper'] = df['time_lower']
+    df['location_id'] = 1
+    df['sex_id'] = 2
+    df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    draws = pd.DataFrame(
+        np.random.RandomState(0).rand(len(df), N_DRAWS),
+        columns=[f'draw_{i}' for i in range(N_DRAWS)]
+    )
+    return pd.concat([df, draws], axis=1)
+
+
+def looped(df, rates):
+    draw_cols = [col for col in df if col.startswith('draw')]
+    rate_dict = dict()
+    for r in rates:
+        df2 = df.loc[df.rate == r].copy()
+        ages = np.asarray(sorted(df2.age_lower.unique().tolist()))
+        times = np.asarray(sorted(df2.time_lower.unique().tolist()))
+        draw_data = np.zeros((len(ages), len(times), len(draw_cols)))
+        for age_idx, age in enumerate(ages):
+            for time_idx, time in enumerate(times):
+                draw_data[age_idx, time_idx, :] = df2.loc[
+                    (df2.age_lower == age) & (df2.time_lower == time)
+                ][draw_cols].values.ravel()
+        rate_dict[r] = {'ages': ages, 'times': times, 'value': draw_data}
+    return rate_dict
+
+
+def test_gather_draws_for_prior_grid(bench):
+    df = wide_predictions()
+    extractor = DismodExtractor.__new__(DismodExtractor)
+    draw_cols = [col for col in df if col.startswith('draw')]
+    extractor.get_prediction_draws = lambda **kwargs: DrawMatrix.from_wide(df, draw_cols)
+
+    start = perf_counter()
+    result = extractor.gather_draws_for_prior_grid(location_id=1, sex_id=2, rates=list(RATES.values()))
+    vectorized_time = perf_counter() - start
+
+    start = perf_counter()
+    expected = looped(df, rates=list(RATES.values()))
+    loop_time = perf_counter() - start
+
+    print(f"\n{len(AGES)} x {len(TIMES)} grid, {N_DRAWS} draws, {len(RATES)} rates:"
+          f" loop {loop_time:.3f}s, vectorized {vectorized_time:.4f}s")
+    for rate in RATES.values():
+        np.testing.assert_array_equal(result[rate]['ages'], expected[rate]['ages'])
+        np.testing.assert_array_equal(result[rate]['times'], expected[rate]['times'])
+        assert result[rate]['n_draws'] == N_DRAWS
+        np.testing.assert_array_equal(result[rate]['value'], expected[rate]['value'])
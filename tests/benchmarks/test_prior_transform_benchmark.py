@@ -0,0 +1,48 @@
+"""
+Times enforcing a minimum coefficient of variation and rescaling the bounds
+on a 100 x 50 prior grid, once with a row-wise DataFrame apply, as
+apply_min_cv_to_prior_grid used to do, and once with apply_columns.
+Run with ``pytest --bench -s tests/benchmarks``.
+"""
+from time import perf_counter
+
+import numpy as np
+
+from cascade_at.model.grid_alchemy import Alchemy
+from cascade_at.model.priors import Gaussian
+from cascade_at.model.smooth_grid import SmoothGrid
+
+AGES = np.linspace(0., 100., 100)
+TIMES = np.linspace(1970., 2020., 50)
+MIN_CV = 0.1
+
+
+def prior_grid():
+    grid = SmoothGrid(AGES, TIMES).value
+    grid[:, :] = Gaussian(mean=0.01, standard_deviation=1e-4, lower=1e-6, upper=1.)
+    grid.array['mean'] = np.random.RandomState(0).rand(len(AGES), len(TIMES))
+    return grid
+
+
+def row_wise(grid):
+    df = grid.grid
+    df['std'] = df.apply(lambda row: max(row['std'], np.abs(row['mean']) * MIN_CV), axis=1)
+    df['upper'] = df.apply(lambda row: row['upper'] * 10, axis=1)
+    return df
+
+
+def test_min_cv_and_bounds(bench):
+    grid = prior_grid()
+
+    start = perf_counter()
+    expected = row_wise(grid)
+    row_time = perf_counter() - start
+
+    start = perf_counter()
+    Alchemy.apply_min_cv_to_prior_grid(prior_grid=grid, min_cv=MIN_CV)
+    grid.apply_columns(lambda _ages, _times, prior: {'upper': prior['upper'] * 10})
+    column_time = perf_counter() - start
+
+    print(f"\n{len(AGES)} x {len(TIMES)} grid: row-wise {row_time:.3f}s, columns {column_time:.5f}s")
+    np.testing.assert_array_equal(grid.grid['std'].values, expected['std'].values)
+    np.testing.assert_array_equal(grid.grid['upper'].values, expected['upper'].values)
@@ -35,6 +35,8 @@ def pytest_addoption(parser):
                     help="requires access to Dismod-AT command line")
     group.addoption("--cluster", action="store_true",
                     help="run functions requiring access to fair cluster")
+    group.addoption("--bench", action="store_true",
+                    help="run the slow benchmarks in tests/benchmarks")
 
 
 @pytest.fixture(scope='session')
@@ -79,6 +81,18 @@ class DismodFuncArg:
             pytest.skip("specify --dismod to run tests requiring Dismod")
 
 
+@pytest.fixture
+def bench(request):
+    return BenchFuncArg(request)
+
+
+class BenchFuncArg:
+    """Benchmarks are slow, so they only run when asked for."""
+    def __init__(self, request):
+        if not request.config.getoption("bench"):
+            pytest.skip("specify --bench to run benchmarks")
+
+
 @pytest.fixture(scope="session")
 def temp_directory():
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.fill_extract_helpers.data_tables import (
+    construct_data_table, construct_gbd_avgint_table
+)
+from cascade_at.dismod.api.fill_extract_helpers.reference_tables import construct_integrand_table
+from cascade_at.dismod.constants import DensityEnum, IntegrandEnum, INTEGRAND_TO_WEIGHT
+
+
+@pytest.fixture
+def avgint_inputs():
+    df = pd.DataFrame({
+        'location_id': [1, 2, 2],
+        'age_group_id': [2, 3, 4],
+        'year_id': [1990, 1990, 2050],
+        'sex_id': 2,
+        'age_lower': [0., 0.01, 0.1],
+        'age_upper': [0.01, 0.1, 1.],
+        'time_lower': [1990., 1990., 2050.],
+        'time_upper': [1991., 1991., 2051.],
+        'x_sex': -0.5,
+    })
+    node_df = pd.DataFrame({'node_id': [0, 1], 'c_location_id': [1, 2]})
+    covariate_df = pd.DataFrame({'covariate_name': ['x_0'], 'c_covariate_name': ['x_sex']})
+    return dict(
+        df=df, node_df=node_df, covariate_df=covariate_df,
+        integrand_df=construct_integrand_table(),
+        ages=np.array([0., 1., 100.]), times=np.array([1990., 2020.])
+    )
+
+
+def test_avgint_table_default_integrands(avgint_inputs):
+    avgint = construct_gbd_avgint_table(**avgint_inputs)
+    integrands = [
+        i for i in avgint_inputs['integrand_df'].integrand_name if i not in ['mtstandard', 'relrisk']
+    ]
+    # The row in 2050 is outside the times.
+    assert len(avgint) == 2 * len(integrands)
+    assert avgint.integrand_id.tolist() == np.repeat([IntegrandEnum[i].value for i in integrands], 2).tolist()
+    assert avgint.weight_id.tolist() == np.repeat(
+        [INTEGRAND_TO_WEIGHT[i].value for i in integrands], 2).tolist()
+    assert avgint.node_id.tolist() == [0, 1] * len(integrands)
+    assert (avgint.subgroup_id == 0).all()
+    assert avgint.index.tolist()[:4] == [0, 1, 3, 4]
+    assert list(avgint.columns) == [
+        'integrand_id', 'node_id', 'weight_id', 'subgroup_id', 'c_location_id',
+        'c_age_group_id', 'c_year_id', 'c_sex_id',
+        'age_lower', 'age_upper', 'time_lower', 'time_upper', 'x_0'
+    ]
+
+
+def test_avgint_table_chosen_integrands(avgint_inputs):
+    avgint = construct_gbd_avgint_table(integrands=['prevalence', 'mtexcess'], **avgint_inputs)
+    assert avgint.integrand_id.tolist() == [
+        IntegrandEnum.prevalence.value] * 2 + [IntegrandEnum.mtexcess.value] * 2
+    assert avgint.c_age_group_id.tolist() == [2, 3, 2, 3]
+
+
+def test_avgint_table_unknown_integrand(avgint_inputs):
+    with pytest.raises(ValueError):
+        construct_gbd_avgint_table(integrands=['incidence'], **avgint_inputs)
+
+
+def test_data_table_ids(avgint_inputs):
+    df = avgint_inputs['df'].assign(
+        measure=['prevalence', 'mtexcess', 'prevalence'],
+        density=['gaussian', 'log_gaussian', 'gaussian'],
+        hold_out=0, meas_value=0.1, meas_std=0.01, eta=np.nan, nu=np.nan
+    )
+    data = construct_data_table(
+        df=df, node_df=avgint_inputs['node_df'], covariate_df=avgint_inputs['covariate_df'],
+        ages=avgint_inputs['ages'], times=avgint_inputs['times']
+    )
+    assert data.integrand_id.tolist() == [IntegrandEnum.prevalence.value, IntegrandEnum.mtexcess.value]
+    assert data.density_id.tolist() == [DensityEnum.gaussian.value, DensityEnum.log_gaussian.value]
+    assert data.weight_id.tolist() == [
+        INTEGRAND_TO_WEIGHT['prevalence'].value, INTEGRAND_TO_WEIGHT['mtexcess'].value]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from cascade_at.dismod.api.fill_extract_helpers.grid_tables import add_prior_smooth_entries
+from cascade_at.model.priors import Gaussian, Uniform
+from cascade_at.model.smooth_grid import SmoothGrid
+
+
+def test_add_prior_smooth_entries():
+    grid = SmoothGrid([0., 10., 5.], [2000., 1990.])
+    grid.value[:, :] = Gaussian(mean=0.1, standard_deviation=0.5, lower=0., upper=1.)
+    grid.value.array["name"][0, 0] = "pet"
+    grid.value[10, 2000] = Uniform(mean=0.2, lower=0., upper=1.)
+    grid.dage[:, :] = Gaussian(mean=0., standard_deviation=0.1)
+    age_df = pd.DataFrame({'age_id': [0, 1, 2], 'age': [0., 5., 10.]})
+    time_df = pd.DataFrame({'time_id': [0, 1], 'time': [1990., 2000.]})
+
+    prior, smooth, smooth_grid = add_prior_smooth_entries(
+        grid_name="iota", grid=grid, num_existing_priors=10, num_existing_grids=4,
+        age_df=age_df, time_df=time_df
+    )
+    assert len(prior) == 21
+    np.testing.assert_array_equal(prior.prior_id, np.arange(10, 31))
+    assert prior.prior_name[0] == "pet    10"
+    assert prior.prior_name[6] == "iota_16"
+    assert (prior.density_id[:5] == 1).all()
+    assert prior.density_id[5] == 0
+    assert (prior.density_id[14:] == 0).all()
+    assert smooth.n_age[0] == 3 and smooth.n_time[0] == 2
+
+    np.testing.assert_array_equal(smooth_grid.age_id, [0, 0, 1, 1, 2, 2])
+    np.testing.assert_array_equal(smooth_grid.time_id, [0, 1, 0, 1, 0, 1])
+    np.testing.assert_array_equal(smooth_grid.value_prior_id, np.arange(10, 16))
+    np.testing.assert_array_equal(smooth_grid.dage_prior_id, np.arange(17, 23))
+    np.testing.assert_array_equal(smooth_grid.dtime_prior_id, np.arange(24, 30))
+    np.testing.assert_array_equal(smooth_grid.smooth_grid_id, np.arange(4, 10))
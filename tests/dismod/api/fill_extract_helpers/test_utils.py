@@ -1,7 +1,8 @@
 import pytest
 
 import numpy as np
-from cascade_at.dismod.api.fill_extract_helpers.utils import vec_to_midpoint
+import pandas as pd
+from cascade_at.dismod.api.fill_extract_helpers.utils import vec_to_midpoint, nearest_id
 
 
 @pytest.mark.parametrize("array,mid", [
@@ -12,3 +13,20 @@ from cascade_at.dismod.api.fill_extract_helpers.utils import vec_to_midpoint
 def test_vec_to_midpoint(array, mid):
     np.testing.assert_array_equal(vec_to_midpoint(np.array(array)), np.array(mid))
 
+
+def test_nearest_id_matches_merge_asof():
+    age_df = pd.DataFrame({'age_id': [3, 0, 1, 2], 'age': [50., 0., 1., 5.]})
+    ages = np.array([0., 0.5, 0.6, 3., 4., 50., 100., -1.])
+    asof = pd.merge_asof(
+        pd.DataFrame({'age': np.sort(ages)}), age_df.sort_values('age'),
+        on='age', direction='nearest'
+    )
+    np.testing.assert_array_equal(nearest_id(np.sort(ages), age_df, 'age'), asof.age_id.values)
+
+
+def test_nearest_id_missing():
+    time_df = pd.DataFrame({'time_id': [0, 1], 'time': [1990., 2000.]})
+    np.testing.assert_array_equal(
+        nearest_id(np.array([np.nan, 1996.]), time_df, 'time'),
+        np.array([np.nan, 1.])
+    )
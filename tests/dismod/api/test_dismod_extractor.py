@@ -1,10 +1,47 @@
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
+from cascade_at.dismod.api.dismod_io import DismodIO
 from cascade_at.dismod.api.dismod_extractor import DismodExtractor
 from cascade_at.dismod.api.dismod_extractor import DismodExtractorError
 from cascade_at.dismod.api.run_dismod import run_dismod
+from cascade_at.dismod.api.fill_extract_helpers.reference_tables import construct_integrand_table
+from cascade_at.dismod.constants import IntegrandEnum
+from cascade_at.model.utilities.grid_helpers import expand_grid
+
+
+N_DRAWS = 3
+
+
+@pytest.fixture
+def predicted(tmp_path):
+    """A database with an avgint table on a rate grid and sampled predictions for it."""
+    path = tmp_path / 'predicted.db'
+    dm = DismodIO(path=path)
+    dm.integrand = construct_integrand_table()
+    avgint = expand_grid({
+        'integrand_id': [IntegrandEnum.Sincidence.value, IntegrandEnum.mtexcess.value],
+        'c_location_id': [1, 2],
+        'c_sex_id': [1, 2],
+        'age_lower': [0., 10., 50.],
+        'time_lower': [1990., 2000.]
+    })
+    avgint['age_upper'] = avgint['age_lower']
+    avgint['time_upper'] = avgint['time_lower']
+    avgint['node_id'] = avgint['c_location_id'] - 1
+    avgint['weight_id'] = 0
+    avgint['subgroup_id'] = 0
+    dm.avgint = avgint
+    predict = expand_grid({
+        'sample_index': np.arange(N_DRAWS),
+        'avgint_id': np.arange(len(avgint))
+    })
+    predict['avg_integrand'] = np.random.rand(len(predict))
+    dm.write_table('predict', predict)
+    return path
 
 
 def test_empty_database():
@@ -49,3 +86,58 @@ def test_format_fit(ihme, dismod, df):
     assert all(pred.columns == [
         'location_id', 'year_id', 'age_group_id', 'sex_id', 'measure_id', 'mean'
     ])
+
+
+def test_get_predictions_subset(predicted):
+    d = DismodExtractor(path=predicted)
+    everything = d.get_predictions(samples=True)
+    subset = d.get_predictions(locations=[2], sexes=[1], samples=True)
+    expected = everything.loc[(everything.location_id == 2) & (everything.sex_id == 1)]
+    pd.testing.assert_frame_equal(subset.reset_index(drop=True), expected.reset_index(drop=True))
+    assert len(subset) == 2 * 3 * 2
+
+
+def test_gather_draws_for_prior_grid(predicted):
+    d = DismodExtractor(path=predicted)
+    draws = d.gather_draws_for_prior_grid(
+        location_id=2, sex_id=1, rates=['iota', 'chi'], dage=True, dtime=True
+    )
+    df = d.get_predictions(locations=[2], sexes=[1], samples=True)
+    draw_cols = [c for c in df.columns if c.startswith('draw')]
+    for rate in ['iota', 'chi']:
+        np.testing.assert_array_equal(draws[rate]['ages'], [0., 10., 50.])
+        np.testing.assert_array_equal(draws[rate]['times'], [1990., 2000.])
+        assert draws[rate]['n_draws'] == N_DRAWS
+        assert draws[rate]['value'].shape == (3, 2, N_DRAWS)
+        for i, age in enumerate([0., 10., 50.]):
+            for j, time in enumerate([1990., 2000.]):
+                row = df.loc[(df.rate == rate) & (df.age_lower == age) & (df.time_lower == time)]
+                np.testing.assert_array_equal(draws[rate]['value'][i, j], row[draw_cols].values.ravel())
+        np.testing.assert_array_equal(draws[rate]['dage'], np.diff(draws[rate]['value'], axis=0))
+        np.testing.assert_array_equal(draws[rate]['dtime'], np.diff(draws[rate]['value'], axis=1))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_get_prediction_draws(predicted, dtype):
+    d = DismodExtractor(path=predicted)
+    draws = d.get_prediction_draws(locations=[1], sexes=[2], samples=True, dtype=dtype)
+    assert draws.draws.shape == (2 * 3 * 2, N_DRAWS)
+    assert draws.draws.dtype == dtype
+    assert draws.draw_names == [f'draw_{i}' for i in range(N_DRAWS)]
+
+    predict = d.predict.merge(d.avgint, on='avgint_id')
+    predict = predict.loc[(predict.c_location_id == 1) & (predict.c_sex_id == 2)]
+    for i, row in enumerate(draws.index.itertuples()):
+        expected = predict.loc[
+            (predict.integrand_id == row.integrand_id) &
+            (predict.age_lower == row.age_lower) &
+            (predict.time_lower == row.time_lower)
+        ].sort_values('sample_index').avg_integrand.values
+        np.testing.assert_array_equal(draws.draws[i], expected.astype(dtype))
+
+
+def test_get_prediction_draws_duplicates(predicted):
+    d = DismodExtractor(path=predicted)
+    predict = d.predict
+    with pytest.raises(DismodExtractorError):
+        d.get_prediction_draws(samples=True, predictions=pd.concat([predict, predict.iloc[:1]]))
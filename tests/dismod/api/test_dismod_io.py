@@ -205,3 +205,123 @@ def test_subgroup(dm, dm_read):
     }, index=[0])
     assert len(dm_read.subgroup) == 1
     assert all(dm_read.subgroup.columns == ['subgroup_id', 'subgroup_name', 'group_id', 'group_name'])
+
+
+def test_bulk_write_matches_write(tmp_path):
+    prior = pd.DataFrame({
+        'prior_name': ['a', 'b'], 'density_id': [1, 0], 'lower': [np.nan, 0.],
+        'upper': [1., 1.], 'mean': [0., 0.5], 'std': [1., np.nan], 'eta': [np.nan, 1e-5], 'nu': [np.nan, np.nan]
+    })
+    dm_single = DismodIO(path=tmp_path / 'single.db')
+    dm_single.prior = prior.copy()
+    dm_bulk = DismodIO(path=tmp_path / 'bulk.db')
+    with dm_bulk.bulk_write(scratch=True):
+        dm_bulk.prior = prior.copy()
+        dm_bulk.age = pd.DataFrame({'age': [0., 1.]})
+        # Reads inside the transaction see the uncommitted writes.
+        assert len(dm_bulk.age) == 2
+    pd.testing.assert_frame_equal(dm_single.prior, dm_bulk.prior)
+    assert not (tmp_path / 'bulk.db-wal').exists()
+
+
+def test_bulk_write_rolls_back(tmp_path):
+    dm = DismodIO(path=tmp_path / 'dismod.db')
+    dm.age = pd.DataFrame({'age': [0., 1.]})
+    with pytest.raises(RuntimeError):
+        with dm.bulk_write():
+            dm.age = pd.DataFrame({'age': [0., 1., 2.]})
+            raise RuntimeError("failed fill")
+    assert len(dm.age) == 2
+
+
+@pytest.fixture
+def sample(dm):
+    dm.sample = pd.DataFrame({
+        'sample_index': np.repeat([0, 1, 2], 4),
+        'var_id': np.tile(np.arange(4), 3),
+        'var_value': np.arange(12, dtype=float)
+    })
+    return dm
+
+
+def test_read_table_where(sample, dm_read):
+    one = dm_read.read_table('sample', where={'sample_index': 1})
+    assert all(one.columns == ['sample_id', 'sample_index', 'var_id', 'var_value'])
+    assert (one.sample_index == 1).all()
+    assert (one.var_value == [4., 5., 6., 7.]).all()
+    assert (one.dtypes == dm_read.sample.dtypes).all()
+
+    two = dm_read.read_table('sample', where={'sample_index': [0, 2], 'var_id': np.int64(3)})
+    assert two.var_value.tolist() == [3., 11.]
+
+
+def test_read_table_columns(sample, dm_read):
+    values = dm_read.read_table('sample', columns=['var_id', 'var_value'], where={'sample_index': 2})
+    assert all(values.columns == ['var_id', 'var_value'])
+    assert len(values) == 4
+
+
+def test_read_table_chunks(sample, dm_read):
+    chunks = list(dm_read.read_table('sample', chunksize=5))
+    assert [len(c) for c in chunks] == [5, 5, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), dm_read.sample)
+
+
+def test_read_table_missing_column(sample, dm_read):
+    with pytest.raises(ValueError):
+        dm_read.read_table('sample', where={'location_id': 1})
+
+
+def test_cache_matches_database(sample, tmp_path, dm_read):
+    cached = DismodIO(path=tmp_path / 'dismod.db', cache=True)
+    pd.testing.assert_frame_equal(cached.sample, dm_read.sample)
+    assert 'sample' in cached._cache
+    pd.testing.assert_frame_equal(
+        cached.read_table('sample', columns=['var_id', 'var_value'], where={'sample_index': [0, 2]}),
+        dm_read.read_table('sample', columns=['var_id', 'var_value'], where={'sample_index': [0, 2]})
+    )
+    with pytest.raises(ValueError):
+        cached.read_table('sample', where={'location_id': 1})
+    # Callers get copies they are free to modify.
+    cached.sample['var_value'] = 0.
+    assert cached.sample.var_value.sum() == 66.
+
+
+def test_cache_invalidated_by_write(sample, tmp_path):
+    cached = DismodIO(path=tmp_path / 'dismod.db', cache=True)
+    assert len(cached.sample) == 12
+    cached.sample = pd.DataFrame({'sample_index': [0], 'var_id': [0], 'var_value': [1.]})
+    assert len(cached.sample) == 1
+
+
+def test_cache_invalidated_by_other_writer(sample, tmp_path, dm_read):
+    cached = DismodIO(path=tmp_path / 'dismod.db', cache=True)
+    assert len(cached.sample) == 12
+    dm_read.sample = pd.DataFrame({'sample_index': [0], 'var_id': [0], 'var_value': [1.]})
+    assert len(cached.sample) == 1
+
+
+def test_cache_cleared_on_rollback(tmp_path):
+    cached = DismodIO(path=tmp_path / 'dismod.db', cache=True)
+    cached.age = pd.DataFrame({'age': [0., 1.]})
+    with pytest.raises(RuntimeError):
+        with cached.bulk_write():
+            cached.age = pd.DataFrame({'age': [0., 1., 2.]})
+            assert len(cached.age) == 3
+            raise RuntimeError("failed fill")
+    assert len(cached.age) == 2
+
+
+def test_write_table_append(sample, dm_read):
+    more = pd.DataFrame({'sample_index': [3, 3], 'var_id': [0, 1], 'var_value': [12., 13.]})
+    dm_read.write_table('sample', more.copy(), append=True)
+    assert dm_read.sample.sample_id.tolist() == list(range(14))
+    with dm_read.bulk_write():
+        dm_read.write_table('sample', more.assign(sample_index=4), append=True)
+    assert dm_read.sample.sample_id.tolist() == list(range(16))
+    assert dm_read.sample.var_value.tolist()[-2:] == [12., 13.]
+
+
+def test_write_table_append_creates(dm):
+    dm.write_table('age', pd.DataFrame({'age': [0., 1.]}), append=True)
+    assert dm.age.age_id.tolist() == [0, 1]
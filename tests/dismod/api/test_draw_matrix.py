@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.draw_matrix import DrawMatrix, DrawMatrixError, summarize_draws
+
+
+@pytest.fixture
+def dm():
+    return DrawMatrix(
+        index=pd.DataFrame({'location_id': [1, 2, 3]}, index=[5, 6, 7]),
+        draws=np.arange(12.).reshape(3, 4)
+    )
+
+
+def test_draw_matrix(dm):
+    assert len(dm) == 3
+    assert dm.n_draws == 4
+    assert dm.draw_names == ['draw_0', 'draw_1', 'draw_2', 'draw_3']
+    assert dm.index.index.tolist() == [0, 1, 2]
+    assert dm.draws.flags['C_CONTIGUOUS']
+
+
+def test_draw_matrix_wide(dm):
+    wide = dm.to_wide()
+    assert wide.columns.tolist() == ['location_id', 'draw_0', 'draw_1', 'draw_2', 'draw_3']
+    np.testing.assert_array_equal(wide[dm.draw_names].values, dm.draws)
+    back = DrawMatrix.from_wide(wide, draw_names=dm.draw_names)
+    pd.testing.assert_frame_equal(back.index, dm.index)
+    np.testing.assert_array_equal(back.draws, dm.draws)
+
+
+def test_draw_matrix_take(dm):
+    taken = dm.take([2, 0, 2])
+    assert taken.index.location_id.tolist() == [3, 1, 3]
+    np.testing.assert_array_equal(taken.draws[:, 0], [8., 0., 8.])
+    masked = dm.take(np.array([True, False, True]))
+    assert masked.index.location_id.tolist() == [1, 3]
+    assert dm.astype(np.float32).draws.dtype == np.float32
+
+
+def test_draw_matrix_shape_errors():
+    with pytest.raises(DrawMatrixError):
+        DrawMatrix(index=pd.DataFrame({'a': [1, 2]}), draws=np.zeros((3, 2)))
+    with pytest.raises(DrawMatrixError):
+        DrawMatrix(index=pd.DataFrame({'a': [1, 2]}), draws=np.zeros((2, 2)), draw_names=['x'])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_summarize_draws(chunk_size):
+    draws = np.random.RandomState(0).rand(50, 30)
+    draws[3, 4] = np.nan
+    draws[10, :] = np.nan
+    summary = summarize_draws(draws, std=True, quantiles=[0.025, 0.5, 0.975], ddof=1, chunk_size=chunk_size)
+    assert summary.columns.tolist() == ['mean', 'std', 'quantile_0.025', 'quantile_0.5', 'quantile_0.975']
+    wide = pd.DataFrame(draws)
+    np.testing.assert_allclose(summary['mean'], wide.mean(axis=1), rtol=1e-14)
+    np.testing.assert_allclose(summary['std'], wide.std(axis=1, ddof=1), rtol=1e-12)
+    for q in [0.025, 0.5, 0.975]:
+        np.testing.assert_allclose(summary[f'quantile_{q}'], wide.quantile(q, axis=1), rtol=1e-14)
+
+
+def test_summarize_draw_matrix(dm):
+    summary = dm.summarize(quantiles=[0.5])
+    assert summary.columns.tolist() == ['location_id', 'mean', 'quantile_0.5']
+    np.testing.assert_array_equal(summary['mean'], [1.5, 5.5, 9.5])
+    with pytest.raises(DrawMatrixError):
+        summarize_draws(np.zeros(3))
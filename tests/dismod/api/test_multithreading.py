@@ -0,0 +1,72 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.api.dismod_io import DismodIO
+from cascade_at.dismod.api.multithreading import _DismodThread, DismodWorkerPool, dmdismod_in_parallel
+from cascade_at.dismod.api.multithreading import dmdismod_in_parallel_to_table
+
+
+class _WriteSample(_DismodThread):
+    reset_tables = ['sample']
+
+    def _process(self, db: str):
+        dm = DismodIO(path=db)
+        with pytest.raises(ValueError):
+            dm.read_table('sample')
+        dm.sample = pd.DataFrame({'sample_index': [self.index], 'var_id': [0], 'var_value': [float(self.index)]})
+        return os.path.basename(db), len(dm.age)
+
+
+@pytest.fixture
+def main_db(tmp_path):
+    dm = DismodIO(path=tmp_path / 'main.db')
+    dm.age = pd.DataFrame({'age': [0., 1., 5.]})
+    return tmp_path / 'main.db'
+
+
+def test_dmdismod_in_parallel(main_db, tmp_path):
+    thread = _WriteSample(main_db=main_db, index_file_pattern=str(tmp_path / 'dismod_{index}.db'))
+    results = dmdismod_in_parallel(dm_thread=thread, sims=list(range(6)), n_pool=2)
+    assert len(results) == 6
+    assert {db for db, _ in results} <= {'dismod_worker_0.db', 'dismod_worker_1.db'}
+    assert all(n_age == 3 for _, n_age in results)
+    assert sorted(os.listdir(tmp_path)) == ['main.db']
+
+
+def test_worker_pool_streams(main_db, tmp_path):
+    thread = _WriteSample(main_db=main_db, index_file_pattern=str(tmp_path / 'dismod_{index}.db'))
+    with DismodWorkerPool(dm_thread=thread, n_pool=3) as pool:
+        assert len(list(tmp_path.glob('dismod_worker_*.db'))) == 3
+        indices = [index for index, _ in pool.imap(sims=range(9))]
+    assert sorted(indices) == list(range(9))
+    assert not list(tmp_path.glob('dismod_worker_*.db'))
+
+
+def test_thread_alone_copies(main_db, tmp_path):
+    thread = _WriteSample(main_db=main_db, index_file_pattern=str(tmp_path / 'dismod_{index}.db'))
+    db, n_age = thread(4)
+    assert db == 'dismod_4.db'
+    assert n_age == 3
+
+
+class _Rows(_DismodThread):
+    def _process(self, db: str):
+        # Earlier indices finish later, so results arrive out of order.
+        time.sleep(0.1 * (5 - self.index))
+        return pd.DataFrame({'sample_index': self.index, 'var_id': [0, 1, 2], 'var_value': self.index + 0.5})
+
+
+def test_dmdismod_in_parallel_to_table(main_db, tmp_path):
+    thread = _Rows(main_db=main_db, index_file_pattern=str(tmp_path / 'dismod_{index}.db'))
+    dmdismod_in_parallel_to_table(
+        dm_thread=thread, sims=list(range(5)), n_pool=2,
+        db=main_db, table_name='sample', columns=['sample_index', 'var_id', 'var_value']
+    )
+    sample = DismodIO(path=main_db).sample
+    assert sample.sample_id.tolist() == list(range(15))
+    assert sample.sample_index.tolist() == np.repeat(np.arange(5), 3).tolist()
+    assert sample.var_id.tolist() == [0, 1, 2] * 5
@@ -0,0 +1,36 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cascade_at.dismod.constants import DensityEnum, IntegrandEnum, enum_values, lookup_values
+
+
+def test_enum_values():
+    names = pd.Series(["prevalence", "mtexcess", "prevalence"])
+    assert enum_values(names, IntegrandEnum).tolist() == [
+        IntegrandEnum.prevalence.value, IntegrandEnum.mtexcess.value, IntegrandEnum.prevalence.value
+    ]
+    assert enum_values(["log_gaussian"], DensityEnum).tolist() == [4]
+
+
+def test_enum_values_unknown():
+    with pytest.raises(KeyError):
+        enum_values(["gaussian", "normal"], DensityEnum)
+    with pytest.raises(KeyError):
+        enum_values(["gaussian", np.nan], DensityEnum)
+
+
+def test_lookup_values_defaultdict():
+    nu = defaultdict(lambda: np.nan)
+    nu["students"] = 5.
+    nu["log_students"] = None
+    values = lookup_values(["students", "gaussian", "log_students"], nu)
+    assert values.dtype == np.float
+    assert values[0] == 5.
+    assert np.isnan(values[1:]).all()
+
+
+def test_lookup_values_empty():
+    assert len(lookup_values(pd.Series([], dtype=object), {"a": 1})) == 0
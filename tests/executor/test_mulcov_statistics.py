@@ -27,3 +27,22 @@ def test_compute_statistics(mulcov_df):
     assert all(stat['std'].to_numpy() == np.zeros(3))
     assert all(stat['quantile_0.025'].to_numpy() == mulcov_df.mulcov_value.to_numpy())
     assert all(stat['quantile_0.975'].to_numpy() == mulcov_df.mulcov_value.to_numpy())
+
+
+def test_compute_statistics_groups():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({
+        'c_covariate_name': rng.choice(['s_sex', 's_one', 'c_x'], size=200),
+        'mulcov_type': 'rate_value',
+        'rate_name': rng.choice(['iota', 'chi'], size=200),
+        'integrand_name': np.nan,
+        'mulcov_value': rng.randn(200)
+    })
+    stat = compute_statistics(df=df, mean=True, std=True, quantile=[0.1, 0.9])
+    groups = df.fillna('none').groupby(['c_covariate_name', 'mulcov_type', 'rate_name', 'integrand_name'], sort=False)
+    expected = groups.mulcov_value.agg(['mean', lambda x: x.std(ddof=0)]).reset_index()
+    assert (stat.integrand_name == 'none').all()
+    assert stat.c_covariate_name.tolist() == expected.c_covariate_name.tolist()
+    np.testing.assert_allclose(stat['mean'], expected['mean'])
+    np.testing.assert_allclose(stat['std'], expected['<lambda_0>'])
+    np.testing.assert_allclose(stat['quantile_0.9'], groups.mulcov_value.quantile(0.9).values)
@@ -124,14 +124,15 @@ def test_predict_pool(mi, settings, dismod):
 
 def test_predict_sample_pools(mi, settings, dismod):
     alchemy = Alchemy(settings)
-    predictions = predict_sample_pool(
+    predict_sample_pool(
         main_db=NAME,
         index_file_pattern='sample_{index}.db',
         n_pool=2,
         n_sim=2
     )
     di = DismodIO(NAME)
-    assert len(predictions) == 2 * len(di.avgint)
+    assert len(di.predict) == 2 * len(di.avgint)
+    assert all(di.predict.iloc[:len(di.avgint)].sample_index == 0)
 
 
 def test_default_gather_child_draws(mi, settings, dismod):
@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from cascade_at.context.model_context import Context
+from cascade_at.inputs import InputsError
+from cascade_at.inputs.covariate_data import CovariateData
+from cascade_at.inputs.inputs_store import InputsStore, LazyMeasurementInputs, PARQUET_AVAILABLE
+from cascade_at.inputs.locations import LocationDAG
+from cascade_at.inputs.measurement_inputs import MeasurementInputs
+from cascade_at.inputs.population import Population
+
+FORMATS = ['pickle', pytest.param('parquet', marks=pytest.mark.skipif(
+    not PARQUET_AVAILABLE, reason="pyarrow is not installed"
+))]
+
+
+@pytest.fixture
+def inputs():
+    """A configured inputs object, made without going to the databases."""
+    rng = np.random.RandomState(0)
+    mi = MeasurementInputs.__new__(MeasurementInputs)
+    mi.model_version_id = 0
+    mi.exclude_outliers = True
+    mi.asdr = None
+    mi.csmr = None
+    mi.data = None
+    mi.dismod_data = pd.DataFrame({
+        'location_id': rng.choice([1, 2, 3, 4, 5], size=20).astype(float),
+        'meas_value': rng.rand(20),
+        'measure': ['Sincidence', 'mtall'] * 10
+    })
+    mi.omega = None
+    mi.country_covariate_reference_values = pd.DataFrame({
+        'covariate_id': [8, 8], 'location_id': [1, 2], 'sex_id': [3, 3],
+        'reference': [0.1, 0.2], 'max_difference': [np.nan, np.nan]
+    }).set_index(['covariate_id', 'location_id', 'sex_id'])
+    mi.country_covariate_data = {8: pd.DataFrame({'location_id': [1, 2], 'mean_value': [0.1, 0.2]})}
+    mi.population = Population.__new__(Population)
+    mi.population.decomp_step = 'step4'
+    mi.population.raw = pd.DataFrame({'location_id': [1, 2, 3], 'population': [10., 20., 30.]})
+    mi.covariate_data = [CovariateData.__new__(CovariateData)]
+    mi.covariate_data[0].covariate_id = 8
+    mi.covariate_data[0].raw = pd.DataFrame({'location_id': [1, 2], 'mean_value': [0.1, 0.2]})
+    mi.location_dag = LocationDAG(df=pd.DataFrame({
+        'location_id': [1, 2, 3, 4, 5],
+        'parent_id': [0, 1, 1, 2, 2]
+    }), root=1)
+    return mi
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_round_trip(inputs, tmp_path, file_format):
+    store = InputsStore(directory=tmp_path / 'store')
+    store.write(inputs, file_format=file_format)
+    loaded = InputsStore(directory=tmp_path / 'store').load()
+    assert isinstance(loaded, LazyMeasurementInputs)
+    assert loaded.model_version_id == 0
+    pd.testing.assert_frame_equal(loaded.dismod_data, inputs.dismod_data)
+    pd.testing.assert_frame_equal(
+        loaded.country_covariate_reference_values, inputs.country_covariate_reference_values
+    )
+    pd.testing.assert_frame_equal(loaded.country_covariate_data[8], inputs.country_covariate_data[8])
+    pd.testing.assert_frame_equal(loaded.population.raw, inputs.population.raw)
+    assert loaded.population.decomp_step == 'step4'
+    assert loaded.covariate_data[0].covariate_id == 8
+    pd.testing.assert_frame_equal(loaded.covariate_data[0].raw, inputs.covariate_data[0].raw)
+    assert loaded.omega is None
+    assert loaded.asdr is None
+    assert set(loaded.location_dag.descendants(1)) == {2, 3, 4, 5}
+
+
+def test_components_are_lazy(inputs, tmp_path):
+    store = InputsStore(directory=tmp_path)
+    store.write(inputs, file_format='pickle')
+    loaded = InputsStore(directory=tmp_path).load()
+    assert 'dismod_data' not in vars(loaded)
+    loaded.dismod_data
+    assert 'dismod_data' in vars(loaded)
+    assert 'population' not in vars(loaded)
+    with pytest.raises(AttributeError):
+        loaded.not_an_attribute
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_read_frame_for_locations(inputs, tmp_path, file_format):
+    store = InputsStore(directory=tmp_path)
+    store.write(inputs, file_format=file_format)
+    df = store.read_frame('dismod_data', location_ids=[2, 4])
+    expected = inputs.dismod_data.loc[inputs.dismod_data.location_id.isin([2, 4])]
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_missing_store(tmp_path):
+    store = InputsStore(directory=tmp_path)
+    assert not store.exists()
+    with pytest.raises(InputsError):
+        store.load()
+
+
+def test_context_inputs(inputs, tmp_path):
+    context = Context(model_version_id=0, make=True, configure_application=False,
+                      root_directory=tmp_path)
+    context.write_inputs(inputs=inputs)
+    assert (context.inputs_store_dir / 'manifest.json').is_file()
+    assert not context.inputs_file.exists()
+    store = InputsStore(directory=context.inputs_store_dir)
+    pd.testing.assert_frame_equal(store.load().dismod_data, inputs.dismod_data)
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_lazy_subtree_data(inputs, tmp_path, file_format):
+    InputsStore(directory=tmp_path).write(inputs, file_format=file_format)
+    loaded = InputsStore(directory=tmp_path).load()
+    pd.testing.assert_frame_equal(loaded.subtree_data(parent_location_id=2), inputs.subtree_data(parent_location_id=2))
+    assert loaded.locations_slice(name='omega', location_ids=[1]) is None
+    assert 'dismod_data' not in vars(loaded)
+
+
+def test_lazy_dismod_data_extent(inputs, tmp_path):
+    inputs.dismod_data = inputs.dismod_data.assign(
+        age_lower=np.arange(20.), age_upper=np.arange(20.) + 5,
+        time_lower=1990. + np.arange(20), time_upper=1991. + np.arange(20)
+    )
+    InputsStore(directory=tmp_path).write(inputs, file_format='pickle')
+    loaded = InputsStore(directory=tmp_path).load()
+    assert loaded.dismod_data_extent() == (0., 24., 1990., 2010.)
+    assert 'dismod_data' not in vars(loaded)
+
+
+def test_lazy_covariate_references(inputs, tmp_path):
+    InputsStore(directory=tmp_path).write(inputs, file_format='pickle')
+    loaded = InputsStore(directory=tmp_path).load()
+    loaded.covariate_specs = SimpleNamespace(
+        covariate_specs=[SimpleNamespace(study_country='country', covariate_id=8, name='x_8')],
+        create_covariate_list=lambda: None
+    )
+    specs = loaded.calculate_country_covariate_reference_values(parent_location_id=2, sex_id=3)
+    assert specs.covariate_specs[0].reference == 0.2
+    assert 'dismod_data' not in vars(loaded)
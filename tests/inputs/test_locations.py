@@ -1,3 +1,6 @@
+import pickle
+
+import networkx as nx
 import pytest
 
 import pandas as pd
@@ -71,3 +74,65 @@ def test_parent_children(dag):
 
 def test_root(dag):
     assert dag.dag.graph["root"] == 1
+
+
+def test_subtree(df):
+    dag = LocationDAG(df=df, root=1)
+    assert set(dag.subtree(2)) == {2, 4, 5}
+    assert dag.subtree(2)[0] == 2
+    assert dag.subtree(3) == [3]
+
+
+def test_depth_children_leaf(df):
+    dag = LocationDAG(df=df, root=1)
+    assert [dag.depth(loc) for loc in [1, 2, 3, 4, 5]] == [0, 1, 1, 2, 2]
+    assert dag.children(1) == [2, 3]
+    assert dag.children(4) == []
+    assert dag.parent_children(2) == [2, 4, 5]
+    assert not dag.is_leaf(2)
+    assert dag.is_leaf(3)
+
+
+def test_in_subtree(df):
+    dag = LocationDAG(df=df, root=1)
+    in_two = dag.in_subtree(2, np.array([1, 2, 3, 4, 5, 99]))
+    assert in_two.tolist() == [False, True, False, True, True, False]
+    assert dag.in_subtree(1, [1, 2, 3, 4, 5]).all()
+    assert 5 in dag
+    assert 99 not in dag
+
+
+def test_lazy_networkx_graph(df):
+    dag = LocationDAG(df=df, root=1)
+    assert dag._dag is None
+    assert set(dag.dag.successors(2)) == {4, 5}
+    assert dag.dag.graph["root"] == 1
+    assert dag.dag is dag.dag
+
+
+def test_to_dataframe_topological(df):
+    dag = LocationDAG(df=df.assign(location_name=list("abcde")), root=1)
+    node = dag.to_dataframe()
+    assert node.location_id.tolist() == [1, 2, 3, 4, 5]
+    assert np.isnan(node.parent_id.iloc[0])
+    assert node.parent_id.iloc[1:].tolist() == [1, 1, 2, 2]
+    assert node.name.tolist() == list("abcde")
+
+
+def test_unpickle_old_layout(df):
+    old_graph = nx.DiGraph()
+    old_graph.add_edges_from([(1, 2), (1, 3), (2, 4), (2, 5)])
+    old_graph.graph["root"] = 1
+    dag = LocationDAG.__new__(LocationDAG)
+    dag.__setstate__({'df': df, 'dag': old_graph, 'location_set_version_id': 3})
+    assert dag.root == 1
+    assert dag.children(2) == [4, 5]
+    assert 5 in dag
+    assert dag.dag is old_graph
+    assert dag.location_set_version_id == 3
+
+
+def test_pickle_round_trip(df):
+    dag = pickle.loads(pickle.dumps(LocationDAG(df=df, root=1)))
+    assert dag.subtree(2) == [2, 4, 5]
+    assert dag.depth(5) == 2
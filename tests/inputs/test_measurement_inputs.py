@@ -1,11 +1,12 @@
 import pytest
 import numpy as np
+import pandas as pd
 from copy import deepcopy
 from random import choice, sample, randint
 
 from cascade_at.settings.base_case import BASE_CASE
 from cascade_at.settings.settings import load_settings
-from cascade_at.inputs.measurement_inputs import MeasurementInputsFromSettings
+from cascade_at.inputs.measurement_inputs import MeasurementInputs, MeasurementInputsFromSettings
 from cascade_at.inputs.locations import LocationDAG
 
 
@@ -49,6 +50,19 @@ def test_to_gbd_avgint(mi):
         'c_diabetes_fpg', 's_sex', 's_one'
     ])
 
+
+def test_country_covariate_reference_values(mi):
+    assert len(mi.country_covariate_reference_values) > 0
+    on_demand = deepcopy(mi)
+    on_demand.country_covariate_reference_values = None
+    for location_id in [70, 72]:
+        for sex_id in [1, 2]:
+            expected = on_demand.calculate_country_covariate_reference_values(location_id, sex_id)
+            looked_up = mi.calculate_country_covariate_reference_values(location_id, sex_id)
+            for e, l in zip(expected.covariate_specs, looked_up.covariate_specs):
+                assert np.isclose(e.reference, l.reference)
+                assert np.isclose(e.max_difference, l.max_difference, equal_nan=True)
+
 # Commenting here to promote discussion.  These tests are a little silly,
 # since I've basically recreated the logic implemented in the
 # measurement_inputs module, meaning that if a bug is introduced into the
@@ -138,3 +152,18 @@ def test_no_drill(ihme):
     # to the entire hierarchy
     assert len(mi.demographics.location_id) == num_descendants + 1
     assert len(mi.demographics.drill_locations) == num_descendants + 1
+
+
+def test_subtree_data_and_prune_mortality():
+    mi = MeasurementInputs.__new__(MeasurementInputs)
+    mi.location_dag = LocationDAG(df=pd.DataFrame({
+        'location_id': [1, 2, 3, 4, 5, 6],
+        'parent_id': [0, 1, 1, 2, 2, 4]
+    }), root=1)
+    mi.dismod_data = pd.DataFrame({
+        'location_id': [1, 2, 3, 4, 5, 6, 6],
+        'measure': ['Sincidence', 'mtall', 'Sincidence', 'mtall', 'Sincidence', 'mtspecific', 'prevalence']
+    })
+    assert mi.subtree_data(parent_location_id=2).index.tolist() == [1, 3, 4, 5, 6]
+    assert mi.subtree_data(parent_location_id=6).index.tolist() == [5, 6]
+    assert mi.prune_mortality_data(parent_location_id=2).index.tolist() == [1, 3, 4, 6]
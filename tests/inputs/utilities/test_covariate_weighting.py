@@ -2,7 +2,8 @@ import pytest
 import numpy as np
 import pandas as pd
 
-from cascade_at.inputs.utilities.covariate_weighting import CovariateInterpolator
+from cascade_at.inputs.utilities.covariate_weighting import CovariateInterpolator, CovariateInterpolationError
+from cascade_at.inputs.utilities.covariate_weighting import get_interpolated_covariate_values, covariate_layout
 
 
 @pytest.fixture
@@ -230,3 +231,82 @@ def test_restrict_year(covariate_interpolator):
     assert covariate_interpolator._restrict_time(1970, time_min=1980, time_max=1990) == 1980
     assert covariate_interpolator._restrict_time(1991, time_min=1980, time_max=1990) == 1990
     assert covariate_interpolator._restrict_time(1985, time_min=1980, time_max=1990) == 1985
+
+
+@pytest.fixture
+def random_groups():
+    rng = np.random.RandomState(0)
+    n = 200
+    age_lower = rng.choice([85., 87., 90., 92., 95., 100.], size=n)
+    time_lower = rng.choice([2007., 2010., 2010.1, 2011., 2011.5, 2012.], size=n)
+    return pd.DataFrame({
+        'location_id': 100, 'sex_id': 1,
+        'age_lower': age_lower, 'age_upper': age_lower + rng.choice([0., 0.1, 5., 13., 40.], size=n),
+        'time_lower': time_lower, 'time_upper': time_lower + rng.choice([0., 0.5, 1., 3.], size=n)
+    })
+
+
+def test_interpolate_many_matches_interpolate(covariate_interpolator, random_groups):
+    expected = [
+        covariate_interpolator.interpolate(
+            loc_id=row.location_id, sex_id=row.sex_id,
+            age_lower=row.age_lower, age_upper=row.age_upper,
+            time_lower=row.time_lower, time_upper=row.time_upper
+        ) for row in random_groups.itertuples()
+    ]
+    result = covariate_interpolator.interpolate_many(
+        loc_id=random_groups.location_id, sex_id=random_groups.sex_id,
+        age_lower=random_groups.age_lower, age_upper=random_groups.age_upper,
+        time_lower=random_groups.time_lower, time_upper=random_groups.time_upper
+    )
+    assert np.allclose(result, expected, atol=1e-12, rtol=1e-12)
+
+
+def test_interpolate_many_missing_location(covariate_interpolator):
+    result = covariate_interpolator.interpolate_many(
+        loc_id=[100, 101], sex_id=[1, 1], age_lower=[90., 90.], age_upper=[95., 95.],
+        time_lower=[2010., 2010.], time_upper=[2011., 2011.]
+    )
+    assert np.isclose(result[0], 0.2)
+    assert np.isnan(result[1])
+
+
+def test_interpolate_many_no_age_group(covariate_interpolator):
+    with pytest.raises(CovariateInterpolationError):
+        covariate_interpolator.interpolate_many(
+            loc_id=[100], sex_id=[1], age_lower=[0.], age_upper=[10.],
+            time_lower=[2010.], time_upper=[2011.]
+        )
+
+
+def test_get_interpolated_covariate_values(test_cov, test_pop, random_groups):
+    data = pd.concat([random_groups, random_groups.iloc[:10]], ignore_index=True)
+    result = get_interpolated_covariate_values(
+        data_df=data, covariate_dict={'c_one': test_cov, 'c_two': test_cov.assign(mean_value=1.)},
+        population_df=test_pop
+    )
+    interpolator = CovariateInterpolator(test_cov, test_pop)
+    for row in result.itertuples():
+        assert np.isclose(row.c_one, interpolator.interpolate(
+            loc_id=row.location_id, sex_id=row.sex_id,
+            age_lower=row.age_lower, age_upper=row.age_upper,
+            time_lower=row.time_lower, time_upper=row.time_upper
+        ), atol=1e-12, rtol=1e-12)
+    assert np.allclose(result.c_two, 1.)
+
+
+def test_plan_applies_to_other_covariates(covariate_interpolator, test_cov, random_groups):
+    plan = covariate_interpolator.plan(
+        loc_id=random_groups.location_id, sex_id=random_groups.sex_id,
+        age_lower=random_groups.age_lower, age_upper=random_groups.age_upper,
+        time_lower=random_groups.time_lower, time_upper=random_groups.time_upper
+    )
+    other = test_cov.assign(mean_value=test_cov.mean_value * 2 + 1)
+    assert np.allclose(plan.apply(other), plan.apply(test_cov) * 2 + 1, atol=1e-12, rtol=1e-12)
+    with pytest.raises(CovariateInterpolationError):
+        plan.apply(test_cov.loc[test_cov.age_group_id != 32])
+
+
+def test_covariate_layout(test_cov):
+    assert covariate_layout(test_cov) == covariate_layout(test_cov.assign(mean_value=0.).iloc[::-1])
+    assert covariate_layout(test_cov) != covariate_layout(test_cov.loc[test_cov.year_id == 2010])
@@ -4,6 +4,8 @@ import numpy as np
 
 from cascade_at.inputs.utilities.gbd_ids import make_age_intervals, make_time_intervals
 from cascade_at.inputs.utilities.gbd_ids import map_id_from_interval_tree
+from cascade_at.inputs.utilities.gbd_ids import IntervalIDMapper, IhmeIDError
+from cascade_at.inputs.utilities.gbd_ids import make_age_group_mapper, make_year_mapper
 
 
 @pytest.fixture
@@ -51,3 +53,37 @@ def test_map_id_from_interval_tree(age_df):
     assert map_id_from_interval_tree(1990, ints) == 1990
     ints = make_age_intervals(df=age_df)
     assert map_id_from_interval_tree(5, ints) == 6
+
+
+def test_age_group_mapper_matches_tree(age_df):
+    ints = make_age_intervals(df=age_df)
+    mapper = make_age_group_mapper(df=pd.concat([age_df, age_df]))
+    points = np.random.RandomState(0).uniform(5, 30, size=100)
+    points[:5] = [5, 10, 15., 29.999, 25]
+    np.testing.assert_array_equal(
+        mapper.map(points), [map_id_from_interval_tree(p, ints) for p in points]
+    )
+
+
+def test_year_mapper():
+    mapper = make_year_mapper()
+    np.testing.assert_array_equal(mapper.map([1990, 1990.5, 2049.99, 1950]), [1990, 1990, 2049, 1950])
+    np.testing.assert_array_equal(mapper.contains([1949.9, 1950, 2050]), [False, True, False])
+
+
+@pytest.mark.parametrize("point", [0., 30., 40., np.nan])
+def test_interval_mapper_missing(age_df, point):
+    with pytest.raises(IhmeIDError):
+        make_age_group_mapper(df=age_df).map([10., point])
+    if not np.isnan(point):
+        with pytest.raises(IhmeIDError):
+            map_id_from_interval_tree(point, make_age_intervals(df=age_df))
+
+
+def test_interval_mapper_overlapping():
+    mapper = IntervalIDMapper(lower=[0., 2., 5.], upper=[10., 3., 6.], ids=[1, 2, 3])
+    np.testing.assert_array_equal(mapper.map([0., 1.5, 3., 4.9, 6., 9.9]), [1, 1, 1, 1, 1, 1])
+    for point in [2., 2.5, 5.5]:
+        with pytest.raises(IhmeIDError):
+            mapper.map([point])
+    assert IntervalIDMapper.from_tree(make_time_intervals()).map([2000.5])[0] == 2000
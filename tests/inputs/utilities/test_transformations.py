@@ -28,3 +28,9 @@ def test_sqrt():
 
 def test_scale1000():
     assert COVARIATE_TRANSFORMS[5](1) == 1000
+
+
+def test_transforms_whole_array():
+    values = np.array([0.1, 0.5, 0.9])
+    for transform in COVARIATE_TRANSFORMS.values():
+        assert np.allclose(transform(values), [transform(x) for x in values])
@@ -3,6 +3,7 @@ AgeTimeGrid isn't part of the API itself, but API members depend on it.
 """
 import pytest
 
+import numpy as np
 from numpy import isclose
 import pandas as pd
 
@@ -119,3 +120,21 @@ def test_printing():
     atg = AgeTimeGrid([0, 10, 50], [2000, 2010], ["clip"])
     assert "variables" in str(atg)
     assert "2010" in repr(atg)
+
+
+def test_array_matches_grid():
+    atg = AgeTimeGrid([10, 0, 1], [2010, 2000], ["height", "weight"])
+    atg[1:10, 2010] = [3.0, 4.0]
+    assert atg.array.shape == (3, 2)
+    assert atg.array["height"][1, 1] == 3.0
+    atg.array["weight"] = [[1, 2], [3, 4], [5, 6]]
+    assert float(atg[10, 2000].weight) == 5
+    assert list(atg.grid.weight) == [1, 2, 3, 4, 5, 6]
+    assert list(atg.grid.age) == [0, 0, 1, 1, 10, 10]
+
+
+def test_assign_array_of_values():
+    atg = AgeTimeGrid([0, 1, 10], [2000, 2010], ["var_id"])
+    atg[:, :] = [np.arange(6.).reshape((-1, 1))]
+    assert float(atg[1, 2000].var_id) == 2
+    assert float(atg[10, 2010].var_id) == 5
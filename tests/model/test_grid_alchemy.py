@@ -5,6 +5,7 @@ from copy import deepcopy
 from cascade_at.settings.settings import load_settings
 from cascade_at.settings.base_case import BASE_CASE
 from cascade_at.model.grid_alchemy import Alchemy
+from cascade_at.model.priors import Constant
 
 
 @pytest.fixture(scope='module')
@@ -86,3 +87,16 @@ def test_pini_grid(model):
     np.testing.assert_array_equal(model['rate']['pini'].ages, np.array([0.]))
     np.testing.assert_array_equal(model['rate']['pini'].times, np.array([2005.]))
 
+
+def test_get_smoothing_grid_clones_template(modified_settings, alchemy):
+    rate_settings = {c.rate: c for c in modified_settings.rate}
+    first = alchemy.get_smoothing_grid(rate=rate_settings['iota'])
+    second = alchemy.get_smoothing_grid(rate=rate_settings['iota'])
+    assert first is not second
+    assert first == second
+
+    age, time = first.ages[0], first.times[0]
+    first.value[age, time] = Constant(123.)
+    assert first.value[age, time].mean == 123.
+    assert second.value[age, time].mean != 123.
+    assert alchemy.get_smoothing_grid(rate=rate_settings['iota']) == second
@@ -152,3 +152,39 @@ def test_mle(cls, params, rng):
 
     if hasattr(dist, "standard_deviation"):
         assert isclose(new_dist.standard_deviation, 0.04, rtol=0.2)
+
+
+@pytest.mark.parametrize("cls,params", [
+    (Uniform, (-10, 10, 0)),
+    (Gaussian, (0.1, 1, -10, 10)),
+    (Gaussian, (0.1, 1, 0, 0.12)),
+    (Laplace, (0, 1, -10, 10)),
+    (StudentsT, (0, 1, 2.7, -10, 10)),
+    (LogGaussian, (0, 1, 0.01, -10, 10)),
+    (LogStudentsT, (0, 1, 2.7, 0.01, -10, 10)),
+])
+def test_batch_mle_matches_mle(cls, params, rng):
+    dist = cls(*params)
+    draws = rng.normal(loc=0.1, scale=0.04, size=(3, 2, 1000))
+    given = {name: value for name, value in dist.parameters().items() if value is not None}
+    parameters = {
+        name: np.full((3, 2), given.get(name, np.nan), dtype=np.float)
+        for name in ["lower", "upper", "mean", "std", "eta", "nu"]
+    }
+    estimated = cls.batch_mle(draws, parameters)
+    assert set(estimated.keys()) == set(dist.parameters().keys()) - {"density"}
+    for age_idx in range(3):
+        for time_idx in range(2):
+            expected = dist.mle(draws[age_idx, time_idx]).parameters()
+            for name, values in estimated.items():
+                expected_value = np.nan if expected[name] is None else expected[name]
+                assert isclose(values[age_idx, time_idx], expected_value, rtol=1e-3, equal_nan=True)
+
+
+def test_batch_mle_validates():
+    parameters = {
+        "lower": np.array([0., 0.]), "upper": np.array([1., 1.]), "mean": np.array([0.5, 2.]),
+        "std": np.array([0.1, 0.1]), "eta": np.full(2, np.nan), "nu": np.full(2, np.nan)
+    }
+    with pytest.raises(PriorError):
+        Gaussian.batch_mle(np.zeros((2, 10)), parameters)
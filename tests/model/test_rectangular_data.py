@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 
 from cascade_at.model.var import Var
-from cascade_at.model.utilities.grid_helpers import rectangular_data_to_var
+from cascade_at.model.priors import Constant
+from cascade_at.model.utilities.grid_helpers import rectangular_data_to_var, constraint_from_rectangular_data
 
 
 @pytest.fixture
@@ -39,3 +40,15 @@ def test_rectangular_data_to_var(rectangular_data, shuffle):
     assert rectangular[0.5, 1951.5] == 0.04
     assert rectangular[3.0, 1951.5] == 0.05
     assert rectangular[7.5, 1951.5] == 0.06
+
+
+def test_constraint_from_rectangular_data(rectangular_data):
+    rectangular = rectangular_data_to_var(gridded_data=rectangular_data)
+    default_age_time = {'age': np.array([0., 2., 7.5]), 'time': np.array([1951., 1950.])}
+    constraint = constraint_from_rectangular_data(
+        rate_var=rectangular.grid_values, default_age_time=default_age_time
+    )
+    for age, time in constraint.age_time():
+        prior = constraint.value[age, time]
+        assert isinstance(prior, Constant)
+        assert np.isclose(prior.mean, rectangular(age, time))
@@ -1,3 +1,4 @@
+import numpy as np
 from numpy import isclose
 
 import pytest
@@ -61,3 +62,43 @@ def test_smooth_grid_mulstd():
     grid.value.mulstd_prior = Gaussian(mean=0.1, standard_deviation=0.02)
     assert grid.value.mulstd_prior.standard_deviation == 0.02
     assert isinstance(grid.value.mulstd_prior, Gaussian)
+
+
+def test_apply_columns():
+    grid = SmoothGrid([0, 5, 10, 20], [2000, 2010])
+    grid.value[:, :] = Gaussian(mean=0.1, standard_deviation=0.001, lower=0.0, upper=1.0)
+    grid.value.apply_columns(lambda age, time, prior: {
+        "std": np.maximum(prior["std"], prior["mean"] * 0.5),
+        "upper": prior["upper"] + age / 100,
+    })
+    assert isclose(grid.value[5, 2010].standard_deviation, 0.05)
+    assert isclose(grid.value[20, 2000].upper, 1.2)
+    assert grid.value[20, 2000].density == "gaussian"
+
+    with pytest.raises(KeyError):
+        grid.value.apply_columns(lambda age, time, prior: {"not_a_column": 1})
+
+
+def test_apply():
+    grid = SmoothGrid([0, 5, 10, 20], [2000, 2010])
+    grid.value[:, :] = Gaussian(mean=0.1, standard_deviation=0.001, lower=0.0, upper=1.0)
+    grid.value.apply(lambda age, time, prior: prior.assign(mean=age / 100))
+    assert isclose(grid.value[10, 2000].mean, 0.1)
+    assert isclose(grid.value[20, 2010].mean, 0.2)
+    assert isclose(grid.value[20, 2010].standard_deviation, 0.001)
+
+
+def test_clone_copies_on_write():
+    grid = SmoothGrid([0, 5, 10, 20], [2000, 2010])
+    grid.value[:, :] = Gaussian(mean=0.1, standard_deviation=0.001)
+    cloned = grid.clone()
+    assert cloned == grid
+
+    cloned.value[5, 2010] = Gaussian(mean=0.2, standard_deviation=0.001)
+    cloned.dage.mulstd_prior = Gaussian(mean=0.1, standard_deviation=0.02)
+    assert grid.value[5, 2010].mean == 0.1
+    assert grid.dage.mulstd_prior is None
+    assert cloned.value[5, 2010].mean == 0.2
+
+    grid.value[0, 2000] = Gaussian(mean=0.3, standard_deviation=0.001)
+    assert cloned.value[0, 2000].mean == 0.1
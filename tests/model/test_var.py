@@ -1,3 +1,4 @@
+import numpy as np
 from numpy import isclose, isnan
 import pytest
 
@@ -110,3 +111,22 @@ def test_mulstd_read_failure():
 
     # Here the key is good, but there is nothing there.
     assert isnan(onet.get_mulstd('dage'))
+
+
+@pytest.mark.parametrize("ages,times", [
+    ([0, 10, 50], [1990, 2000, 2010]),
+    ([0, 10, 50], [2000]),
+    ([20], [1990, 2000, 2010]),
+    ([20], [2000]),
+])
+def test_grid_values_match_call(ages, times):
+    var = Var(ages, times)
+    for age, time in var.age_time():
+        var[age, time] = 0.01 * age + 0.1 * (time - 1990)
+    at_ages = np.array([-5., 0., 5., 10., 37.5, 50., 70.])
+    at_times = np.array([1980., 1990., 1995.5, 2010., 2020.])
+    values = var.grid_values(at_ages, at_times)
+    assert values.shape == (len(at_ages), len(at_times))
+    for age_idx, age in enumerate(at_ages):
+        for time_idx, time in enumerate(at_times):
+            assert isclose(values[age_idx, time_idx], var(age, time))
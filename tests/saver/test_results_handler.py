@@ -3,7 +3,7 @@ import pytest
 import pandas as pd
 import numpy as np
 
-from cascade_at.saver.results_handler import ResultsHandler
+from cascade_at.saver.results_handler import ResultsHandler, ResultsError
 
 
 @pytest.fixture
@@ -50,3 +50,60 @@ def test_saver_summaries_draws(draws):
     assert (df['lower'] == draws[['draw_0', 'draw_1']].quantile(0.025, axis=1)).all()
     assert (df['upper'] == draws[['draw_0', 'draw_1']].quantile(0.975, axis=1)).all()
 
+
+def many_draws(n_draws=20):
+    df = pd.DataFrame({
+        'location_id': np.repeat([1, 2, 3], 4),
+        'sex_id': np.tile([1, 2], 6),
+        'year_id': np.repeat([1990, 1995], 6),
+        'age_group_id': 2,
+        'measure_id': 6,
+    })
+    for i in range(n_draws):
+        df[f'draw_{i}'] = np.random.rand(len(df))
+    return df
+
+
+def test_save_draw_files_csv(tmp_path):
+    df = many_draws()
+    rh = ResultsHandler()
+    rh.save_draw_files(df=df.copy(), model_version_id=0, directory=tmp_path, add_summaries=True)
+    assert sorted(p.name for p in (tmp_path / '2').iterdir()) == [
+        '2_1.csv', '2_1_summary.csv', '2_2.csv', '2_2_summary.csv'
+    ]
+    back = rh.read_draw_files(directory=tmp_path, location_ids=2, sex_ids=[1, 2], file_format='csv')
+    expected = df.loc[df.location_id == 2].sort_values('sex_id', kind='stable')
+    np.testing.assert_allclose(back[[f'draw_{i}' for i in range(20)]].values,
+                               expected[[f'draw_{i}' for i in range(20)]].values)
+    summary = pd.read_csv(tmp_path / '2' / '2_1_summary.csv', index_col=0)
+    assert (summary.columns == rh.draw_keys + ['mean', 'lower', 'upper']).all()
+
+
+def test_save_draw_files_no_summaries(tmp_path):
+    ResultsHandler().save_draw_files(df=many_draws(), model_version_id=0, directory=tmp_path, add_summaries=False)
+    assert not list(tmp_path.glob('*/*summary.csv'))
+
+
+@pytest.mark.parametrize("file_format", ['parquet', 'feather'])
+def test_save_draw_files_columnar(tmp_path, file_format):
+    pytest.importorskip('pyarrow')
+    df = many_draws()
+    rh = ResultsHandler()
+    rh.save_draw_files(df=df.copy(), model_version_id=0, directory=tmp_path,
+                       add_summaries=True, file_format=file_format)
+    assert (tmp_path / '3' / '3_2_summary.csv').is_file()
+    back = rh.read_draw_files(directory=tmp_path, location_ids=[3, 1], sex_ids=2, file_format=file_format)
+    assert back.location_id.tolist() == [3, 3, 1, 1]
+    assert back['draw_0'].dtype == np.float32
+    expected = pd.concat([df.loc[(df.location_id == loc) & (df.sex_id == 2)] for loc in [3, 1]])
+    np.testing.assert_allclose(back[[f'draw_{i}' for i in range(20)]].values,
+                               expected[[f'draw_{i}' for i in range(20)]].values, rtol=1e-6)
+
+
+def test_draw_files_errors(tmp_path):
+    rh = ResultsHandler()
+    with pytest.raises(ResultsError):
+        rh.save_draw_files(df=many_draws(), model_version_id=0, directory=tmp_path,
+                           add_summaries=True, file_format='xlsx')
+    with pytest.raises(ResultsError):
+        rh.read_draw_files(directory=tmp_path, location_ids=1, sex_ids=1, file_format='csv')